@@ -9,13 +9,17 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 # Import your models and Base
+from app.config import settings
 from app.database import Base
-from app.models import Job, Candidate, Application
+from app.models import Job, Candidate, Application, JobStats, ApplicationEvent, ApplicationKey, CandidateLshBucket
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the database the application is configured for
+config.set_main_option("sqlalchemy.url", settings.database_url)
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -0,0 +1,121 @@
+"""Baseline schema
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+Deployments whose tables were created by the application at startup (before
+migrations) are adopted: existing tables are kept and only what they lack is
+added, so ``alembic upgrade head`` works on new and existing databases alike.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _ensure_table(inspector, name: str, columns: list, indexes: Sequence[tuple] = ()) -> None:
+    """
+    Create a table, or complete one created before migrations existed.
+
+    Databases set up by the application's former ``create_all`` already hold
+    (some of) these tables; missing (nullable) columns and indexes are added
+    instead of failing with "relation already exists".
+    """
+    if not inspector.has_table(name):
+        op.create_table(name, *columns)
+        existing_indexes = set()
+    else:
+        existing_columns = {column["name"] for column in inspector.get_columns(name)}
+        for column in columns:
+            if column.name not in existing_columns:
+                op.add_column(name, column)
+        existing_indexes = {index["name"] for index in inspector.get_indexes(name)}
+    for index_name, index_columns, unique in indexes:
+        if index_name not in existing_indexes:
+            op.create_index(index_name, name, index_columns, unique=unique)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    _ensure_table(inspector, "jobs", [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("location", sa.String(255), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("jd_text", sa.Text(), nullable=False),
+        sa.Column("required_skills", sa.JSON(), nullable=False),
+        sa.Column("score_calibration", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ])
+
+    _ensure_table(inspector, "candidates", [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("phone", sa.String(50), nullable=True),
+        sa.Column("linkedin", sa.String(255), nullable=True),
+        sa.Column("resume_url", sa.String(500), nullable=False),
+        sa.Column("skills", sa.JSON(), nullable=False),
+        sa.Column("experience_years", sa.Float(), nullable=True),
+        sa.Column("education", sa.String(500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ], [("ix_candidates_email", ["email"], True)])
+
+    _ensure_table(inspector, "applications", [
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("jobs.id"), nullable=False),
+        sa.Column("candidate_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("candidates.id"), nullable=False),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("scores", sa.JSON(), nullable=True),
+        sa.Column("calibrated_score", sa.Float(), nullable=True),
+        sa.Column("score_percentile", sa.Float(), nullable=True),
+        sa.Column("job_rank", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ], [
+        ("ix_applications_job_id", ["job_id"], False),
+        ("ix_applications_candidate_id", ["candidate_id"], False),
+    ])
+
+    _ensure_table(inspector, "job_stats", [
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_count", sa.Integer(), nullable=False),
+        sa.Column("status_counts", postgresql.JSONB(), nullable=False),
+        sa.Column("score_histogram", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("score_count", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        sa.Column("score_sum_sq", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ])
+
+    _ensure_table(inspector, "application_events", [
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "application_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("applications.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("old_status", sa.String(50), nullable=True),
+        sa.Column("new_status", sa.String(50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ], [("ix_application_events_job_id_id", ["job_id", "id"], False)])
+
+
+def downgrade() -> None:
+    op.drop_table("application_events")
+    op.drop_table("job_stats")
+    op.drop_table("applications")
+    op.drop_table("candidates")
+    op.drop_table("jobs")
@@ -0,0 +1,126 @@
+"""Partition applications by archived flag and created_at month
+
+Revision ID: 0002_partition_applications
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00
+
+applications becomes LIST-partitioned on ``archived``: ``applications_archive``
+holds closed jobs' applications and ``applications_hot`` is RANGE-partitioned
+by month of ``created_at`` (plus a default partition). Monthly partitions are
+created from the oldest existing row up to three months ahead; later months
+are provisioned by ArchivalService.ensure_partitions. The primary key becomes
+(id, archived, created_at), so application_events can no longer reference
+applications(id) with a foreign key.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_partition_applications"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLICATION_COLUMNS = (
+    "id, job_id, candidate_id, status, scores, calibrated_score, score_percentile, job_rank, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE application_events DROP CONSTRAINT IF EXISTS application_events_application_id_fkey")
+
+    op.execute("ALTER TABLE applications RENAME TO applications_unpartitioned")
+    op.execute("ALTER TABLE applications_unpartitioned RENAME CONSTRAINT applications_pkey TO applications_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_applications_job_id RENAME TO ix_applications_unpartitioned_job_id")
+    op.execute("ALTER INDEX ix_applications_candidate_id RENAME TO ix_applications_unpartitioned_candidate_id")
+
+    op.execute("""
+        CREATE TABLE applications (
+            id UUID NOT NULL,
+            job_id UUID NOT NULL REFERENCES jobs (id),
+            candidate_id UUID NOT NULL REFERENCES candidates (id),
+            status VARCHAR(50) NOT NULL,
+            scores JSON,
+            calibrated_score FLOAT,
+            score_percentile FLOAT,
+            job_rank INTEGER,
+            archived BOOLEAN NOT NULL DEFAULT false,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id, archived, created_at)
+        ) PARTITION BY LIST (archived)
+    """)
+    op.execute("CREATE TABLE applications_archive PARTITION OF applications FOR VALUES IN (true)")
+    op.execute(
+        "CREATE TABLE applications_hot PARTITION OF applications FOR VALUES IN (false) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("CREATE TABLE applications_hot_default PARTITION OF applications_hot DEFAULT")
+    op.execute("""
+        DO $$
+        DECLARE
+            partition_start DATE := date_trunc(
+                'month', COALESCE((SELECT min(created_at) FROM applications_unpartitioned), now())
+            )::DATE;
+            last_start DATE := (date_trunc('month', now()) + INTERVAL '3 months')::DATE;
+        BEGIN
+            WHILE partition_start <= last_start LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF applications_hot FOR VALUES FROM (%L) TO (%L)',
+                    'applications_hot_p' || to_char(partition_start, 'YYYY_MM'),
+                    partition_start,
+                    (partition_start + INTERVAL '1 month')::DATE
+                );
+                partition_start := (partition_start + INTERVAL '1 month')::DATE;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE INDEX ix_applications_job_id ON applications (job_id)")
+    op.execute("CREATE INDEX ix_applications_candidate_id ON applications (candidate_id)")
+
+    op.execute(
+        f"INSERT INTO applications ({APPLICATION_COLUMNS}) "
+        f"SELECT {APPLICATION_COLUMNS} FROM applications_unpartitioned"
+    )
+    op.execute("DROP TABLE applications_unpartitioned")
+
+    op.execute("ALTER TABLE jobs ADD COLUMN archived_at TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN archived_at")
+
+    op.execute("ALTER TABLE applications RENAME TO applications_partitioned")
+    op.execute("ALTER TABLE applications_partitioned RENAME CONSTRAINT applications_pkey TO applications_partitioned_pkey")
+    op.execute("ALTER INDEX ix_applications_job_id RENAME TO ix_applications_partitioned_job_id")
+    op.execute("ALTER INDEX ix_applications_candidate_id RENAME TO ix_applications_partitioned_candidate_id")
+
+    op.execute("""
+        CREATE TABLE applications (
+            id UUID PRIMARY KEY,
+            job_id UUID NOT NULL REFERENCES jobs (id),
+            candidate_id UUID NOT NULL REFERENCES candidates (id),
+            status VARCHAR(50) NOT NULL,
+            scores JSON,
+            calibrated_score FLOAT,
+            score_percentile FLOAT,
+            job_rank INTEGER,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+    """)
+    op.execute(
+        f"INSERT INTO applications ({APPLICATION_COLUMNS}) "
+        f"SELECT {APPLICATION_COLUMNS} FROM applications_partitioned"
+    )
+    op.execute("DROP TABLE applications_partitioned CASCADE")
+    op.execute("CREATE INDEX ix_applications_job_id ON applications (job_id)")
+    op.execute("CREATE INDEX ix_applications_candidate_id ON applications (candidate_id)")
+
+    op.execute("DELETE FROM application_events e WHERE NOT EXISTS (SELECT 1 FROM applications a WHERE a.id = e.application_id)")
+    op.execute(
+        "ALTER TABLE application_events ADD CONSTRAINT application_events_application_id_fkey "
+        "FOREIGN KEY (application_id) REFERENCES applications (id) ON DELETE CASCADE"
+    )
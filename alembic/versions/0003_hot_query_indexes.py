@@ -0,0 +1,69 @@
+"""Indexes for hot queries and one application per job and candidate
+
+Revision ID: 0003_hot_query_indexes
+Revises: 0002_partition_applications
+Create Date: 2026-10-19 00:00:00
+
+Composite indexes match the query shapes of the listing, job detail, sync and
+deferred-processing queries (verify with scripts/explain_queries.py).
+Uniqueness of (job_id, candidate_id) lives in application_keys because a
+unique index on the partitioned applications table must include its
+partition keys. Existing duplicates keep their rows; the earliest application
+of each pair is registered as its key.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_hot_query_indexes"
+down_revision: Union[str, None] = "0002_partition_applications"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /jobs?status=... ORDER BY created_at DESC, and unfiltered listing
+    op.create_index("ix_jobs_status_created_at", "jobs", ["status", "created_at"])
+    op.create_index("ix_jobs_created_at", "jobs", ["created_at"])
+
+    # Job detail, stats rebuild, export and calibration filter by job (and status);
+    # (job_id, status) also serves job_id-only lookups, so it replaces ix_applications_job_id
+    op.create_index("ix_applications_job_id_status", "applications", ["job_id", "status"])
+    op.drop_index("ix_applications_job_id", table_name="applications")
+    # Deferred worker (status = 'applied') and status listings ordered by time
+    op.create_index("ix_applications_status_created_at", "applications", ["status", "created_at"])
+    # GET /applications: created_at window ordered by created_at DESC
+    op.create_index("ix_applications_created_at", "applications", ["created_at"])
+
+    op.create_table(
+        "application_keys",
+        sa.Column(
+            "job_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column(
+            "candidate_id", postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("application_id", postgresql.UUID(as_uuid=True), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO application_keys (job_id, candidate_id, application_id)
+        SELECT DISTINCT ON (job_id, candidate_id) job_id, candidate_id, id
+        FROM applications
+        ORDER BY job_id, candidate_id, created_at
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("application_keys")
+    op.drop_index("ix_applications_created_at", table_name="applications")
+    op.drop_index("ix_applications_status_created_at", table_name="applications")
+    op.create_index("ix_applications_job_id", "applications", ["job_id"])
+    op.drop_index("ix_applications_job_id_status", table_name="applications")
+    op.drop_index("ix_jobs_created_at", table_name="jobs")
+    op.drop_index("ix_jobs_status_created_at", table_name="jobs")
@@ -0,0 +1,45 @@
+"""Candidate MinHash signatures and LSH buckets for duplicate detection
+
+Revision ID: 0004_candidate_dedup
+Revises: 0003_hot_query_indexes
+Create Date: 2026-10-19 00:00:00
+
+Existing candidates start without a signature; run
+scripts/dedup_candidates.py --backfill to compute and index them.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_candidate_dedup"
+down_revision: Union[str, None] = "0003_hot_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("candidates", sa.Column("minhash", postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.create_table(
+        "candidate_lsh_buckets",
+        sa.Column("band", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "candidate_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("candidates.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("band", "bucket", "candidate_id"),
+    )
+    # Re-indexing and cascades delete a candidate's buckets
+    op.create_index("ix_candidate_lsh_buckets_candidate_id", "candidate_lsh_buckets", ["candidate_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_candidate_lsh_buckets_candidate_id", table_name="candidate_lsh_buckets")
+    op.drop_table("candidate_lsh_buckets")
+    op.drop_column("candidates", "minhash")
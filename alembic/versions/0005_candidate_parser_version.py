@@ -0,0 +1,28 @@
+"""Record the parser version that produced each candidate's parsed fields
+
+Revision ID: 0005_candidate_parser_version
+Revises: 0004_candidate_dedup
+Create Date: 2026-10-19 00:00:00
+
+Existing candidates start without a version; scripts/reparse_candidates.py
+re-parses every candidate whose version differs from the current one.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_candidate_parser_version"
+down_revision: Union[str, None] = "0004_candidate_dedup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("candidates", sa.Column("parser_version", sa.String(50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("candidates", "parser_version")
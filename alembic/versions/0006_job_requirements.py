@@ -0,0 +1,28 @@
+"""Store compiled requirements on jobs
+
+Revision ID: 0006_job_requirements
+Revises: 0005_candidate_parser_version
+Create Date: 2026-10-19 00:00:00
+
+Requirements are compiled when a job is created or updated. Existing jobs
+start without them and are compiled on use until they are next updated.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_job_requirements"
+down_revision: Union[str, None] = "0005_candidate_parser_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("requirements", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "requirements")
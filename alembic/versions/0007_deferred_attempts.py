@@ -0,0 +1,33 @@
+"""Lease and attempt counter for deferred applications
+
+Revision ID: 0007_deferred_attempts
+Revises: 0006_job_requirements
+Create Date: 2026-10-19 00:00:00
+
+The deferred worker claims an application by setting leased_until in a short
+transaction and analyzes it outside any transaction; attempts counts failed
+analyses, and an application is marked failed after
+ADMISSION_DEFERRED_MAX_ATTEMPTS of them.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_deferred_attempts"
+down_revision: Union[str, None] = "0006_job_requirements"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Added on the partitioned parent; Postgres adds the columns to every partition
+    op.add_column("applications", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("applications", sa.Column("leased_until", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("applications", "leased_until")
+    op.drop_column("applications", "attempts")
@@ -0,0 +1,31 @@
+"""Index the deferred worker's claim order
+
+Revision ID: 0008_deferred_claim_index
+Revises: 0007_deferred_attempts
+Create Date: 2026-10-19 00:00:00
+
+The deferred worker claims applications with status 'applied' ordered by
+updated_at (failed attempts move to the back), so (status, updated_at)
+replaces the (status, created_at) index created for it in
+0003_hot_query_indexes.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_deferred_claim_index"
+down_revision: Union[str, None] = "0007_deferred_attempts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_applications_status_updated_at", "applications", ["status", "updated_at"])
+    op.drop_index("ix_applications_status_created_at", table_name="applications")
+
+
+def downgrade() -> None:
+    op.create_index("ix_applications_status_created_at", "applications", ["status", "created_at"])
+    op.drop_index("ix_applications_status_updated_at", table_name="applications")
@@ -0,0 +1,28 @@
+"""Index candidates by resume URL
+
+Revision ID: 0009_candidate_resume_url_index
+Revises: 0008_deferred_claim_index
+Create Date: 2026-10-19 00:00:00
+
+POST /apply/finalize refuses uploads a candidate already refers to, and the
+archival job deletes uploaded CVs no candidate refers to; both look
+candidates up by resume_url.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_candidate_resume_url_index"
+down_revision: Union[str, None] = "0008_deferred_claim_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_candidates_resume_url", "candidates", ["resume_url"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_candidates_resume_url", table_name="candidates")
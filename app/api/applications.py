@@ -1,26 +1,89 @@
 """Application management endpoints."""
+import json
 import logging
+import re
+import time
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy import select
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header, Query, Request, Response, UploadFile, File, Form
+from fastapi.responses import RedirectResponse, StreamingResponse
+from opentelemetry import trace
+from sqlalchemy import insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Job, Candidate, Application
-from app.schemas import ApplicationResponse, ApplyRequest
-from app.services import StorageService, AIParserService, AIScorerService
+from app.config import settings
+from app.database import AsyncSessionLocal, get_db
+from app.models import Job, Candidate, Application, ApplicationKey
+from app.schemas import (
+    ApplicationResponse, FinalizeUploadRequest, StatusTransitionRequest, StatusTransitionResponse, UploadRequest,
+    UploadResponse
+)
+from app.services.admission import AdmissionRejected, admission_controller
+from app.services.application_pipeline import (
+    DEFERRED_STATUS, UNAVAILABLE_ERRORS, AIUnavailableError, DuplicateApplicationError, application_pipeline,
+    deferred_application_worker, deferred_candidate_values
+)
+from app.services.archival import hot_window_start
+from app.services.candidate_dedup import candidate_dedup_service
+from app.services.application_events import StatusChanges, application_event_broker
+from app.services.job_stats import JobStatsDelta, job_stats_service
+from app.services.score_calibration import score_calibration_service
+from app.services.status_transitions import status_transition_service
+from app.services.storage import storage_service
+from app.utils.disconnect import CLIENT_CLOSED_REQUEST, ClientDisconnected, cancel_on_disconnect
+from app.utils.fieldsets import FieldsetError, parse_fields, sparse_response
+from app.utils.tracing import traced, tracer
+from app.utils.upload_tokens import issue_upload_token, verify_upload_token
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["applications"])
 
-storage_service = StorageService()
-ai_parser_service = AIParserService()
-ai_scorer_service = AIScorerService()
+CV_EXTENSIONS = ('.pdf', '.docx')
+
+# Object names handed out for direct uploads (finalize accepts nothing else)
+UPLOAD_OBJECT_NAME = re.compile(r"^resumes/[0-9a-f-]{36}\.(pdf|docx)$")
+
+
+def _resume_object_name(filename: str) -> str:
+    """Validate a CV file name and return a fresh object name with its extension."""
+    if not filename.lower().endswith(CV_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    return f"resumes/{uuid.uuid4()}.{filename.rsplit('.', 1)[-1].lower()}"
+
+
+def _max_upload_mb() -> int:
+    return settings.storage_max_upload_bytes // (1024 * 1024)
+
+
+async def _get_job(db: AsyncSession, job_id: uuid.UUID) -> Job:
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+async def _load_jobs(job_ids: List[str]) -> List[Job]:
+    """
+    Look up jobs in a session of their own, closed before the CV is processed.
+    
+    The request session is only used again to persist the applications, so no
+    connection sits idle in a transaction during upload, extraction and LLM calls.
+    """
+    async with AsyncSessionLocal() as job_db:
+        jobs = [await _get_job(job_db, uuid.UUID(job_id)) for job_id in job_ids]
+        job_db.expunge_all()
+    return jobs
 
 
 @router.post("/apply", response_model=ApplicationResponse, status_code=201)
+@traced("apply_for_job")
 async def apply_for_job(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
     job_id: str = Form(...),
     cv_file: UploadFile = File(...),
     name: str = Form(None),
@@ -32,156 +95,467 @@ async def apply_for_job(
     """
     Apply for a job by uploading CV.
     Automatically triggers AI parsing and scoring.
+    
+    When AI capacity is saturated the request is either rejected with 429 and
+    Retry-After, or accepted with 202 and processed in the background.
+    """
+    form_values = {"name": name, "email": email, "phone": phone, "linkedin": linkedin}
+    applications = await _apply(request, response, background_tasks, [job_id], cv_file, form_values, db)
+    return applications[0]
+
+
+@router.post("/apply/batch", response_model=List[ApplicationResponse], status_code=201)
+@traced("apply_for_jobs")
+async def apply_for_jobs(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    job_ids: List[str] = Form(..., description="Jobs to apply for (repeat the field per job)"),
+    cv_file: UploadFile = File(...),
+    name: str = Form(None),
+    email: str = Form(None),
+    phone: str = Form(None),
+    linkedin: str = Form(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply for several jobs with one CV upload.
+    
+    The CV is stored, extracted and parsed once and scored against every job
+    concurrently; all applications are created in one transaction, so if the
+    candidate already applied to any of the jobs none is created (409).
     """
+    job_ids = list(dict.fromkeys(job_ids))
+    if len(job_ids) > settings.apply_max_jobs_per_request:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.apply_max_jobs_per_request} jobs can be applied to at once"
+        )
+    form_values = {"name": name, "email": email, "phone": phone, "linkedin": linkedin}
+    return await _apply(request, response, background_tasks, job_ids, cv_file, form_values, db)
+
+
+async def _apply(
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    job_ids: List[str],
+    cv_file: UploadFile,
+    form_values: Dict[str, Optional[str]],
+    db: AsyncSession
+) -> List[Application]:
+    """Store, analyze and persist one CV applied to one or more jobs; applications in job order."""
+    client_id = request.headers.get("X-Client-ID") or (request.client.host if request.client else None)
     try:
-        # Validate job exists
-        job_uuid = uuid.UUID(job_id)
-        result = await db.execute(select(Job).where(Job.id == job_uuid))
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
-        # Validate file type
-        if not cv_file.filename.lower().endswith(('.pdf', '.docx')):
-            raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
-        
-        # Validate file size (10MB max)
-        file_content = await cv_file.read()
-        if len(file_content) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File size must be less than 10MB")
-        
-        # Generate unique filename
-        file_extension = cv_file.filename.split('.')[-1]
-        object_name = f"resumes/{uuid.uuid4()}.{file_extension}"
+        # Per-job limits only apply to single-job requests
+        async with admission_controller.admit(client_id, job_ids[0] if len(job_ids) == 1 else None) as ticket:
+            # Validate jobs exist and file type
+            jobs = await _load_jobs(job_ids)
+            object_name = _resume_object_name(cv_file.filename)
+            
+            # Validate file size
+            file_content = await cv_file.read()
+            if len(file_content) > settings.storage_max_upload_bytes:
+                raise HTTPException(status_code=400, detail=f"File size must be less than {_max_upload_mb()}MB")
+            span = trace.get_current_span()
+            span.set_attributes({"job.ids": job_ids, "cv.bytes": len(file_content), "admission.deferred": ticket.deferred})
+            
+            try:
+                # Upload and analysis stop when the client goes away
+                try:
+                    candidate_values, results, deferred = await cancel_on_disconnect(
+                        request, _store_and_analyze(jobs, cv_file, file_content, object_name, form_values, ticket.deferred)
+                    )
+                except ClientDisconnected:
+                    raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+                
+                async with admission_controller.stage("persist"):
+                    with tracer.start_as_current_span("apply.persist"):
+                        applications = await _create_applications(
+                            db,
+                            [(job.id, status, scores) for job, (scores, status) in zip(jobs, results)],
+                            candidate_values
+                        )
+            except Exception:
+                # No candidate refers to the CV unless the applications were stored
+                await _discard_upload(object_name)
+                raise
+            
+            scored_ids = [application.id for application in applications if application.status == "scored"]
+            if scored_ids:
+                background_tasks.add_task(score_calibration_service.calibrate_new_applications, scored_ids)
+            if deferred:
+                response.status_code = 202
+                for application in applications:
+                    deferred_application_worker.notify(application.id)
+            span.set_attribute("application.ids", [str(application.id) for application in applications])
+            
+            for application in applications:
+                logger.info(f"Application created: {application.id} for job {application.job_id} ({application.status})")
+            return applications
         
-        # Upload to MinIO
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Application processing is at capacity ({e.reason}), please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except DuplicateApplicationError:
+        raise HTTPException(status_code=409, detail="Candidate has already applied to this job")
+    except UNAVAILABLE_ERRORS as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Application processing is unavailable ({e}), please retry later",
+            headers={"Retry-After": str(admission_controller.retry_after())}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing application: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+async def _discard_upload(object_name: str):
+    """Best-effort removal of an uploaded CV whose applications were not stored (the archival sweep catches leftovers)."""
+    try:
+        await storage_service.delete_file(object_name)
+    except Exception as e:
+        logger.warning(f"Could not delete uploaded CV {object_name}: {e}")
+
+
+async def _store_and_analyze(
+    jobs: List[Job],
+    cv_file: UploadFile,
+    file_content: bytes,
+    object_name: str,
+    form_values: Dict[str, Optional[str]],
+    deferred: bool
+) -> Tuple[Dict[str, Any], List[Tuple[Dict[str, Any], str]], bool]:
+    """
+    Upload the CV and analyze it, unless deferred by admission or because the LLM is unavailable.
+    
+    Returns:
+        Candidate values (with resume_url), (scores, status) per job and whether the applications are deferred
+    """
+    async with admission_controller.stage("upload"):
         resume_url = await storage_service.upload_file(
             file_content,
             object_name,
             cv_file.content_type or "application/octet-stream"
         )
-        
-        # Extract text from CV
-        cv_text = ai_parser_service.extract_text(file_content, cv_file.filename)
-        
-        # Parse CV with AI
-        parsed_data = await ai_parser_service.parse_cv(cv_text)
-        
-        # Use parsed data or form data (form data takes precedence if provided)
-        candidate_name = name or parsed_data.get("name") or "Unknown"
-        candidate_email = email or parsed_data.get("email") or f"unknown_{uuid.uuid4().hex[:8]}@example.com"
-        candidate_phone = phone or parsed_data.get("phone")
-        candidate_linkedin = linkedin or parsed_data.get("linkedin")
-        
-        # Check if candidate exists by email
-        result = await db.execute(select(Candidate).where(Candidate.email == candidate_email))
-        candidate = result.scalar_one_or_none()
-        
-        if candidate:
-            # Update existing candidate
-            candidate.name = candidate_name
-            candidate.phone = candidate_phone
-            candidate.linkedin = candidate_linkedin
-            candidate.resume_url = resume_url
-            candidate.skills = parsed_data.get("skills", [])
-            candidate.experience_years = parsed_data.get("experience_years")
-            candidate.education = parsed_data.get("education")
-        else:
-            # Create new candidate
-            candidate = Candidate(
-                name=candidate_name,
-                email=candidate_email,
-                phone=candidate_phone,
-                linkedin=candidate_linkedin,
-                resume_url=resume_url,
-                skills=parsed_data.get("skills", []),
-                experience_years=parsed_data.get("experience_years"),
-                education=parsed_data.get("education")
+    
+    if not deferred:
+        try:
+            # Score candidate before touching the database so persistence is one statement per job
+            candidate_values, results = await application_pipeline.analyze_many(
+                jobs, file_content, cv_file.filename, cv_file.content_type, form_values
             )
-            db.add(candidate)
-        
-        await db.flush()
-        
-        # Create application
-        application = Application(
-            job_id=job.id,
-            candidate_id=candidate.id,
-            status="parsed"
+        except AIUnavailableError as e:
+            logger.warning(f"AI processing unavailable ({e}), deferring application")
+            deferred = True
+    if deferred:
+        # Store the applications now; the deferred worker parses and scores them
+        candidate_values = deferred_candidate_values(form_values)
+        results = [(None, DEFERRED_STATUS)] * len(jobs)
+    candidate_values["resume_url"] = resume_url
+    return candidate_values, results, deferred
+
+
+@router.post("/apply/uploads", response_model=UploadResponse, status_code=201)
+async def create_upload(request: UploadRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Start a direct CV upload.
+    
+    Returns a presigned PUT URL and an upload token; the client uploads the CV
+    straight to object storage and then calls ``POST /apply/finalize`` with the
+    object name and token.
+    """
+    try:
+        await _get_job(db, request.job_id)
+        object_name = _resume_object_name(request.filename)
+        upload_url = storage_service.presigned_upload_url(object_name)
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.storage_upload_expiry_seconds)
+        token_expires = int(time.time()) + settings.storage_upload_expiry_seconds + settings.storage_finalize_window_seconds
+        return UploadResponse(
+            object_name=object_name,
+            upload_url=upload_url,
+            expires_at=expires_at,
+            upload_token=issue_upload_token(object_name, request.job_id, token_expires)
         )
-        db.add(application)
-        await db.flush()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating upload URL: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/apply/finalize", response_model=ApplicationResponse, status_code=202)
+async def finalize_upload(request: FinalizeUploadRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Create the application for a CV uploaded through ``POST /apply/uploads``.
+    
+    The upload token must match the object and job and not have expired, and
+    each upload can be finalized once. The uploaded object is checked (exists,
+    within the size limit) and the application is stored with status ``applied``; extraction, parsing and
+    scoring run in the deferred worker, so the CV never passes through this
+    request.
+    """
+    try:
+        if not UPLOAD_OBJECT_NAME.match(request.object_name):
+            raise HTTPException(status_code=400, detail="Invalid upload object name")
+        if not verify_upload_token(request.upload_token, request.object_name, request.job_id):
+            raise HTTPException(status_code=403, detail="Invalid or expired upload token")
+        job = await _get_job(db, request.job_id)
+        resume_url = storage_service.object_url(request.object_name)
+        finalized = await db.execute(select(Candidate.id).where(Candidate.resume_url == resume_url).limit(1))
+        if finalized.scalar_one_or_none() is not None:
+            raise HTTPException(status_code=409, detail="Upload has already been finalized")
         
-        # Score candidate
-        try:
-            scores = await ai_scorer_service.score_candidate(
-                candidate_profile={
-                    "name": candidate.name,
-                    "skills": candidate.skills,
-                    "experience_years": candidate.experience_years,
-                    "education": candidate.education
-                },
-                job_description=job.jd_text,
-                required_skills=job.required_skills
-            )
-            
-            application.scores = scores
-            application.status = "scored"
-        except Exception as e:
-            logger.error(f"Error scoring candidate: {e}")
-            # Continue without scores
+        stat = await storage_service.stat_file(request.object_name)
+        if stat is None:
+            raise HTTPException(status_code=404, detail="Upload not found; PUT the CV to the upload URL first")
+        size, _ = stat
+        if size > settings.storage_max_upload_bytes:
+            await storage_service.delete_file(request.object_name)
+            raise HTTPException(status_code=400, detail=f"File size must be less than {_max_upload_mb()}MB")
         
-        await db.commit()
-        await db.refresh(application)
+        candidate_values = deferred_candidate_values({
+            "name": request.name, "email": request.email, "phone": request.phone, "linkedin": request.linkedin
+        })
+        candidate_values["resume_url"] = resume_url
+        application = await _create_application(db, job.id, candidate_values, DEFERRED_STATUS, None)
+        deferred_application_worker.notify(application.id)
         
-        logger.info(f"Application created: {application.id} for job {job.id}")
+        logger.info(f"Application created from direct upload: {application.id} for job {job.id} ({size} bytes)")
         return application
-        
+    except DuplicateApplicationError:
+        raise HTTPException(status_code=409, detail="Candidate has already applied to this job")
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing application: {e}")
+        logger.error(f"Error finalizing upload: {e}")
         await db.rollback()
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/candidates/{candidate_id}/resume", status_code=307)
+async def download_resume(candidate_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Redirect to a short-lived presigned download URL of the candidate's CV."""
+    try:
+        result = await db.execute(select(Candidate.resume_url).where(Candidate.id == candidate_id))
+        resume_url = result.scalar_one_or_none()
+        if resume_url is None:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        return RedirectResponse(storage_service.presigned_download_url(resume_url), status_code=307)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error presigning resume download: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _create_application(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    candidate_values: Dict[str, Any],
+    status: str,
+    scores: Optional[Dict[str, Any]]
+) -> Application:
+    """Persist a new application with its job stats, status event and duplicate index entry, and commit."""
+    applications = await _create_applications(db, [(job_id, status, scores)], candidate_values)
+    return applications[0]
+
+
+async def _create_applications(
+    db: AsyncSession,
+    entries: List[Tuple[uuid.UUID, str, Optional[Dict[str, Any]]]],
+    candidate_values: Dict[str, Any]
+) -> List[Application]:
+    """
+    Persist one candidate's applications to several jobs in one transaction, and commit.
+    
+    Args:
+        db: Database session
+        entries: (job_id, status, scores) per application
+        candidate_values: Candidate column values shared by the applications
+        
+    Returns:
+        The applications, in entry order
+    """
+    applications = [
+        await _persist_application(db, job_id, candidate_values, status, scores)
+        for job_id, status, scores in entries
+    ]
+    if "minhash" in candidate_values:
+        await candidate_dedup_service.index(
+            db,
+            applications[0].candidate_id,
+            candidate_values["minhash"],
+            candidate_values.get("phone"),
+            candidate_values.get("linkedin")
+        )
+    
+    stats_delta = JobStatsDelta()
+    status_changes = StatusChanges()
+    for application in applications:
+        stats_delta.created(application.job_id, application.status, application.scores)
+        status_changes.changed(application.id, application.job_id, None, application.status)
+    await job_stats_service.apply(db, stats_delta)
+    await application_event_broker.record(db, status_changes)
+    await db.commit()
+    return applications
+
+
+async def _persist_application(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    candidate_values: Dict[str, Any],
+    status: str,
+    scores: Optional[Dict[str, Any]]
+) -> Application:
+    """
+    Upsert the candidate and insert the application in one round trip.
+    
+    The candidate is upserted on its unique email with INSERT ... ON CONFLICT
+    inside a CTE, and the application row (including scores) is inserted from
+    the CTE's RETURNING, so concurrent applications with the same email update
+    the same candidate instead of violating the unique constraint. The
+    (job, candidate) key is claimed in the same statement; if the candidate
+    already applied to the job no application is inserted.
+    
+    Raises:
+        DuplicateApplicationError: If the candidate already applied to the job
+    """
+    now = datetime.utcnow()
+    application_id = uuid.uuid4()
+    # Explicit ids and timestamps: column defaults are not rendered for both INSERTs of one statement
+    candidate_insert = pg_insert(Candidate).values(
+        **candidate_values, id=uuid.uuid4(), created_at=now, updated_at=now
+    )
+    upserted = candidate_insert.on_conflict_do_update(
+        index_elements=[Candidate.email],
+        set_={
+            **{key: candidate_insert.excluded[key] for key in candidate_values if key != "email"},
+            "updated_at": now
+        }
+    ).returning(Candidate.id).cte("upserted_candidate")
+    
+    claimed_key = pg_insert(ApplicationKey).from_select(
+        ["job_id", "candidate_id", "application_id"],
+        select(
+            literal(job_id, ApplicationKey.job_id.type),
+            upserted.c.id,
+            literal(application_id, ApplicationKey.application_id.type)
+        )
+    ).on_conflict_do_nothing().returning(ApplicationKey.candidate_id).cte("claimed_key")
+    
+    application_insert = insert(Application).from_select(
+        ["id", "job_id", "candidate_id", "status", "scores", "created_at", "updated_at"],
+        select(
+            literal(application_id, Application.id.type),
+            literal(job_id, Application.job_id.type),
+            claimed_key.c.candidate_id,
+            literal(status, Application.status.type),
+            literal(scores, Application.scores.type),
+            literal(now, Application.created_at.type),
+            literal(now, Application.updated_at.type)
+        )
+    ).returning(Application)
+    
+    result = await db.execute(select(Application).from_statement(application_insert))
+    application = result.scalar_one_or_none()
+    if application is None:
+        raise DuplicateApplicationError(None, [job_id])
+    return application
 
 
 @router.get("/applications", response_model=List[ApplicationResponse])
 async def list_applications(
+    created_after: Optional[datetime] = Query(None, description="Only applications created after this time (default: hot window)"),
+    include_archived: bool = Query(False, description="Include applications of archived jobs"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,scores (default: all)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all applications."""
+    """List applications, newest first; by default only recent, non-archived ones."""
     try:
-        query = select(Application).order_by(Application.created_at.desc())
+        names = parse_fields(fields, ApplicationResponse)
+        columns = [getattr(Application, name) for name in names] if names else [Application]
+        # Bounding created_at and archived lets Postgres prune old and archive partitions
+        query = select(*columns).where(
+            Application.created_at >= (created_after or hot_window_start())
+        ).order_by(Application.created_at.desc())
+        if not include_archived:
+            query = query.where(Application.archived.is_(False))
         result = await db.execute(query)
+        if names:
+            return sparse_response(result.all(), names)
         applications = result.scalars().all()
         
         return applications
+    except FieldsetError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing applications: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/applications/events")
+async def stream_application_events(
+    request: Request,
+    job_id: Optional[uuid.UUID] = Query(None, description="Only stream events for this job"),
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Stream application status transitions as server-sent events.
+    
+    Reconnecting clients send Last-Event-ID and receive the events they missed
+    before live delivery resumes.
+    """
+    return StreamingResponse(
+        _status_event_stream(request, job_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _status_event_stream(
+    request: Request,
+    job_id: Optional[uuid.UUID],
+    last_event_id: Optional[int]
+) -> AsyncIterator[str]:
+    """Format subscription events as SSE frames, with comment lines as keepalives."""
+    yield "retry: 3000\n\n"
+    async with application_event_broker.subscribe(job_id) as subscription:
+        async for event in subscription.events(application_event_broker, last_event_id):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event['id']}\nevent: status\ndata: {json.dumps(event)}\n\n"
+
+
 @router.post("/applications/{application_id}/shortlist", response_model=ApplicationResponse)
 async def shortlist_application(
     application_id: uuid.UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """Mark an application as shortlisted."""
+    """Mark a parsed or scored application as shortlisted; 409 if its status does not allow it."""
     try:
-        result = await db.execute(
-            select(Application).where(Application.id == application_id)
-        )
-        application = result.scalar_one_or_none()
-        
-        if not application:
-            raise HTTPException(status_code=404, detail="Application not found")
-        
-        application.status = "shortlisted"
+        result = await status_transition_service.transition(db, "shortlisted", application_ids=[application_id])
+        if not result.applications:
+            current = await db.execute(
+                select(Application.status, Application.archived).where(Application.id == application_id)
+            )
+            application = current.first()
+            if not application:
+                raise HTTPException(status_code=404, detail="Application not found")
+            state = "archived" if application.archived else application.status
+            raise HTTPException(status_code=409, detail=f"Cannot shortlist an application that is {state}")
         await db.commit()
-        await db.refresh(application)
         
         logger.info(f"Application shortlisted: {application_id}")
-        return application
+        return result.applications[0]
         
     except HTTPException:
         raise
@@ -190,3 +564,41 @@ async def shortlist_application(
         await db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
+
+@router.post("/applications/transitions", response_model=StatusTransitionResponse)
+async def transition_applications(
+    request: StatusTransitionRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Move many applications to a status in one statement.
+    
+    Select applications by ``application_ids``, or by ``job_id`` optionally
+    narrowed to the ``top_k`` best overall scores at or above ``min_score``
+    (e.g. shortlist the top 200 of a job). Applications whose current status
+    cannot move to the target are left unchanged and reported in ``skipped_ids``
+    when they were requested by id.
+    """
+    try:
+        result = await status_transition_service.transition(
+            db,
+            request.status,
+            application_ids=request.application_ids,
+            job_id=request.job_id,
+            top_k=request.top_k,
+            min_score=request.min_score
+        )
+        await db.commit()
+        
+        return StatusTransitionResponse(
+            status=result.status,
+            updated=len(result.applications),
+            applications=result.applications,
+            skipped_ids=result.skipped_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error transitioning applications: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
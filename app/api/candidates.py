@@ -0,0 +1,69 @@
+"""Candidate deduplication endpoints."""
+import logging
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Candidate
+from app.schemas import CandidateDuplicate, CandidateMergeRequest, CandidateMergeResponse
+from app.services.candidate_dedup import candidate_dedup_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1/candidates", tags=["candidates"])
+
+
+@router.get("/{candidate_id}/duplicates", response_model=List[CandidateDuplicate])
+async def list_duplicates(candidate_id: UUID, db: AsyncSession = Depends(get_db)):
+    """List probable duplicates of a candidate, most similar first."""
+    try:
+        result = await db.execute(
+            select(Candidate.name, Candidate.phone, Candidate.linkedin, Candidate.minhash)
+            .where(Candidate.id == candidate_id)
+        )
+        candidate = result.one_or_none()
+        if candidate is None:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+
+        matches = await candidate_dedup_service.find_duplicates(
+            db, candidate.minhash, candidate.phone, candidate.linkedin, candidate.name, exclude_ids=[candidate_id]
+        )
+        return [match.as_dict() for match in matches]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finding duplicates of candidate {candidate_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/{candidate_id}/merge", response_model=CandidateMergeResponse)
+async def merge_candidates(
+    candidate_id: UUID,
+    request: CandidateMergeRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Merge duplicate candidates into this candidate.
+
+    Their applications move to this candidate; where both applied to the same
+    job, the duplicate's application is removed. The duplicates are deleted.
+    """
+    try:
+        outcome = await candidate_dedup_service.merge(db, candidate_id, request.duplicate_ids)
+        await db.commit()
+        return CandidateMergeResponse(
+            id=outcome.target_id,
+            merged_ids=outcome.merged_ids,
+            moved_application_ids=outcome.moved_application_ids,
+            removed_application_ids=outcome.removed_application_ids
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error merging candidates into {candidate_id}: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,71 @@
+"""Pipeline export endpoints."""
+import logging
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Job
+from app.services.export import export_service
+from app.utils.compression import negotiate_encoding
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/v1", tags=["exports"])
+
+FORMAT_PATTERN = "^(csv|parquet)$"
+
+
+def _export_response(request: Request, export_format: str, job_id: Optional[UUID], filename: str) -> StreamingResponse:
+    """Build a streaming export response, gzip-compressing CSV when the client accepts it."""
+    if export_format == "parquet":
+        # Parquet pages are already zstd-compressed, so no transfer encoding is applied
+        return StreamingResponse(
+            export_service.iter_parquet(job_id),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.parquet"'}
+        )
+    
+    # The CSV writer only produces gzip; q-values (e.g. "gzip;q=0") are honored
+    gzip = negotiate_encoding(request.headers.get("accept-encoding", ""), ("gzip",)) == "gzip"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.csv"', "Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_service.iter_csv(job_id, gzip=gzip),
+        media_type="text/csv; charset=utf-8",
+        headers=headers
+    )
+
+
+@router.get("/applications/export")
+async def export_applications(
+    request: Request,
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description="Export format (csv/parquet)"),
+    job_id: Optional[UUID] = Query(None, description="Only export applications for this job")
+):
+    """Stream all applications with candidate fields and flattened scores as CSV or Parquet."""
+    return _export_response(request, format, job_id, f"applications-{job_id}" if job_id else "applications")
+
+
+@router.get("/jobs/{job_id}/export")
+async def export_job_pipeline(
+    job_id: UUID,
+    request: Request,
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description="Export format (csv/parquet)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream a job's candidate pipeline as CSV or Parquet."""
+    try:
+        result = await db.execute(select(Job.id).where(Job.id == job_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error exporting job pipeline: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    return _export_response(request, format, job_id, f"job-{job_id}")
@@ -11,6 +11,9 @@ from app.database import get_db
 from app.models import Application
 from app.schemas.application import SyncSuccessFactorsRequest
 from app.services import SuccessFactorsService
+from app.services.application_events import StatusChanges, application_event_broker
+from app.services.job_stats import JobStatsDelta, job_stats_service
+from app.services.storage import storage_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/integrations", tags=["integrations"])
@@ -32,7 +35,8 @@ async def sync_to_successfactors(
     try:
         # Fetch applications with related data
         query = select(Application).where(
-            Application.id.in_(request.application_ids)
+            Application.id.in_(request.application_ids),
+            Application.archived.is_(False)
         ).options(
             selectinload(Application.candidate),
             selectinload(Application.job)
@@ -60,7 +64,7 @@ async def sync_to_successfactors(
                 "candidate_name": app.candidate.name,
                 "candidate_email": app.candidate.email,
                 "candidate_phone": app.candidate.phone,
-                "resume_url": app.candidate.resume_url,
+                "resume_url": storage_service.presigned_download_url(app.candidate.resume_url),
                 "scores": app.scores,
                 "created_at": app.created_at
             }
@@ -70,9 +74,15 @@ async def sync_to_successfactors(
         sync_result = await successfactors_service.sync_applications(app_data_list)
         
         # Update application status to synced
+        stats_delta = JobStatsDelta()
+        status_changes = StatusChanges()
         for app in applications:
+            stats_delta.changed(app.job_id, app.status, "synced", app.scores, app.scores)
+            status_changes.changed(app.id, app.job_id, app.status, "synced")
             app.status = "synced"
         
+        await job_stats_service.apply(db, stats_delta)
+        await application_event_broker.record(db, status_changes)
         await db.commit()
         
         logger.info(f"Synced {len(applications)} applications to SuccessFactors")
@@ -1,6 +1,6 @@
 """Job management endpoints."""
 import logging
-from typing import List
+from typing import Any, Dict, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
@@ -9,7 +9,13 @@ from sqlalchemy.orm import selectinload
 
 from app.database import get_db
 from app.models import Job, Application, Candidate
-from app.schemas import JobCreate, JobResponse, JobDetailResponse, CandidateSummary
+from app.models.job_stats import SCORE_BUCKET_COUNT, SCORE_BUCKET_WIDTH
+from app.schemas import JobCreate, JobUpdate, JobResponse, JobDetailResponse, CandidateSummary, JobStatsResponse
+from app.services.job_requirements import job_requirements_compiler, skill_coverage
+from app.services.job_stats import job_stats_service
+from app.services.score_calibration import score_calibration_service
+from app.services.storage import storage_service
+from app.utils.fieldsets import FieldsetError, parse_fields, sparse_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
@@ -18,19 +24,26 @@ router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
 @router.get("", response_model=List[JobResponse])
 async def list_jobs(
     status: str = Query(None, description="Filter by status (active/closed)"),
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. id,title,status (default: all)"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all jobs with optional status filter."""
+    """List all jobs with optional status filter; ``fields`` limits the columns selected and returned."""
     try:
-        query = select(Job)
+        names = parse_fields(fields, JobResponse)
+        columns = [getattr(Job, name) for name in names] if names else [Job]
+        query = select(*columns)
         if status:
             query = query.where(Job.status == status)
         query = query.order_by(Job.created_at.desc())
         
         result = await db.execute(query)
+        if names:
+            return sparse_response(result.all(), names)
         jobs = result.scalars().all()
         
         return jobs
+    except FieldsetError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing jobs: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -48,7 +61,10 @@ async def create_job(
             location=job_data.location,
             status=job_data.status,
             jd_text=job_data.jd_text,
-            required_skills=job_data.required_skills
+            required_skills=job_data.required_skills,
+            requirements=job_requirements_compiler.compile(
+                job_data.title, job_data.jd_text, job_data.required_skills
+            )
         )
         
         db.add(job)
@@ -63,41 +79,90 @@ async def create_job(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.patch("/{job_id}", response_model=JobResponse)
+async def update_job(
+    job_id: UUID,
+    job_data: JobUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a job posting; its compiled requirements are rebuilt when title, description or skills change."""
+    try:
+        result = await db.execute(select(Job).where(Job.id == job_id))
+        job = result.scalar_one_or_none()
+        
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        changes = job_data.model_dump(exclude_unset=True, exclude_none=True)
+        for name, value in changes.items():
+            setattr(job, name, value)
+        if changes.keys() & {"title", "jd_text", "required_skills"} or job.requirements is None:
+            job.requirements = job_requirements_compiler.compile(job.title, job.jd_text, job.required_skills)
+        
+        await db.commit()
+        await db.refresh(job)
+        
+        logger.info(f"Updated job: {job.id} ({', '.join(changes) or 'no changes'})")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating job: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/{job_id}", response_model=JobDetailResponse)
 async def get_job_detail(
     job_id: UUID,
     min_score: float = Query(None, ge=0, le=100, description="Minimum overall score filter"),
+    min_skill_match: float = Query(None, ge=0, le=1, description="Minimum share of required skills the candidate lists"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get job details with candidate pipeline."""
     try:
-        # Get job with applications
-        query = select(Job).where(Job.id == job_id).options(
-            selectinload(Job.applications).selectinload(Application.candidate)
-        )
-        result = await db.execute(query)
+        # Get job
+        result = await db.execute(select(Job).where(Job.id == job_id))
         job = result.scalar_one_or_none()
         
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
+        # Applications cannot predate the job, so partitions older than it are pruned
+        result = await db.execute(
+            select(Application)
+            .where(
+                Application.job_id == job.id,
+                Application.created_at >= job.created_at
+            )
+            .options(selectinload(Application.candidate))
+        )
+        
+        requirements = job_requirements_compiler.for_job(job)
+        
         # Build candidate summaries
         candidates = []
-        for application in job.applications:
+        for application in result.scalars().all():
             overall_score = application.scores.get("overall_score") if application.scores else None
             
             # Apply score filter if specified
             if min_score is not None and (overall_score is None or overall_score < min_score):
                 continue
             
+            skill_match = skill_coverage(application.candidate.skills, requirements)
+            if min_skill_match is not None and skill_match is not None and skill_match < min_skill_match:
+                continue
+            
             candidate_summary = CandidateSummary(
                 id=application.candidate.id,
                 name=application.candidate.name,
                 email=application.candidate.email,
                 skills=application.candidate.skills,
                 experience_years=application.candidate.experience_years,
+                resume_url=storage_service.presigned_download_url(application.candidate.resume_url),
                 application_status=application.status,
-                overall_score=overall_score
+                overall_score=overall_score,
+                skill_match=round(skill_match, 3) if skill_match is not None else None
             )
             candidates.append(candidate_summary)
         
@@ -112,6 +177,7 @@ async def get_job_detail(
             status=job.status,
             jd_text=job.jd_text,
             required_skills=job.required_skills,
+            requirements=requirements,
             created_at=job.created_at,
             updated_at=job.updated_at,
             candidates=candidates
@@ -124,3 +190,68 @@ async def get_job_detail(
         logger.error(f"Error getting job detail: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+
+
+@router.get("/{job_id}/stats", response_model=JobStatsResponse)
+async def get_job_stats(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get pipeline statistics for a job (status counts, score histogram, mean and variance)."""
+    try:
+        stats = await job_stats_service.get(db, job_id)
+        
+        if stats is None:
+            # No application recorded yet: distinguish an empty pipeline from a missing job
+            result = await db.execute(select(Job.id).where(Job.id == job_id))
+            if result.scalar_one_or_none() is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return JobStatsResponse(
+                job_id=job_id,
+                score_histogram=[0] * SCORE_BUCKET_COUNT,
+                score_bucket_width=SCORE_BUCKET_WIDTH
+            )
+        
+        return JobStatsResponse(
+            job_id=stats.job_id,
+            total_count=stats.total_count,
+            status_counts=stats.status_counts,
+            score_histogram=stats.score_histogram,
+            score_bucket_width=SCORE_BUCKET_WIDTH,
+            score_count=stats.score_count,
+            mean_score=stats.mean_score,
+            score_variance=stats.score_variance,
+            updated_at=stats.updated_at
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting job stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/{job_id}/calibrate")
+async def calibrate_job_scores(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Recalibrate scores across all applicants of a job.
+    
+    Computes per-criterion z-scores, weighted composites, percentiles and ranks,
+    and stores them on the applications.
+    """
+    try:
+        result = await db.execute(select(Job.id).where(Job.id == job_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        
+        summary = await score_calibration_service.calibrate_job(db, job_id)
+        await db.commit()
+        return summary
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error calibrating job scores: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,6 +1,6 @@
 """Application configuration."""
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -12,9 +12,24 @@ class Settings(BaseSettings):
     app_host: str = "0.0.0.0"
     app_port: int = 8000
     
+    # Production server (python -m app.server): worker processes (0 = one per
+    # available CPU), drain deadline for in-flight requests on SIGTERM, and
+    # worker recycling after max requests (0 = never)
+    server_workers: int = 0
+    server_drain_timeout_seconds: int = 30
+    server_worker_timeout_seconds: int = 120
+    server_keepalive_seconds: int = 5
+    server_max_requests: int = 0
+    
     # Database
     database_url: str
     
+    # Read replica for GET endpoints (optional); reads fall back to the primary
+    # when the replica is unreachable or lags more than the allowed seconds
+    database_read_url: Optional[str] = None
+    database_read_max_lag_seconds: float = 5.0
+    database_read_check_interval_seconds: float = 5.0
+    
     # MinIO
     minio_endpoint: str
     minio_access_key: str
@@ -22,9 +37,200 @@ class Settings(BaseSettings):
     minio_bucket: str = "resumes"
     minio_secure: bool = False
     
+    # Direct CV uploads: presigned URLs are signed for the endpoint clients reach
+    # (defaults to MINIO_ENDPOINT); PUT URLs for uploads, short-lived GET URLs
+    # wherever resume_url is served, and the largest upload finalize accepts.
+    # Finalize requires the upload token issued with the PUT URL (HMAC with
+    # UPLOAD_TOKEN_SECRET, defaulting to MINIO_SECRET_KEY), valid for the
+    # finalize window after the PUT URL expires; uploads no candidate refers to
+    # are deleted by the archival job once older than the orphan grace period
+    minio_public_endpoint: Optional[str] = None
+    minio_public_secure: Optional[bool] = None
+    minio_region: str = "us-east-1"
+    storage_upload_expiry_seconds: int = 900
+    storage_download_expiry_seconds: int = 300
+    storage_max_upload_bytes: int = 10 * 1024 * 1024
+    upload_token_secret: Optional[str] = None
+    storage_finalize_window_seconds: int = 3600
+    storage_orphan_grace_seconds: int = 86400
+    
+    # Most jobs one CV can be applied to in a single /apply/batch request
+    apply_max_jobs_per_request: int = 10
+    
     # OpenAI
     openai_api_key: str
     
+    # LLM provider: openai, record, replay, synthetic
+    llm_provider_mode: str = "openai"
+    llm_cassette_path: str = "cassettes/llm.jsonl"
+    llm_replay_strict: bool = False
+    llm_replay_latency_scale: float = 0.0
+    
+    # Document extraction: PDF engine (pypdf2, pdfplumber) and the number of
+    # characters after which extraction stops reading further pages (0 = no limit)
+    pdf_extraction_engine: str = "pypdf2"
+    extraction_max_chars: int = 50000
+    
+    # Rule-based CV fast path: fields extracted locally with at least this
+    # confidence are not requested from the LLM; per-field overrides take precedence
+    cv_fast_path_enabled: bool = True
+    cv_fast_path_confidence: float = 0.8
+    cv_fast_path_field_confidence: Dict[str, float] = {}
+    cv_skills_dictionary_path: Optional[str] = None
+    
+    # Scoring: criterion weights for overall_score and calibrated composites, the
+    # growth in scored applications that triggers a full recalibration of a job,
+    # how long new scores are batched before a job's ranks are refreshed (and how
+    # often a failed refresh is retried), and the length of the condensed
+    # description in compiled job requirements
+    score_weights: Dict[str, float] = {
+        "skill_fit": 0.4,
+        "experience_fit": 0.3,
+        "education_fit": 0.15,
+        "keyword_match": 0.15
+    }
+    calibration_refresh_ratio: float = 0.1
+    calibration_rerank_delay_seconds: float = 2.0
+    calibration_rerank_max_attempts: int = 3
+    job_summary_max_chars: int = 1200
+    
+    # Candidate deduplication (MinHash/LSH over CV text plus exact phone and
+    # LinkedIn keys): estimated similarity of a probable duplicate, name
+    # similarity required for phone/LinkedIn matches, similarity above which a
+    # duplicate's parsed fields are reused instead of calling the LLM, bucket
+    # matches verified per lookup, and buckets too crowded to cluster on
+    dedup_enabled: bool = True
+    dedup_similarity_threshold: float = 0.7
+    dedup_name_similarity: float = 0.5
+    dedup_reuse_threshold: float = 0.95
+    dedup_probe_limit: int = 20
+    dedup_max_bucket_size: int = 50
+    dedup_batch_size: int = 100
+    
+    # Re-parsing stored CVs (scripts/reparse_candidates.py) after the parse prompt
+    # or model changes: candidates per keyset batch, concurrent LLM calls in
+    # online mode, storage prefix of the cached extracted CV text, and the
+    # directory where batch mode writes request files and reads result files
+    reparse_batch_size: int = 50
+    reparse_concurrency: int = 4
+    reparse_text_prefix: str = "text/"
+    reparse_batch_dir: str = "batches/reparse"
+    
+    # Applications partitioning and archival: monthly partitions provisioned
+    # ahead, the created_at window listings default to, and how long a job must
+    # be closed before its applications are archived and its CVs moved to the
+    # compressed cold prefix
+    partition_months_ahead: int = 3
+    applications_hot_window_days: int = 365
+    archive_after_days: int = 30
+    archive_cold_prefix: str = "cold/"
+    archive_batch_size: int = 100
+    
+    # Application status events (SSE): NOTIFY channel, per-subscriber buffer,
+    # keepalive interval, the maximum number of events replayed per query and
+    # how long logged events are kept for replay (pruned by the archival job)
+    events_channel: str = "application_status"
+    events_queue_size: int = 256
+    events_keepalive_seconds: float = 15.0
+    events_replay_batch_size: int = 500
+    events_retention_days: int = 30
+    
+    # Admission control for /apply (per worker): budgets for admitted requests,
+    # in-flight LLM calls and LLM p95 latency (0 = no limit); over budget, new
+    # applications are shed with 429 or deferred to the background worker.
+    # Per-client/per-job concurrency limits (0 = unlimited) accept overrides by id.
+    # The deferred worker leases an application while analyzing it and marks it
+    # failed after the maximum number of failed attempts.
+    admission_enabled: bool = True
+    admission_overload_action: str = "shed"  # shed, defer
+    admission_max_queue_depth: int = 64
+    admission_max_in_flight_llm: int = 32
+    admission_llm_p95_budget_ms: float = 0.0
+    admission_latency_window_seconds: float = 60.0
+    admission_max_per_client: int = 0
+    admission_max_per_job: int = 0
+    admission_client_limits: Dict[str, int] = {}
+    admission_job_limits: Dict[str, int] = {}
+    admission_max_retry_after_seconds: int = 120
+    admission_deferred_concurrency: int = 2
+    admission_deferred_poll_seconds: float = 10.0
+    admission_deferred_lease_seconds: float = 600.0
+    admission_deferred_max_attempts: int = 5
+    
+    # Resilience: per-stage deadlines in seconds (stages not listed have none),
+    # the timeout of one LLM call, hedging (a second attempt once a call has
+    # outlasted its operation's p95 latency), the LLM circuit breaker (opens
+    # when the failure ratio over the window reaches the threshold) and the
+    # fallback when the LLM is unavailable: defer the application, degrade to
+    # local parsing and scoring, or fail (none); and how often /apply checks
+    # whether the client is still connected
+    stage_deadlines_seconds: Dict[str, float] = {"upload": 30.0, "parse": 60.0, "score": 45.0}
+    llm_timeout_seconds: float = 30.0
+    llm_hedging_enabled: bool = True
+    llm_hedge_min_samples: int = 20
+    llm_hedge_min_delay_seconds: float = 1.0
+    llm_breaker_failure_ratio: float = 0.5
+    llm_breaker_min_calls: int = 10
+    llm_breaker_window_seconds: float = 60.0
+    llm_breaker_cooldown_seconds: float = 30.0
+    llm_fallback: str = "defer"  # defer, degraded, none
+    disconnect_poll_seconds: float = 0.5
+    
+    # Tracing (OpenTelemetry): spans for requests, pipeline stages, storage, LLM
+    # and SQL calls, exported as JSON lines to a file or to the console (none = off)
+    tracing_enabled: bool = True
+    tracing_exporter: str = "file"  # file, console, none
+    tracing_file_path: str = "traces/spans.jsonl"
+    tracing_service_name: str = "cps-talent-acquisition"
+    tracing_sample_ratio: float = 1.0
+    
+    # Logging: records are queued on the request path and written by a
+    # background thread as JSON lines (or text) with the request id; messages
+    # longer than the maximum are truncated and, below WARNING, kept at the
+    # sample rate; records arriving while the queue is full are dropped
+    log_format: str = "json"
+    log_queue_size: int = 10000
+    log_max_message_chars: int = 2000
+    log_large_message_sample_rate: float = 1.0
+    
+    # Event-loop stall detection (per worker): the loop's lag is sampled every
+    # interval; a stall longer than the threshold captures the blocking stack and
+    # is aggregated by code location at GET /health/loop
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_seconds: float = 0.05
+    loop_stall_threshold_seconds: float = 0.1
+    
+    # Per-request profiling: requests sending X-Profile: <token>, or sampled at
+    # the given rate, are profiled and written to the output directory as
+    # speedscope or html; with neither set the middleware is not installed
+    profiling_token: Optional[str] = None
+    profiling_sample_rate: float = 0.0
+    profiling_interval_seconds: float = 0.001
+    profiling_output_dir: str = "profiles"
+    profiling_format: str = "speedscope"  # speedscope, html
+    
+    # Storage backend: minio, synthetic
+    storage_mode: str = "minio"
+    
+    # Synthetic stand-ins (load testing)
+    synthetic_seed: Optional[int] = None
+    synthetic_latency_distribution: str = "lognormal"
+    synthetic_llm_latency_ms: float = 1500.0
+    synthetic_llm_latency_stddev_ms: float = 500.0
+    synthetic_llm_error_rate: float = 0.0
+    synthetic_llm_rate_limit_burst_rate: float = 0.0
+    synthetic_llm_rate_limit_burst_length: int = 10
+    synthetic_storage_latency_ms: float = 20.0
+    synthetic_storage_latency_stddev_ms: float = 10.0
+    synthetic_storage_error_rate: float = 0.0
+    
+    # Response compression: complete JSON/text responses of at least this many
+    # bytes are compressed with brotli (when installed) or gzip, per Accept-Encoding
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    
     # CORS
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8000"]
     
@@ -1,7 +1,19 @@
 """Database configuration and session management."""
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
+from app.utils.tracing import instrument_engine
+
+logger = logging.getLogger(__name__)
 
 # Create async engine
 engine = create_async_engine(
@@ -10,6 +22,19 @@ engine = create_async_engine(
     future=True
 )
 
+# Create async engine for the read replica (optional)
+read_engine: Optional[AsyncEngine] = None
+if settings.database_read_url:
+    read_engine = create_async_engine(
+        settings.database_read_url,
+        echo=settings.debug,
+        future=True
+    )
+
+# Span per SQL statement when tracing is enabled
+instrument_engine(engine)
+instrument_engine(read_engine)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -19,12 +44,98 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+# Create async session factory for the read replica
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+) if read_engine is not None else None
+
 # Create declarative base
 Base = declarative_base()
 
+# Replication lag in seconds; 0 when the replica has replayed everything it received
+REPLICA_LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+""")
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+# Raised when a replica connection cannot be opened (asyncpg raises OSError for refused connections)
+REPLICA_CONNECTION_ERRORS = (DBAPIError, OSError, asyncio.TimeoutError)
+
+ALEMBIC_INI_PATH = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+class ReplicaMonitor:
+    """
+    Tracks whether the read replica is reachable and within the allowed lag.
+
+    The check runs at most once per ``check_interval`` seconds; requests in
+    between reuse the cached result, so routing costs no extra round trip.
+    """
+
+    def __init__(self, replica_engine: Optional[AsyncEngine], max_lag_seconds: float, check_interval: float):
+        self.replica_engine = replica_engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.healthy = replica_engine is not None
+        self.last_lag: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def is_healthy(self) -> bool:
+        """Return True when reads may be served by the replica."""
+        if self.replica_engine is None:
+            return False
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self.healthy
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                await self._check()
+        return self.healthy
+
+    async def _check(self):
+        """Measure replication lag and update the health flag."""
+        try:
+            async with self.replica_engine.connect() as conn:
+                lag = float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+            self.last_lag = lag
+            healthy = lag <= self.max_lag_seconds
+            if not healthy:
+                logger.warning(f"Read replica lagging by {lag:.1f}s, routing reads to primary")
+        except Exception as e:
+            logger.warning(f"Read replica unavailable, routing reads to primary: {e}")
+            healthy = False
+        if healthy and not self.healthy:
+            logger.info("Read replica healthy again, routing reads to replica")
+        self.healthy = healthy
+        self._checked_at = time.monotonic()
+
+    def mark_unavailable(self, error: BaseException):
+        """Route reads to the primary until the next check after a failed replica connection."""
+        if self.healthy:
+            logger.warning(f"Read replica connection failed, routing reads to primary: {error}")
+        self.healthy = False
+        self._checked_at = time.monotonic()
+
+
+replica_monitor = ReplicaMonitor(
+    read_engine,
+    settings.database_read_max_lag_seconds,
+    settings.database_read_check_interval_seconds
+)
 
-async def get_db() -> AsyncSession:
-    """Dependency for getting async database session."""
+
+@asynccontextmanager
+async def write_session() -> AsyncIterator[AsyncSession]:
+    """Open a read-write session on the primary, committing on success."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -36,8 +147,81 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
-async def init_db():
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Open a read-only session.
+    
+    Uses the read replica when configured and healthy, otherwise the primary.
+    If the replica cannot be reached when the session starts, this session
+    falls back to the primary and the replica is marked unhealthy until its
+    next check. The transaction is marked READ ONLY and is rolled back
+    instead of committed.
+    """
+    session = None
+    if await replica_monitor.is_healthy():
+        try:
+            session = await _begin_read_only(ReadSessionLocal)
+        except REPLICA_CONNECTION_ERRORS as e:
+            replica_monitor.mark_unavailable(e)
+    if session is None:
+        session = await _begin_read_only(AsyncSessionLocal)
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+async def _begin_read_only(session_factory: async_sessionmaker) -> AsyncSession:
+    """Open a session and start its READ ONLY transaction (which checks out a connection)."""
+    session = session_factory()
+    try:
+        await session.execute(text("SET TRANSACTION READ ONLY"))
+    except BaseException:
+        await session.close()
+        raise
+    return session
 
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency for getting async database session; GET/HEAD requests get a read-only session."""
+    session_context = read_session() if request.method in READ_ONLY_METHODS else write_session()
+    async with session_context as session:
+        yield session
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is not at the application's Alembic head."""
+
+
+def expected_schema_version() -> str:
+    """Return the Alembic head revision shipped with the application."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    
+    config = Config(str(ALEMBIC_INI_PATH))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def check_schema_version() -> str:
+    """
+    Verify that migrations have been applied (run ``alembic upgrade head`` first).
+    
+    Returns:
+        The database's schema revision
+        
+    Raises:
+        SchemaVersionError: If the database is not at the expected revision
+    """
+    expected = expected_schema_version()
+    async with engine.connect() as conn:
+        try:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except ProgrammingError:
+            current = None
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at {current or 'no revision'}, expected {expected}; run 'alembic upgrade head'"
+        )
+    return current
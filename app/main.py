@@ -1,18 +1,25 @@
 """Main FastAPI application."""
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import init_db
-from app.api import jobs, applications, integrations
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO if not settings.debug else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from app.database import SchemaVersionError, check_schema_version, write_session
+from app.services.admission import admission_controller
+from app.services.application_events import application_event_broker
+from app.services.application_pipeline import deferred_application_worker
+from app.services.archival import archival_service
+from app.services.score_calibration import score_calibration_service
+from app.utils.compression import CompressionMiddleware
+from app.utils.loop_monitor import loop_stall_monitor
+from app.utils.profiling import ProfilingMiddleware, profiling_configured
+from app.utils.structured_logging import RequestIdMiddleware, configure_logging
+from app.utils.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from app.api import jobs, applications, candidates, integrations, exports
+
+# Configure logging (queued, written by a background thread that is flushed at exit)
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +29,29 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting CPS Talent Acquisition System...")
+    configure_tracing()
+    if settings.loop_monitor_enabled:
+        loop_stall_monitor.start()
     try:
-        await init_db()
-        logger.info("Database initialized successfully")
+        version = await check_schema_version()
+        async with write_session() as db:
+            await archival_service.ensure_partitions(db)
+        logger.info(f"Database schema at {version}")
+    except SchemaVersionError:
+        raise
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error(f"Error checking database: {e}")
+    deferred_application_worker.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down CPS Talent Acquisition System...")
+    await deferred_application_worker.stop(timeout=settings.server_drain_timeout_seconds)
+    await score_calibration_service.stop()
+    await application_event_broker.stop()
+    await loop_stall_monitor.stop()
+    shutdown_tracing()
 
 
 # Create FastAPI application
@@ -51,10 +71,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression (JSON and text bodies above COMPRESSION_MINIMUM_SIZE)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# Per-request profiling (only installed when a token or sample rate is configured)
+if profiling_configured():
+    app.add_middleware(ProfilingMiddleware)
+
+# Request ids for log records (inside tracing, so every other middleware logs with them)
+app.add_middleware(RequestIdMiddleware)
+
+# Request spans (outermost, so the span covers every other middleware)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(jobs.router)
 app.include_router(applications.router)
+app.include_router(candidates.router)
 app.include_router(integrations.router)
+app.include_router(exports.router)
 
 
 @app.get("/")
@@ -76,6 +113,18 @@ async def health_check():
     }
 
 
+@app.get("/health/admission")
+async def admission_state():
+    """Admission controller state of this worker (queue depth, in-flight LLM calls, stage latencies)."""
+    return admission_controller.snapshot()
+
+
+@app.get("/health/loop")
+async def loop_state(limit: int = Query(10, ge=1, le=100, description="Number of top offenders")):
+    """Event-loop lag of this worker and the code locations that blocked it longest."""
+    return loop_stall_monitor.snapshot(limit)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
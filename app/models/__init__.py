@@ -2,6 +2,10 @@
 from app.models.job import Job
 from app.models.candidate import Candidate
 from app.models.application import Application
+from app.models.job_stats import JobStats
+from app.models.application_event import ApplicationEvent
+from app.models.application_key import ApplicationKey
+from app.models.candidate_lsh_bucket import CandidateLshBucket
 
-__all__ = ["Job", "Candidate", "Application"]
+__all__ = ["Job", "Candidate", "Application", "JobStats", "ApplicationEvent", "ApplicationKey", "CandidateLshBucket"]
 
@@ -1,22 +1,43 @@
 """Application model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, JSON, ForeignKey, Index, PrimaryKeyConstraint, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Application(Base):
-    """Application model representing a candidate's job application."""
+    """
+    Application model representing a candidate's job application.
+    
+    The table is partitioned: LIST (archived) splits closed jobs' applications
+    into ``applications_archive``; hot rows are RANGE-partitioned by month of
+    ``created_at`` (see ArchivalService.ensure_partitions). The primary key
+    must include the partition keys; ``id`` alone identifies a row in the ORM.
+    """
     
     __tablename__ = "applications"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "archived", "created_at"),
+        Index("ix_applications_job_id_status", "job_id", "status"),
+        Index("ix_applications_status_updated_at", "status", "updated_at"),
+        Index("ix_applications_created_at", "created_at"),
+        {"postgresql_partition_by": "LIST (archived)"}
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), default=uuid.uuid4, nullable=False)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), nullable=False)
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False, index=True)
-    status = Column(String(50), nullable=False, default="applied")  # applied, parsed, scored, shortlisted, synced
-    scores = Column(JSON, nullable=True, default=dict)  # skill_fit, experience_fit, education_fit, keyword_match, overall_score
+    status = Column(String(50), nullable=False, default="applied")  # applied, parsed, scored, shortlisted, rejected, synced, failed
+    scores = Column(JSON(none_as_null=True), nullable=True)  # NULL until scored; skill_fit, experience_fit, education_fit, keyword_match, overall_score
+    calibrated_score = Column(Float, nullable=True)  # weighted composite of per-criterion z-scores within the job
+    score_percentile = Column(Float, nullable=True)  # 0-100 percentile of calibrated_score within the job
+    job_rank = Column(Integer, nullable=True)  # 1 = best calibrated_score in the job
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # failed deferred analyses
+    leased_until = Column(DateTime, nullable=True)  # set while a deferred worker processes the application
+    archived = Column(Boolean, nullable=False, default=False, server_default=false())  # moved to the archive partition
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -0,0 +1,25 @@
+"""Application status event model."""
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class ApplicationEvent(Base):
+    """Append-only log of application status transitions (ids are SSE event ids)."""
+    
+    __tablename__ = "application_events"
+    __table_args__ = (
+        Index("ix_application_events_job_id_id", "job_id", "id"),
+    )
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # No foreign key: applications is partitioned and its id alone is not unique-constrained
+    application_id = Column(UUID(as_uuid=True), nullable=False)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    old_status = Column(String(50), nullable=True)  # None for a new application
+    new_status = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<ApplicationEvent(id={self.id}, application_id={self.application_id}, new_status={self.new_status})>"
@@ -0,0 +1,23 @@
+"""Application key model."""
+from sqlalchemy import Column, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class ApplicationKey(Base):
+    """
+    One row per (job, candidate) pair that has an application.
+    
+    Enforces that a candidate applies to a job at most once: a unique index on
+    the partitioned applications table would have to include its partition
+    keys (archived, created_at) and so could not express this constraint.
+    """
+    
+    __tablename__ = "application_keys"
+    
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    application_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<ApplicationKey(job_id={self.job_id}, candidate_id={self.candidate_id})>"
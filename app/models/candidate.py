@@ -1,8 +1,8 @@
 """Candidate model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, Integer, JSON
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -17,10 +17,14 @@ class Candidate(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     phone = Column(String(50), nullable=True)
     linkedin = Column(String(255), nullable=True)
-    resume_url = Column(String(500), nullable=False)
+    resume_url = Column(String(500), nullable=False, index=True)
     skills = Column(JSON, nullable=False, default=list)
     experience_years = Column(Float, nullable=True)
     education = Column(String(500), nullable=True)
+    # MinHash signature of the CV text, for duplicate detection
+    minhash = Column(ARRAY(Integer), nullable=True)
+    # PARSER_VERSION that produced skills/experience_years/education (None: rule-based or never parsed)
+    parser_version = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -0,0 +1,25 @@
+"""Candidate LSH bucket model."""
+from sqlalchemy import BigInteger, Column, ForeignKey, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class CandidateLshBucket(Base):
+    """
+    Locality-sensitive hashing index of candidates for duplicate detection.
+    
+    Bands 0..n hold the hash of one band of the candidate's MinHash signature;
+    negative bands hold exact identity keys (normalized phone, LinkedIn handle).
+    Candidates sharing a (band, bucket) pair are duplicate candidates to verify.
+    """
+    
+    __tablename__ = "candidate_lsh_buckets"
+    
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    candidate_id = Column(
+        UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    
+    def __repr__(self):
+        return f"<CandidateLshBucket(band={self.band}, bucket={self.bucket}, candidate_id={self.candidate_id})>"
@@ -1,7 +1,7 @@
 """Job model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, JSON
+from sqlalchemy import Column, String, Text, DateTime, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -11,6 +11,10 @@ class Job(Base):
     """Job model representing a job opening."""
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+        Index("ix_jobs_created_at", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
@@ -18,11 +22,15 @@ class Job(Base):
     status = Column(String(50), nullable=False, default="active")  # active, closed
     jd_text = Column(Text, nullable=False)
     required_skills = Column(JSON, nullable=False, default=list)
+    requirements = Column(JSON, nullable=True)  # compiled from title, jd_text and required_skills on create/update
+    score_calibration = Column(JSON, nullable=True)  # means, stds, weights and count of the last full calibration
+    archived_at = Column(DateTime, nullable=True)  # when the closed job's applications moved to the archive partition
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
     applications = relationship("Application", back_populates="job", cascade="all, delete-orphan")
+    stats = relationship("JobStats", back_populates="job", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Job(id={self.id}, title={self.title}, status={self.status})>"
@@ -0,0 +1,43 @@
+"""Job statistics model."""
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+SCORE_BUCKET_COUNT = 10
+SCORE_BUCKET_WIDTH = 100 / SCORE_BUCKET_COUNT
+
+
+class JobStats(Base):
+    """Incrementally maintained pipeline statistics for a job."""
+    
+    __tablename__ = "job_stats"
+    
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    status_counts = Column(JSONB, nullable=False, default=dict)  # {"scored": 12, "shortlisted": 3, ...}
+    score_histogram = Column(ARRAY(Integer), nullable=False, default=lambda: [0] * SCORE_BUCKET_COUNT)  # overall_score in 10-point buckets
+    score_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sum_sq = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    job = relationship("Job", back_populates="stats")
+    
+    @property
+    def mean_score(self):
+        """Mean overall score of scored applications."""
+        return self.score_sum / self.score_count if self.score_count else None
+    
+    @property
+    def score_variance(self):
+        """Population variance of overall scores."""
+        if not self.score_count:
+            return None
+        mean = self.score_sum / self.score_count
+        return max(self.score_sum_sq / self.score_count - mean * mean, 0.0)
+    
+    def __repr__(self):
+        return f"<JobStats(job_id={self.job_id}, total_count={self.total_count})>"
@@ -1,11 +1,18 @@
 """Pydantic schemas for request/response validation."""
-from app.schemas.job import JobCreate, JobResponse, JobDetailResponse, CandidateSummary
-from app.schemas.candidate import CandidateCreate, CandidateResponse
-from app.schemas.application import ApplicationCreate, ApplicationResponse, ApplyRequest
+from app.schemas.job import JobCreate, JobUpdate, JobResponse, JobDetailResponse, CandidateSummary, JobStatsResponse
+from app.schemas.candidate import (
+    CandidateCreate, CandidateResponse, CandidateDuplicate, CandidateMergeRequest, CandidateMergeResponse
+)
+from app.schemas.application import (
+    ApplicationCreate, ApplicationResponse, ApplyRequest, FinalizeUploadRequest, UploadRequest, UploadResponse,
+    StatusTransitionRequest, StatusTransitionResponse
+)
 
 __all__ = [
-    "JobCreate", "JobResponse", "JobDetailResponse", "CandidateSummary",
-    "CandidateCreate", "CandidateResponse",
-    "ApplicationCreate", "ApplicationResponse", "ApplyRequest"
+    "JobCreate", "JobUpdate", "JobResponse", "JobDetailResponse", "CandidateSummary", "JobStatsResponse",
+    "CandidateCreate", "CandidateResponse", "CandidateDuplicate", "CandidateMergeRequest", "CandidateMergeResponse",
+    "ApplicationCreate", "ApplicationResponse", "ApplyRequest",
+    "FinalizeUploadRequest", "UploadRequest", "UploadResponse",
+    "StatusTransitionRequest", "StatusTransitionResponse"
 ]
 
@@ -1,8 +1,8 @@
 """Application schemas."""
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
 
 
 class ApplicationBase(BaseModel):
@@ -21,6 +21,9 @@ class ApplicationResponse(ApplicationBase):
     id: UUID
     status: str
     scores: Optional[Dict[str, Any]] = None
+    calibrated_score: Optional[float] = None
+    score_percentile: Optional[float] = None
+    job_rank: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     
@@ -37,11 +40,65 @@ class ApplyRequest(BaseModel):
     linkedin: Optional[str] = None
 
 
+class UploadRequest(BaseModel):
+    """Schema for requesting a presigned CV upload URL."""
+    job_id: UUID
+    filename: str = Field(..., min_length=1, max_length=255)
+
+
+class UploadResponse(BaseModel):
+    """Schema for a presigned CV upload."""
+    object_name: str
+    upload_url: str
+    method: str = "PUT"
+    expires_at: datetime
+    upload_token: str
+
+
+class FinalizeUploadRequest(ApplyRequest):
+    """Schema for finalizing an application whose CV was uploaded directly to storage."""
+    object_name: str = Field(..., min_length=1, max_length=255)
+    upload_token: str = Field(..., min_length=1, max_length=128, description="Token returned by POST /apply/uploads")
+
+
 class ShortlistRequest(BaseModel):
     """Schema for shortlist request."""
     application_id: UUID
 
 
+class StatusTransitionRequest(BaseModel):
+    """Schema for moving many applications to a status, by id or as a job's top K."""
+    status: str = Field(..., pattern="^(shortlisted|rejected|scored)$")
+    application_ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=10000)
+    job_id: Optional[UUID] = None
+    top_k: Optional[int] = Field(None, ge=1, description="Only the K best overall scores of the job")
+    min_score: Optional[float] = Field(None, ge=0, le=100, description="Minimum overall score")
+    
+    @model_validator(mode="after")
+    def check_selection(self) -> "StatusTransitionRequest":
+        if (self.application_ids is None) == (self.job_id is None):
+            raise ValueError("Provide either application_ids or job_id")
+        if self.application_ids is not None and (self.top_k is not None or self.min_score is not None):
+            raise ValueError("top_k and min_score require job_id")
+        return self
+
+
+class TransitionedApplication(ApplicationResponse):
+    """Application moved by a bulk transition, with the status it had before."""
+    old_status: str
+
+
+class StatusTransitionResponse(BaseModel):
+    """Schema for the outcome of a bulk transition."""
+    status: str
+    updated: int
+    applications: List[TransitionedApplication]
+    skipped_ids: List[UUID] = Field(
+        default_factory=list,
+        description="Requested applications not moved (not found, archived or transition not allowed)"
+    )
+
+
 class SyncSuccessFactorsRequest(BaseModel):
     """Schema for SuccessFactors sync request."""
     application_ids: list[UUID] = Field(..., min_length=1)
@@ -34,3 +34,25 @@ class CandidateResponse(CandidateBase):
     class Config:
         from_attributes = True
 
+
+
+class CandidateDuplicate(BaseModel):
+    """Probable duplicate of a candidate."""
+    id: UUID
+    name: str
+    email: str
+    similarity: Optional[float] = Field(None, description="Estimated CV text similarity (0-1)")
+    matched_on: List[str] = Field(..., description="cv_text, phone and/or linkedin")
+
+
+class CandidateMergeRequest(BaseModel):
+    """Schema for merging duplicates into a candidate."""
+    duplicate_ids: List[UUID] = Field(..., min_length=1)
+
+
+class CandidateMergeResponse(BaseModel):
+    """Schema for the outcome of a merge."""
+    id: UUID
+    merged_ids: List[UUID]
+    moved_application_ids: List[UUID]
+    removed_application_ids: List[UUID]
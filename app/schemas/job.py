@@ -1,6 +1,6 @@
 """Job schemas."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -18,10 +18,20 @@ class JobCreate(JobBase):
     status: str = Field(default="active", pattern="^(active|closed)$")
 
 
+class JobUpdate(BaseModel):
+    """Schema for updating a job; omitted fields are left unchanged."""
+    title: Optional[str] = Field(None, min_length=1, max_length=255)
+    location: Optional[str] = Field(None, min_length=1, max_length=255)
+    jd_text: Optional[str] = Field(None, min_length=1)
+    required_skills: Optional[List[str]] = None
+    status: Optional[str] = Field(None, pattern="^(active|closed)$")
+
+
 class JobResponse(JobBase):
     """Schema for job response."""
     id: UUID
     status: str
+    requirements: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
     
@@ -36,8 +46,10 @@ class CandidateSummary(BaseModel):
     email: str
     skills: List[str]
     experience_years: Optional[float]
+    resume_url: Optional[str] = None
     application_status: str
     overall_score: Optional[float]
+    skill_match: Optional[float] = None
     
     class Config:
         from_attributes = True
@@ -47,3 +59,19 @@ class JobDetailResponse(JobResponse):
     """Schema for detailed job response with candidates."""
     candidates: List[CandidateSummary] = Field(default_factory=list)
 
+
+
+class JobStatsResponse(BaseModel):
+    """Schema for per-job pipeline statistics."""
+    job_id: UUID
+    total_count: int = 0
+    status_counts: Dict[str, int] = Field(default_factory=dict)
+    score_histogram: List[int] = Field(default_factory=list)
+    score_bucket_width: float
+    score_count: int = 0
+    mean_score: Optional[float] = None
+    score_variance: Optional[float] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
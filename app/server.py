@@ -0,0 +1,124 @@
+"""
+Production server entry point.
+
+    python -m app.server
+
+Runs the API under gunicorn with one uvicorn worker (uvloop + httptools) per
+available CPU. The application is imported once in the master before forking
+so workers share its memory copy-on-write. On SIGTERM each worker stops
+accepting connections, lets in-flight requests (including /apply and their
+AI calls) finish within SERVER_DRAIN_TIMEOUT_SECONDS, then exits.
+"""
+import math
+import os
+from typing import Any, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from app.config import settings
+from app.utils.lifecycle import drain_state
+
+# cgroup v2 CPU limit: "<quota> <period>" in microseconds, or "max <period>" when unlimited
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus() -> int:
+    """Return the CPUs this process may use, honouring affinity and the cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+class DrainingServer(Server):
+    """Uvicorn server that announces the drain before closing its listeners."""
+
+    async def shutdown(self, sockets=None) -> None:
+        drain_state.begin()
+        await super().shutdown(sockets=sockets)
+
+
+class ProductionWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop/httptools with a bounded graceful drain."""
+
+    CONFIG_KWARGS: Dict[str, Any] = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_graceful_shutdown": settings.server_drain_timeout_seconds
+    }
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            raise SystemExit(self.arbiter.WORKER_BOOT_ERROR)
+
+
+def post_fork(server, worker):
+    """Drop connection pools inherited from the master so workers never share sockets."""
+    from app.database import engine, read_engine
+    from app.services.storage import storage_service
+    from app.utils.structured_logging import SERVER_LOGGERS, adopt_loggers
+    
+    engine.sync_engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.sync_engine.dispose(close=False)
+    storage_service.reset_connections()
+    # The worker class points uvicorn's loggers at gunicorn's handlers; queue them instead
+    adopt_loggers(SERVER_LOGGERS)
+
+
+class ServerApplication(BaseApplication):
+    """Gunicorn application serving app.main:app."""
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+def server_options() -> Dict[str, Any]:
+    """Gunicorn settings derived from the application settings."""
+    return {
+        "bind": f"{settings.app_host}:{settings.app_port}",
+        "workers": settings.server_workers or available_cpus(),
+        "worker_class": "app.server.ProductionWorker",
+        "preload_app": True,
+        # Gunicorn kills workers after graceful_timeout; leave room for lifespan shutdown
+        "graceful_timeout": settings.server_drain_timeout_seconds + 10,
+        "timeout": settings.server_worker_timeout_seconds,
+        "keepalive": settings.server_keepalive_seconds,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests // 10,
+        "post_fork": post_fork,
+        "accesslog": "-",
+        "errorlog": "-"
+    }
+
+
+def main():
+    ServerApplication(server_options()).run()
+
+
+if __name__ == "__main__":
+    main()
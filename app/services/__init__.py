@@ -3,6 +3,7 @@ from app.services.storage import StorageService
 from app.services.ai_parser import AIParserService
 from app.services.ai_scorer import AIScorerService
 from app.services.successfactors import SuccessFactorsService
+from app.services.job_stats import JobStatsService
 
-__all__ = ["StorageService", "AIParserService", "AIScorerService", "SuccessFactorsService"]
+__all__ = ["StorageService", "AIParserService", "AIScorerService", "SuccessFactorsService", "JobStatsService"]
 
@@ -0,0 +1,283 @@
+"""Admission control and backpressure for CV processing."""
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+from app.config import settings
+from app.utils.circuit_breaker import llm_circuit_breaker
+from app.utils.lifecycle import drain_state
+
+logger = logging.getLogger(__name__)
+
+# Stage names recorded by the apply pipeline; "llm" aggregates every LLM call
+STAGE_APPLY = "apply"
+STAGE_LLM = "llm"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the suggested Retry-After in seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Request rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class StageDeadlineExceeded(Exception):
+    """Raised when a pipeline stage runs past its configured deadline."""
+
+    def __init__(self, stage: str, deadline: float):
+        super().__init__(f"Stage {stage} exceeded its {deadline:g}s deadline")
+        self.stage = stage
+        self.deadline = deadline
+
+
+class StageLatency:
+    """Latency samples of one pipeline stage within a sliding time window."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def record(self, duration: float):
+        self._samples.append((time.monotonic(), duration))
+        self._prune()
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean and p95 (seconds) of the samples in the window."""
+        self._prune()
+        durations = sorted(duration for _, duration in self._samples)
+        if not durations:
+            return {"count": 0, "mean": None, "p95": None}
+        return {
+            "count": len(durations),
+            "mean": sum(durations) / len(durations),
+            "p95": durations[max(math.ceil(len(durations) * 0.95) - 1, 0)]
+        }
+
+
+class AdmissionTicket:
+    """Outcome of admitting a request: processed inline or deferred to the background worker."""
+
+    def __init__(self, deferred: bool, reason: Optional[str] = None):
+        self.deferred = deferred
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Per-worker admission control for CV processing.
+    
+    Tracks admitted requests (queue depth), in-flight LLM calls and recent
+    stage latencies. When a budget is exceeded new requests are either shed
+    with a computed Retry-After or admitted as deferred, depending on the
+    configured overload action. Per-client and per-job concurrency limits
+    always shed, so one caller cannot starve the others.
+    """
+
+    def __init__(self):
+        self.queue_depth = 0
+        self.in_flight_llm = 0
+        self.rate_limited_until = 0.0
+        self._per_client: Counter = Counter()
+        self._per_job: Counter = Counter()
+        self._stages: Dict[str, StageLatency] = {}
+        self._decisions: Counter = Counter()
+        self._hedges: Counter = Counter()
+
+    def stage_latency(self, stage: str) -> StageLatency:
+        if stage not in self._stages:
+            self._stages[stage] = StageLatency(settings.admission_latency_window_seconds)
+        return self._stages[stage]
+
+    @asynccontextmanager
+    async def stage(self, stage: str) -> AsyncIterator[None]:
+        """
+        Record the duration of a pipeline stage and enforce its deadline.
+        
+        Raises:
+            StageDeadlineExceeded: If the stage outlasts ``STAGE_DEADLINES_SECONDS[stage]``
+                (only awaiting code can be interrupted)
+        """
+        deadline = settings.stage_deadlines_seconds.get(stage) or None
+        started = time.perf_counter()
+        timeout = asyncio.timeout(deadline)
+        try:
+            async with timeout:
+                yield
+        except TimeoutError:
+            if timeout.expired():
+                raise StageDeadlineExceeded(stage, deadline) from None
+            raise
+        finally:
+            self.stage_latency(stage).record(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def llm_call(self, operation: str) -> AsyncIterator[None]:
+        """Count an in-flight LLM call and record its latency."""
+        self.in_flight_llm += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.in_flight_llm -= 1
+            duration = time.perf_counter() - started
+            self.stage_latency(STAGE_LLM).record(duration)
+            self.stage_latency(f"{STAGE_LLM}.{operation}").record(duration)
+
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """
+        Seconds after which a slow LLM call of this operation gets a hedged second attempt.
+        
+        Returns:
+            The operation's p95 latency (at least LLM_HEDGE_MIN_DELAY_SECONDS), or
+            None when hedging is off, samples are too few, or the worker is overloaded
+        """
+        if not settings.llm_hedging_enabled or self.overload_reason() is not None:
+            return None
+        summary = self.stage_latency(f"{STAGE_LLM}.{operation}").summary()
+        if summary["count"] < settings.llm_hedge_min_samples:
+            return None
+        return max(summary["p95"], settings.llm_hedge_min_delay_seconds)
+
+    def hedged(self, outcome: str):
+        """Count a hedged attempt ("sent") and which attempt won ("won_by_hedge", "won_by_first")."""
+        self._hedges[outcome] += 1
+
+    def rate_limited(self, retry_after: Optional[float]):
+        """Record a provider 429; new work is treated as overloaded until it expires."""
+        cooldown = retry_after if retry_after else 1.0
+        self.rate_limited_until = max(self.rate_limited_until, time.monotonic() + cooldown)
+
+    def overload_reason(self) -> Optional[str]:
+        """Return why the worker is over budget, or None when it has capacity."""
+        if drain_state.draining:
+            return "draining"
+        if time.monotonic() < self.rate_limited_until:
+            return "llm_rate_limited"
+        if not llm_circuit_breaker.available():
+            return "llm_circuit_open"
+        if settings.admission_max_in_flight_llm and self.in_flight_llm >= settings.admission_max_in_flight_llm:
+            return "llm_saturated"
+        if settings.admission_max_queue_depth and self.queue_depth >= settings.admission_max_queue_depth:
+            return "queue_full"
+        if settings.admission_llm_p95_budget_ms:
+            p95 = self.stage_latency(STAGE_LLM).summary()["p95"]
+            if p95 is not None and p95 * 1000 > settings.admission_llm_p95_budget_ms:
+                return "llm_slow"
+        return None
+
+    def retry_after(self) -> int:
+        """
+        Estimate seconds until a slot frees up.
+        
+        With ``max_queue_depth`` requests in progress and a mean request time of
+        T, one slot frees about every T / max_queue_depth seconds (Little's law),
+        so the wait grows with the number of requests ahead of the caller.
+        """
+        mean = self.stage_latency(STAGE_APPLY).summary()["mean"] or 1.0
+        capacity = max(settings.admission_max_queue_depth, 1)
+        excess = max(self.queue_depth - capacity + 1, 1)
+        estimate = max(
+            excess * mean / capacity,
+            self.rate_limited_until - time.monotonic(),
+            llm_circuit_breaker.retry_after()
+        )
+        return int(min(max(math.ceil(estimate), 1), settings.admission_max_retry_after_seconds))
+
+    @staticmethod
+    def _limit(key: Optional[str], overrides: Dict[str, int], default: int) -> int:
+        return overrides.get(key, default) if key else 0
+
+    @asynccontextmanager
+    async def admit(self, client_id: Optional[str] = None, job_id: Optional[str] = None) -> AsyncIterator[AdmissionTicket]:
+        """
+        Admit a request for the duration of the context.
+        
+        Args:
+            client_id: Caller identity for the per-client limit
+            job_id: Job for the per-job limit
+            
+        Yields:
+            Ticket telling whether to process inline or defer
+            
+        Raises:
+            AdmissionRejected: When the request must be shed
+        """
+        ticket = self._decide(client_id, job_id)
+        self.queue_depth += 1
+        self._per_client[client_id] += 1
+        self._per_job[job_id] += 1
+        started = time.perf_counter()
+        try:
+            yield ticket
+        finally:
+            self.queue_depth -= 1
+            self._release(self._per_client, client_id)
+            self._release(self._per_job, job_id)
+            if not ticket.deferred:
+                self.stage_latency(STAGE_APPLY).record(time.perf_counter() - started)
+
+    def _decide(self, client_id: Optional[str], job_id: Optional[str]) -> AdmissionTicket:
+        if not settings.admission_enabled:
+            return AdmissionTicket(deferred=False)
+
+        client_limit = self._limit(client_id, settings.admission_client_limits, settings.admission_max_per_client)
+        if client_limit and self._per_client[client_id] >= client_limit:
+            raise self._rejection("client_limit")
+        job_limit = self._limit(job_id, settings.admission_job_limits, settings.admission_max_per_job)
+        if job_limit and self._per_job[job_id] >= job_limit:
+            raise self._rejection("job_limit")
+
+        reason = self.overload_reason()
+        if reason is None:
+            self._decisions["admitted"] += 1
+            return AdmissionTicket(deferred=False)
+        if settings.admission_overload_action == "defer":
+            self._decisions["deferred"] += 1
+            return AdmissionTicket(deferred=True, reason=reason)
+        raise self._rejection(reason)
+
+    def _rejection(self, reason: str) -> AdmissionRejected:
+        self._decisions[f"shed.{reason}"] += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Shedding request ({reason}), retry after {retry_after}s")
+        return AdmissionRejected(reason, retry_after)
+
+    @staticmethod
+    def _release(counter: Counter, key: Optional[str]):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for monitoring."""
+        return {
+            "enabled": settings.admission_enabled,
+            "overload_action": settings.admission_overload_action,
+            "overloaded": self.overload_reason(),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": settings.admission_max_queue_depth,
+            "in_flight_llm": self.in_flight_llm,
+            "max_in_flight_llm": settings.admission_max_in_flight_llm,
+            "rate_limited_for_seconds": round(max(self.rate_limited_until - time.monotonic(), 0.0), 1),
+            "retry_after": self.retry_after(),
+            "clients": {key: value for key, value in self._per_client.items() if key},
+            "jobs": {key: value for key, value in self._per_job.items() if key},
+            "decisions": dict(self._decisions),
+            "hedges": dict(self._hedges),
+            "llm_circuit": llm_circuit_breaker.snapshot(),
+            "stages": {name: latency.summary() for name, latency in sorted(self._stages.items())}
+        }
+
+
+# Singleton instance
+admission_controller = AdmissionController()
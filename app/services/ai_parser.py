@@ -1,32 +1,53 @@
 """AI-powered CV parsing service."""
-import io
 import json
 import logging
-from typing import Dict, Any
-import PyPDF2
-from docx import Document
-from openai import OpenAI
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from opentelemetry import trace
 from app.config import settings
+from app.services.cv_extractor import CVFieldExtractor, cv_field_extractor
+from app.services.document_extraction import (
+    DOCX_MIME_TYPE, PDF_MIME_TYPE, detect_mime_type, extractor_registry
+)
+from app.services.llm_provider import LLMProvider, get_llm_provider
+from app.utils.structured_logging import truncate_payload
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+CV_FIELDS = {
+    "name": "name (string): Full name of the candidate",
+    "email": "email (string): Email address",
+    "phone": "phone (string): Phone number",
+    "linkedin": "linkedin (string): LinkedIn profile URL (if available)",
+    "skills": "skills (array of strings): List of technical and professional skills",
+    "experience_years": "experience_years (number): Total years of work experience",
+    "education": "education (string): Highest education degree and institution",
+}
+
+PARSE_MODEL = "gpt-4.1-mini"
+
+# Fields always requested from the LLM: the skills dictionary finds only the
+# skills it lists, so its hits are never a complete answer
+LLM_ONLY_FIELDS = ("skills",)
+
+# Bump when the parse prompt or its handling changes; candidates parsed under an
+# older PARSER_VERSION are refreshed by scripts/reparse_candidates.py
+PARSE_PROMPT_REVISION = 2
+PARSER_VERSION = f"{PARSE_PROMPT_REVISION}:{PARSE_MODEL}"
+
 
 class AIParserService:
     """Service for parsing CVs using AI."""
     
-    def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, provider: Optional[LLMProvider] = None, extractor: Optional[CVFieldExtractor] = None):
+        """Initialize LLM provider and rule-based extractor."""
+        self.provider = provider or get_llm_provider()
+        self.extractor = extractor or cv_field_extractor
     
     def extract_text_from_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF file."""
         try:
-            pdf_file = io.BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return extractor_registry.extract_text(file_content, PDF_MIME_TYPE, settings.extraction_max_chars)
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             raise
@@ -34,26 +55,28 @@ class AIParserService:
     def extract_text_from_docx(self, file_content: bytes) -> str:
         """Extract text from DOCX file."""
         try:
-            docx_file = io.BytesIO(file_content)
-            doc = Document(docx_file)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text.strip()
+            return extractor_registry.extract_text(file_content, DOCX_MIME_TYPE, settings.extraction_max_chars)
         except Exception as e:
             logger.error(f"Error extracting text from DOCX: {e}")
             raise
     
-    def extract_text(self, file_content: bytes, filename: str) -> str:
-        """Extract text from file based on extension."""
-        if filename.lower().endswith('.pdf'):
-            return self.extract_text_from_pdf(file_content)
-        elif filename.lower().endswith('.docx'):
-            return self.extract_text_from_docx(file_content)
-        else:
-            raise ValueError(f"Unsupported file format: {filename}")
+    def extract_text(self, file_content: bytes, filename: str, content_type: Optional[str] = None) -> str:
+        """Extract text from file based on MIME type (declared or inferred from the extension)."""
+        mime_type = detect_mime_type(filename, content_type)
+        try:
+            return extractor_registry.extract_text(file_content, mime_type, settings.extraction_max_chars)
+        except Exception as e:
+            logger.error(f"Error extracting text from {filename}: {e}")
+            raise
     
+    @traced("parse_cv")
     async def parse_cv(self, cv_text: str) -> Dict[str, Any]:
         """
-        Parse CV text using OpenAI to extract structured information.
+        Parse CV text to extract structured information.
+        
+        Fields the rule-based extractor finds with enough confidence are used
+        as-is; only the remaining fields are requested from the LLM, and the
+        LLM call is skipped when nothing remains.
         
         Args:
             cv_text: Raw text extracted from CV
@@ -61,55 +84,128 @@ class AIParserService:
         Returns:
             Dictionary containing parsed information
         """
+        local_fields, missing_fields, request = self.build_parse_request(cv_text)
+        trace.get_current_span().set_attributes({
+            "cv.chars": len(cv_text), "parse.local_fields": len(local_fields), "parse.llm_fields": len(missing_fields)
+        })
+        if request is None:
+            logger.info(f"Parsed CV locally for: {local_fields.get('name', 'Unknown')}")
+            return local_fields
+        
         try:
-            prompt = f"""
+            response_text = await self.provider.complete(operation="parse_cv", **request)
+            parsed_data = self.read_parse_response(response_text, local_fields, missing_fields)
+            
+            logger.info(
+                f"Successfully parsed CV for: {parsed_data.get('name', 'Unknown')} "
+                f"({len(local_fields)} fields local, {len(missing_fields)} from AI)"
+            )
+            return parsed_data
+            
+        except Exception as e:
+            logger.error(f"Error parsing CV with AI: {e}")
+            raise
+    
+    def build_parse_request(
+        self,
+        cv_text: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]:
+        """
+        Split a CV's fields into locally extracted ones and an LLM request for the rest.
+        
+        Args:
+            cv_text: Raw text extracted from CV
+            fields: Fields wanted (default: all of CV_FIELDS)
+            
+        Returns:
+            Confident local fields, fields left for the LLM, and the completion
+            request (model, messages, temperature, max_tokens) or None when nothing is left
+        """
+        fields = list(fields or CV_FIELDS)
+        local_fields = {
+            name: value for name, value in self._extract_confident_fields(cv_text).items() if name in fields
+        }
+        missing_fields = [name for name in fields if name not in local_fields]
+        if not missing_fields:
+            return local_fields, missing_fields, None
+        
+        field_lines = "\n".join(f"- {CV_FIELDS[name]}" for name in missing_fields)
+        prompt = f"""
 Extract the following information from this CV/resume text and return it as a JSON object:
-- name (string): Full name of the candidate
-- email (string): Email address
-- phone (string): Phone number
-- linkedin (string): LinkedIn profile URL (if available)
-- skills (array of strings): List of technical and professional skills
-- experience_years (number): Total years of work experience
-- education (string): Highest education degree and institution
+{field_lines}
 
 CV Text:
 {cv_text}
 
 Return ONLY a valid JSON object with the above fields. If a field is not found, use null for strings/numbers or empty array for skills.
 """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert CV parser. Extract structured information from resumes accurately."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if result_text.startswith("```json"):
-                result_text = result_text[7:]
-            if result_text.startswith("```"):
-                result_text = result_text[3:]
-            if result_text.endswith("```"):
-                result_text = result_text[:-3]
-            
-            parsed_data = json.loads(result_text.strip())
-            
-            logger.info(f"Successfully parsed CV for: {parsed_data.get('name', 'Unknown')}")
-            return parsed_data
-            
+        request = {
+            "model": PARSE_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are an expert CV parser. Extract structured information from resumes accurately."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1000
+        }
+        return local_fields, missing_fields, request
+    
+    def read_parse_response(
+        self,
+        response_text: str,
+        local_fields: Dict[str, Any],
+        missing_fields: Sequence[str]
+    ) -> Dict[str, Any]:
+        """
+        Combine an LLM parse response with the locally extracted fields.
+        
+        Raises:
+            ValueError: If the response is not a JSON object
+        """
+        result_text = response_text.strip()
+        
+        # Remove markdown code blocks if present
+        if result_text.startswith("```json"):
+            result_text = result_text[7:]
+        if result_text.startswith("```"):
+            result_text = result_text[3:]
+        if result_text.endswith("```"):
+            result_text = result_text[:-3]
+        
+        try:
+            llm_data = json.loads(result_text.strip())
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing JSON from OpenAI response: {e}")
-            logger.error(f"Response text: {result_text}")
+            logger.error(f"Response text: {truncate_payload(result_text)}")
             raise ValueError("Failed to parse CV: Invalid JSON response from AI")
-        except Exception as e:
-            logger.error(f"Error parsing CV with AI: {e}")
-            raise
+        
+        parsed_data = {name: llm_data.get(name) for name in missing_fields}
+        if "skills" in parsed_data and parsed_data["skills"] is None:
+            parsed_data["skills"] = []
+        parsed_data.update(local_fields)
+        return parsed_data
+
+    def parse_locally(self, cv_text: str) -> Dict[str, Any]:
+        """Parse a CV with the rule-based extractor only, whatever the confidence (degraded mode)."""
+        result = self.extractor.extract(cv_text)
+        parsed_data = {name: result.fields.get(name) for name in CV_FIELDS}
+        parsed_data["skills"] = parsed_data["skills"] or []
+        logger.info(f"Parsed CV locally (degraded) for: {parsed_data.get('name') or 'Unknown'}")
+        return parsed_data
+
+    def _extract_confident_fields(self, cv_text: str) -> Dict[str, Any]:
+        """Run the rule-based extractor and keep fields above their confidence threshold."""
+        if not settings.cv_fast_path_enabled:
+            return {}
+        result = self.extractor.extract(cv_text)
+        return {
+            name: value for name, value in result.fields.items()
+            if name not in LLM_ONLY_FIELDS
+            and result.confidence[name] >= settings.cv_fast_path_field_confidence.get(
+                name, settings.cv_fast_path_confidence
+            )
+        }
 
 
 # Singleton instance
@@ -1,86 +1,106 @@
 """AI-powered candidate scoring service."""
 import json
 import logging
-from typing import Dict, Any, List
-from openai import OpenAI
-from app.config import settings
+from typing import Dict, Any, Optional
+from opentelemetry import trace
+from app.services.job_requirements import EDUCATION_LEVELS, education_rank, normalize_skill, skill_coverage
+from app.services.llm_provider import LLMProvider, get_llm_provider
+from app.services.score_calibration import CRITERIA, weighted_overall
+from app.utils.structured_logging import truncate_payload
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+# Criterion score given when a degraded score has nothing to compare
+NEUTRAL_SCORE = 50.0
+
+# Identical for every scoring call, so together with the job block that
+# follows it forms a prefix the provider can cache across a job's candidates
+SCORING_INSTRUCTIONS = """You are an expert recruiter who scores candidates objectively based on job requirements.
+
+You receive compiled job requirements followed by a candidate profile. Provide scores (0-100) for the following criteria:
+1. skill_fit: How well the candidate's skills match the required skills
+2. experience_fit: How well the candidate's experience level matches the job requirements
+3. education_fit: How well the candidate's education matches the job requirements
+4. keyword_match: How well the candidate's profile matches keywords in the job description
+
+Return ONLY a valid JSON object with these four scores.
+
+Example format:
+{
+  "skill_fit": 85.0,
+  "experience_fit": 75.0,
+  "education_fit": 90.0,
+  "keyword_match": 80.0
+}"""
+
+
+def format_requirements(requirements: Dict[str, Any]) -> str:
+    """Compact job block of a scoring prompt, built from compiled job requirements."""
+    experience = requirements.get("experience_years") or {}
+    if experience.get("min") is not None and experience.get("max") is not None:
+        years = f"{experience['min']:g}-{experience['max']:g} years"
+    elif experience.get("min") is not None:
+        years = f"{experience['min']:g}+ years"
+    else:
+        years = "not stated"
+    return f"""Job Requirements:
+- Title: {requirements.get('title') or 'N/A'}
+- Seniority: {requirements.get('seniority') or 'not stated'}
+- Experience: {years}
+- Education: {EDUCATION_LEVELS.get(requirements.get('education_rank'), 'not stated')}
+- Required Skills: {', '.join(requirements.get('skills') or []) or 'none listed'}
+- Other Keywords: {', '.join(requirements.get('keywords') or []) or 'none'}
+- Summary:
+{requirements.get('summary') or 'N/A'}"""
+
 
 class AIScorerService:
     """Service for scoring candidates against job descriptions."""
     
-    def __init__(self):
-        """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, provider: Optional[LLMProvider] = None):
+        """Initialize LLM provider."""
+        self.provider = provider or get_llm_provider()
     
+    @traced("score_candidate")
     async def score_candidate(
         self,
         candidate_profile: Dict[str, Any],
-        job_description: str,
-        required_skills: List[str]
+        requirements: Dict[str, Any]
     ) -> Dict[str, float]:
         """
-        Score a candidate against a job description.
+        Score a candidate against a job's compiled requirements.
+        
+        The prompt is ordered from most to least shared: fixed instructions,
+        then the job block, then the candidate, so repeated scoring for one
+        job reuses the same prompt prefix.
         
         Args:
             candidate_profile: Parsed candidate information
-            job_description: Job description text
-            required_skills: List of required skills for the job
+            requirements: Compiled job requirements (see JobRequirementsCompiler)
             
         Returns:
             Dictionary containing scores
         """
         try:
-            candidate_summary = f"""
-Candidate Profile:
+            candidate_summary = f"""Candidate Profile:
 - Name: {candidate_profile.get('name', 'N/A')}
 - Skills: {', '.join(candidate_profile.get('skills', []))}
 - Experience: {candidate_profile.get('experience_years', 0)} years
-- Education: {candidate_profile.get('education', 'N/A')}
-"""
+- Education: {candidate_profile.get('education', 'N/A')}"""
             
-            prompt = f"""
-You are an expert recruiter. Score this candidate against the job requirements.
-
-{candidate_summary}
-
-Job Description:
-{job_description}
-
-Required Skills:
-{', '.join(required_skills)}
-
-Provide scores (0-100) for the following criteria:
-1. skill_fit: How well the candidate's skills match the required skills
-2. experience_fit: How well the candidate's experience level matches the job requirements
-3. education_fit: How well the candidate's education matches the job requirements
-4. keyword_match: How well the candidate's profile matches keywords in the job description
-
-Return ONLY a valid JSON object with these four scores and an overall_score (weighted average: skill_fit 40%, experience_fit 30%, education_fit 15%, keyword_match 15%).
-
-Example format:
-{{
-  "skill_fit": 85.0,
-  "experience_fit": 75.0,
-  "education_fit": 90.0,
-  "keyword_match": 80.0,
-  "overall_score": 82.5
-}}
-"""
-            
-            response = self.client.chat.completions.create(
+            response_text = await self.provider.complete(
+                operation="score_candidate",
                 model="gpt-4.1-mini",
                 messages=[
-                    {"role": "system", "content": "You are an expert recruiter who scores candidates objectively based on job requirements."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": SCORING_INSTRUCTIONS},
+                    {"role": "user", "content": f"{format_requirements(requirements)}\n\n{candidate_summary}"}
                 ],
                 temperature=0.3,
                 max_tokens=500
             )
             
-            result_text = response.choices[0].message.content.strip()
+            result_text = response_text.strip()
             
             # Remove markdown code blocks if present
             if result_text.startswith("```json"):
@@ -93,8 +113,7 @@ Example format:
             scores = json.loads(result_text.strip())
             
             # Validate scores
-            required_keys = ["skill_fit", "experience_fit", "education_fit", "keyword_match", "overall_score"]
-            for key in required_keys:
+            for key in CRITERIA:
                 if key not in scores:
                     raise ValueError(f"Missing score: {key}")
                 if not isinstance(scores[key], (int, float)):
@@ -102,18 +121,67 @@ Example format:
                 if not 0 <= scores[key] <= 100:
                     raise ValueError(f"Score out of range for {key}: {scores[key]}")
             
+            # Overall score uses the configured weights rather than the model's arithmetic
+            scores = {key: float(scores[key]) for key in CRITERIA}
+            scores["overall_score"] = weighted_overall(scores)
+            trace.get_current_span().set_attribute("score.overall", scores["overall_score"])
+            
             logger.info(f"Successfully scored candidate: {candidate_profile.get('name', 'Unknown')} - Overall: {scores['overall_score']}")
             return scores
             
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing JSON from OpenAI response: {e}")
-            logger.error(f"Response text: {result_text}")
+            logger.error(f"Response text: {truncate_payload(result_text)}")
             raise ValueError("Failed to score candidate: Invalid JSON response from AI")
         except Exception as e:
             logger.error(f"Error scoring candidate with AI: {e}")
             raise
 
 
+    def degraded_scores(
+        self,
+        candidate_profile: Dict[str, Any],
+        requirements: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Score a candidate locally while the LLM is unavailable.
+        
+        Uses the job's compiled requirements: skill fit is the share of
+        required skills the candidate lists, experience fit compares against
+        the minimum years, education fit against the minimum degree, and
+        keyword match is the share of the candidate's skills among the job's
+        skills and keywords. Scores carry ``degraded: True``.
+        """
+        skills = {normalize_skill(skill) for skill in candidate_profile.get("skills") or []}
+        keywords = set(requirements.get("skill_keys") or []) | set(requirements.get("keyword_keys") or [])
+        
+        coverage = skill_coverage(skills, requirements)
+        skill_fit = 100.0 * coverage if coverage is not None else NEUTRAL_SCORE
+        experience = candidate_profile.get("experience_years")
+        required_years = (requirements.get("experience_years") or {}).get("min")
+        if experience is None or required_years is None:
+            experience_fit = NEUTRAL_SCORE
+        else:
+            experience_fit = min(100.0, 100.0 * float(experience) / max(float(required_years), 1.0))
+        required_degree = requirements.get("education_rank")
+        degree = education_rank(candidate_profile.get("education"))
+        if required_degree is None or degree is None:
+            education_fit = NEUTRAL_SCORE
+        else:
+            education_fit = 100.0 if degree >= required_degree else max(100.0 - 40.0 * (required_degree - degree), 20.0)
+        keyword_match = 100.0 * len(skills & keywords) / len(skills) if skills else NEUTRAL_SCORE
+        
+        scores = {
+            "skill_fit": round(skill_fit, 1),
+            "experience_fit": round(experience_fit, 1),
+            "education_fit": round(education_fit, 1),
+            "keyword_match": round(keyword_match, 1)
+        }
+        scores["overall_score"] = weighted_overall(scores)
+        scores["degraded"] = True
+        return scores
+
+
 # Singleton instance
 ai_scorer_service = AIScorerService()
 
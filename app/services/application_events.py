@@ -0,0 +1,343 @@
+"""Application status events: transactional log, Postgres NOTIFY and in-process fan-out."""
+import asyncio
+import json
+import logging
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from itertools import chain
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+from uuid import UUID
+import asyncpg
+from sqlalchemy import String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.utils.lifecycle import drain_state
+
+logger = logging.getLogger(__name__)
+
+# Appends the transitions to the event log and notifies listeners; NOTIFY is delivered on commit
+RECORD_EVENTS_SQL = text("""
+WITH inserted AS (
+    INSERT INTO application_events (application_id, job_id, old_status, new_status, created_at)
+    SELECT application_id, job_id, old_status, new_status, now() AT TIME ZONE 'utc'
+    FROM unnest(:application_ids, :job_ids, :old_statuses, :new_statuses)
+        WITH ORDINALITY AS changes(application_id, job_id, old_status, new_status, position)
+    ORDER BY position
+    RETURNING id, application_id, job_id, old_status, new_status, created_at
+)
+SELECT pg_notify(:channel, json_build_object(
+    'id', id,
+    'application_id', application_id,
+    'job_id', job_id,
+    'old_status', old_status,
+    'new_status', new_status,
+    'created_at', created_at
+)::TEXT)
+FROM inserted
+ORDER BY id
+""").bindparams(
+    bindparam("application_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("job_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("old_statuses", type_=ARRAY(String)),
+    bindparam("new_statuses", type_=ARRAY(String))
+)
+
+REPLAY_EVENTS_SQL = """
+SELECT id, application_id, job_id, old_status, new_status, created_at
+FROM application_events
+WHERE id > :after_id {job_filter}
+ORDER BY id
+LIMIT :limit
+"""
+
+HIGH_WATER_SQL = text("SELECT COALESCE(MAX(id), 0) FROM application_events")
+
+# new_status of an event announcing that an application was deleted (e.g. merged away)
+REMOVED_STATUS = "removed"
+
+# Recently delivered ids remembered per subscriber, so out-of-order commits are not dropped as duplicates
+DELIVERED_ID_WINDOW = 4096
+
+# Ids re-read below the last delivered one when catching up: a transaction holding a lower id may
+# commit after a higher one was delivered (must stay below DELIVERED_ID_WINDOW to skip repeats)
+REPLAY_ID_OVERLAP = 1024
+
+
+class StatusChanges:
+    """
+    Collects application status transitions so they can be recorded in one statement.
+    
+    Record every transition in the same transaction as the change itself, then
+    call ``ApplicationEventBroker.record``; subscribers see it once it commits.
+    """
+
+    def __init__(self):
+        self._changes: List[tuple] = []
+
+    def changed(self, application_id: UUID, job_id: UUID, old_status: Optional[str], new_status: str):
+        """Record a transition (old_status is None for a new application)."""
+        if old_status != new_status:
+            self._changes.append((application_id, job_id, old_status, new_status))
+
+    def removed(self, application_id: UUID, job_id: UUID, old_status: str):
+        """Record a deleted application (new status REMOVED_STATUS)."""
+        self._changes.append((application_id, job_id, old_status, REMOVED_STATUS))
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def __bool__(self) -> bool:
+        return bool(self._changes)
+
+    def params(self) -> Dict[str, List[Any]]:
+        application_ids, job_ids, old_statuses, new_statuses = (list(column) for column in zip(*self._changes))
+        return {
+            "application_ids": application_ids,
+            "job_ids": job_ids,
+            "old_statuses": old_statuses,
+            "new_statuses": new_statuses
+        }
+
+
+class Subscription:
+    """One subscriber's buffer of live events, filtered by job."""
+
+    def __init__(self, job_id: Optional[str], queue_size: int):
+        self.job_id = job_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set when live events may have been missed (slow consumer, LISTEN reconnect)
+        self.stale = False
+        self.closed = False
+
+    def deliver(self, event: Optional[Dict[str, Any]]):
+        """Queue a live event without blocking the shared listener."""
+        if self.stale:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stale = True
+
+    def close(self):
+        """End the event stream (server draining); clients reconnect with Last-Event-ID."""
+        self.closed = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    def mark_stale(self):
+        """Force a catch-up from the event log and wake the consumer."""
+        self.stale = True
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def events(
+        self,
+        broker: "ApplicationEventBroker",
+        last_event_id: Optional[int] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield events after ``last_event_id``, then live events as they arrive.
+        
+        Missed events (resume, overflow, reconnect) are replayed from the event
+        log before live delivery continues. Without ``last_event_id`` the log's
+        current high-water id is the starting point, so an overflow before the
+        first delivery still replays everything since subscribing. Catch-up
+        replays re-read up to ``REPLAY_ID_OVERLAP`` ids below the last
+        delivered one (not below the starting id), since ids are assigned
+        before commit and lower ids can commit later.
+        None is yielded when no event arrived within the keepalive interval.
+        """
+        resume_id = last_event_id
+        last_id = last_event_id if last_event_id is not None else await broker.high_water_id()
+        # Catch-up never goes below where the stream started
+        start_id = last_id
+        delivered: Set[int] = set()
+        delivered_order: Deque[int] = deque()
+        # An overflow while the high-water id was read also needs a catch-up
+        self.stale = self.stale or last_event_id is not None
+
+        def remember(event_id: int) -> bool:
+            if event_id in delivered:
+                return False
+            delivered.add(event_id)
+            delivered_order.append(event_id)
+            if len(delivered_order) > DELIVERED_ID_WINDOW:
+                delivered.discard(delivered_order.popleft())
+            return True
+
+        while not self.closed:
+            if self.stale:
+                # Drain first: anything already notified is committed and will be in the replay
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.stale = False
+                if resume_id is not None:
+                    # The client has seen everything up to its Last-Event-ID
+                    after_id, resume_id = resume_id, None
+                else:
+                    after_id = max(last_id - REPLAY_ID_OVERLAP, start_id)
+                async for event in broker.replay(after_id, self.job_id):
+                    if remember(event["id"]):
+                        last_id = max(last_id, event["id"])
+                        yield event
+
+            try:
+                event = await asyncio.wait_for(self.queue.get(), timeout=settings.events_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event is None or not remember(event["id"]):
+                continue
+            last_id = max(last_id, event["id"])
+            yield event
+
+
+class ApplicationEventBroker:
+    """
+    Fans out application status events to in-process subscribers.
+    
+    Each worker holds one dedicated LISTEN connection (opened on the first
+    subscription); notifications are dispatched to subscribers' bounded
+    queues by job, so thousands of SSE clients share a single connection.
+    """
+
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.connected = False
+        self._subscribers: Dict[Optional[str], Set[Subscription]] = defaultdict(set)
+        self._task: Optional[asyncio.Task] = None
+        self._has_connected = False
+        drain_state.on_drain(self._close_subscriptions)
+
+    async def record(self, db: AsyncSession, changes: StatusChanges):
+        """
+        Append transitions to the event log and NOTIFY within the caller's transaction.
+        
+        Args:
+            db: Session whose transaction also holds the status changes
+            changes: Transitions recorded for one or more applications
+        """
+        if changes:
+            await db.execute(RECORD_EVENTS_SQL, {**changes.params(), "channel": self.channel})
+
+    async def high_water_id(self) -> int:
+        """Highest id in the event log (0 when empty)."""
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(HIGH_WATER_SQL)).scalar_one()
+
+    async def replay(self, after_id: int, job_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield logged events after ``after_id`` in id order, in batches, from the primary."""
+        job_filter = "AND job_id = :job_id" if job_id else ""
+        statement = text(REPLAY_EVENTS_SQL.format(job_filter=job_filter))
+        limit = settings.events_replay_batch_size
+        while True:
+            params = {"after_id": after_id, "limit": limit}
+            if job_id:
+                params["job_id"] = UUID(job_id)
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(statement, params)).all()
+            for row in rows:
+                after_id = row.id
+                yield {
+                    "id": row.id,
+                    "application_id": str(row.application_id),
+                    "job_id": str(row.job_id),
+                    "old_status": row.old_status,
+                    "new_status": row.new_status,
+                    "created_at": row.created_at.isoformat()
+                }
+            if len(rows) < limit:
+                return
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: Optional[UUID] = None) -> AsyncIterator[Subscription]:
+        """Register a subscriber for one job (or all jobs) for the duration of the context."""
+        self._ensure_listening()
+        subscription = Subscription(str(job_id) if job_id else None, self.queue_size)
+        self._subscribers[subscription.job_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(subscription.job_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.job_id]
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    async def stop(self):
+        """Close the LISTEN connection (application shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _close_subscriptions(self):
+        for subscription in chain.from_iterable(self._subscribers.values()):
+            subscription.close()
+
+    def _ensure_listening(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed notification on {channel}: {payload[:200]}")
+            return
+        for subscription in chain(self._subscribers.get(event.get("job_id"), ()), self._subscribers.get(None, ())):
+            subscription.deliver(event)
+
+    async def _listen(self):
+        """Keep one LISTEN connection open, reconnecting with backoff."""
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        delay = 1.0
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception as e:
+                logger.warning(f"Event listener cannot connect, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+
+            delay = 1.0
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            try:
+                await connection.add_listener(self.channel, self._dispatch)
+                self.connected = True
+                if self._has_connected:
+                    # Notifications sent while disconnected are lost; subscribers catch up from the log
+                    for subscription in chain.from_iterable(self._subscribers.values()):
+                        subscription.mark_stale()
+                self._has_connected = True
+                logger.info(f"Listening for application events on {self.channel}")
+                await closed.wait()
+                logger.warning("Event listener connection lost, reconnecting")
+            except Exception as e:
+                logger.warning(f"Event listener failed, reconnecting in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+            finally:
+                self.connected = False
+                if not connection.is_closed():
+                    await connection.close()
+
+
+# Singleton instance
+application_event_broker = ApplicationEventBroker(settings.events_channel, settings.events_queue_size)
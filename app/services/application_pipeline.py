@@ -0,0 +1,543 @@
+"""CV analysis pipeline shared by /apply and deferred processing."""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Select, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.config import settings
+from app.database import read_session, write_session
+from app.models import Application, Candidate, Job
+from app.services.admission import AdmissionRejected, StageDeadlineExceeded, admission_controller
+from app.services.ai_parser import PARSER_VERSION, AIParserService
+from app.services.ai_scorer import AIScorerService
+from app.services.application_events import StatusChanges, application_event_broker
+from app.services.candidate_dedup import (
+    DuplicateMatch, candidate_dedup_service, cv_signature, is_placeholder_email, placeholder_email
+)
+from app.services.job_requirements import job_requirements_compiler
+from app.services.job_stats import JobStatsDelta, job_stats_service
+from app.services.llm_provider import LLMCircuitOpenError, LLMTimeoutError
+from app.services.score_calibration import score_calibration_service
+from app.services.storage import StorageService, storage_service
+from app.utils.lifecycle import drain_state
+from app.utils.tracing import span_link, trace_headers, tracer
+
+logger = logging.getLogger(__name__)
+
+# Status of applications accepted while overloaded and waiting for the deferred worker
+DEFERRED_STATUS = "applied"
+
+# Status of deferred applications given up after ADMISSION_DEFERRED_MAX_ATTEMPTS failed analyses
+FAILED_STATUS = "failed"
+
+# Failures meaning the LLM is unavailable (rather than a bad CV), handled by LLM_FALLBACK
+UNAVAILABLE_ERRORS = (LLMCircuitOpenError, LLMTimeoutError, StageDeadlineExceeded)
+
+# Trace contexts of deferred applications kept per worker to link their processing spans
+MAX_TRACE_ORIGINS = 1000
+
+
+class AIUnavailableError(Exception):
+    """Raised when the LLM is unavailable and LLM_FALLBACK is "defer": store the application for later."""
+
+
+class DuplicateApplicationError(Exception):
+    """Raised when a CV's candidate (or the candidate with its email) already applied to the job(s)."""
+
+    def __init__(self, candidate_id: Optional[uuid.UUID], job_ids: List[uuid.UUID]):
+        super().__init__(
+            f"Candidate {candidate_id or '(by email)'} has already applied to job(s) {', '.join(map(str, job_ids))}"
+        )
+        self.candidate_id = candidate_id
+        self.job_ids = job_ids
+
+
+def deferred_candidate_values(form_values: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Candidate values of an application stored before its CV is analyzed (form values only)."""
+    candidate_values = {key: value for key, value in form_values.items() if value}
+    candidate_values.setdefault("name", "Unknown")
+    candidate_values.setdefault("email", placeholder_email())
+    return candidate_values
+
+
+def deferred_claim_statement(now: datetime) -> Select:
+    """Oldest unleased deferred application, locked (skipping rows other workers are claiming)."""
+    return (
+        select(Application)
+        .where(
+            Application.status == DEFERRED_STATUS,
+            or_(Application.leased_until.is_(None), Application.leased_until < now)
+        )
+        .order_by(Application.updated_at)
+        .limit(1)
+        .with_for_update(skip_locked=True, of=Application)
+    )
+
+
+class ApplicationPipeline:
+    """Extracts, parses and scores a CV against a job."""
+
+    def __init__(
+        self,
+        parser: Optional[AIParserService] = None,
+        scorer: Optional[AIScorerService] = None,
+        storage: Optional[StorageService] = None
+    ):
+        self.parser = parser or AIParserService()
+        self.scorer = scorer or AIScorerService()
+        self.storage = storage or storage_service
+
+    async def analyze(
+        self,
+        job: Job,
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str],
+        form_values: Dict[str, Optional[str]],
+        candidate_id: Optional[uuid.UUID] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+        """
+        Extract and parse a CV, then score it against the job.
+        
+        Args:
+            job: Job applied for
+            file_content: CV file content
+            filename: CV file name (used to detect the format)
+            content_type: Declared MIME type, if any
+            form_values: name/email/phone/linkedin given by the applicant (take precedence)
+            candidate_id: Candidate the CV is already stored for (not its own duplicate)
+            
+        Returns:
+            Tuple of candidate column values (without resume_url), scores and status
+            
+        Raises:
+            DuplicateApplicationError: If the CV's duplicate already applied to the job
+        """
+        candidate_values = await self.parse(
+            file_content, filename, content_type, form_values, [job.id], candidate_id
+        )
+        scores, status = await self.score(job, candidate_values)
+        return candidate_values, scores, status
+
+    async def analyze_many(
+        self,
+        jobs: List[Job],
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str],
+        form_values: Dict[str, Optional[str]]
+    ) -> Tuple[Dict[str, Any], List[Tuple[Optional[Dict[str, Any]], str]]]:
+        """
+        Extract and parse a CV once, then score it against several jobs concurrently.
+        
+        Returns:
+            Tuple of candidate column values (without resume_url) and (scores, status) per job, in order
+            
+        Raises:
+            DuplicateApplicationError: If the CV's duplicate already applied to one of the jobs
+        """
+        candidate_values = await self.parse(
+            file_content, filename, content_type, form_values, [job.id for job in jobs]
+        )
+        results = await asyncio.gather(*(self.score(job, candidate_values) for job in jobs))
+        return candidate_values, list(results)
+
+    async def parse(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str],
+        form_values: Dict[str, Optional[str]],
+        job_ids: List[uuid.UUID],
+        candidate_id: Optional[uuid.UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract and parse a CV into candidate column values.
+        
+        The CV is first looked up in the duplicate index. A near-identical
+        earlier CV supplies the parsed fields (no parse call), and a CV without
+        an email takes over its duplicate's email instead of a placeholder.
+        
+        Args:
+            file_content: CV file content
+            filename: CV file name (used to detect the format)
+            content_type: Declared MIME type, if any
+            form_values: name/email/phone/linkedin given by the applicant (take precedence)
+            job_ids: Jobs applied for
+            candidate_id: Candidate the CV is already stored for (not its own duplicate)
+            
+        Returns:
+            Candidate column values (without resume_url)
+            
+        Raises:
+            DuplicateApplicationError: If the CV's duplicate already applied to one of the jobs
+        """
+        async with admission_controller.stage("extract"):
+            # PDF parsing is CPU-bound; in a thread it neither blocks the loop nor outlives the deadline's await
+            cv_text = await asyncio.to_thread(self.parser.extract_text, file_content, filename, content_type)
+        
+        signature = cv_signature(cv_text)
+        duplicate = await self._find_duplicate(
+            job_ids, signature, form_values.get("phone"), form_values.get("linkedin"), form_values.get("name"),
+            candidate_id
+        )
+        if duplicate is not None and (duplicate.similarity or 0.0) >= settings.dedup_reuse_threshold:
+            logger.info(f"CV matches candidate {duplicate.candidate_id} ({duplicate.similarity:.2f}), reusing its parsed fields")
+            parsed_data = {
+                key: duplicate.candidate[key]
+                for key in ("name", "phone", "linkedin", "skills", "experience_years", "education")
+            }
+            parser_version = duplicate.candidate.get("parser_version")
+            if not is_placeholder_email(duplicate.candidate["email"]):
+                parsed_data["email"] = duplicate.candidate["email"]
+        else:
+            try:
+                async with admission_controller.stage("parse"):
+                    parsed_data = await self.parser.parse_cv(cv_text)
+                parser_version = PARSER_VERSION
+            except UNAVAILABLE_ERRORS as e:
+                if settings.llm_fallback == "defer":
+                    raise AIUnavailableError(str(e)) from e
+                if settings.llm_fallback != "degraded":
+                    raise
+                logger.warning(f"Parsing unavailable ({e}), falling back to rule-based parsing")
+                parsed_data = self.parser.parse_locally(cv_text)
+                # Left unversioned so the next re-parse picks it up
+                parser_version = None
+        
+        email = form_values.get("email") or parsed_data.get("email")
+        if not email:
+            if duplicate is None and (parsed_data.get("phone") or parsed_data.get("linkedin")):
+                duplicate = await self._find_duplicate(
+                    job_ids, signature, parsed_data.get("phone"), parsed_data.get("linkedin"),
+                    form_values.get("name") or parsed_data.get("name"), candidate_id
+                )
+            if duplicate is not None and not is_placeholder_email(duplicate.candidate["email"]):
+                email = duplicate.candidate["email"]
+        if duplicate is not None and duplicate.applied_job_ids and email == duplicate.candidate["email"]:
+            # Known before spending a scoring call: persisting would hit the application key
+            raise DuplicateApplicationError(duplicate.candidate_id, duplicate.applied_job_ids)
+        
+        return {
+            "name": form_values.get("name") or parsed_data.get("name") or "Unknown",
+            "email": email or placeholder_email(),
+            "phone": form_values.get("phone") or parsed_data.get("phone"),
+            "linkedin": form_values.get("linkedin") or parsed_data.get("linkedin"),
+            "skills": parsed_data.get("skills") or [],
+            "experience_years": parsed_data.get("experience_years"),
+            "education": parsed_data.get("education"),
+            "minhash": signature,
+            "parser_version": parser_version
+        }
+
+    async def score(self, job: Job, candidate_values: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Score parsed candidate values against a job.
+        
+        While the LLM is unavailable the configured fallback applies: "degraded"
+        scores locally, "defer" raises AIUnavailableError.
+        
+        Returns:
+            Tuple of scores and status ("scored", or "parsed" with scores None if scoring failed)
+        """
+        candidate_profile = {
+            "name": candidate_values["name"],
+            "skills": candidate_values["skills"],
+            "experience_years": candidate_values["experience_years"],
+            "education": candidate_values["education"]
+        }
+        requirements = job_requirements_compiler.for_job(job)
+        try:
+            async with admission_controller.stage("score"):
+                scores = await self.scorer.score_candidate(
+                    candidate_profile=candidate_profile,
+                    requirements=requirements
+                )
+            return scores, "scored"
+        except UNAVAILABLE_ERRORS as e:
+            if settings.llm_fallback == "defer":
+                raise AIUnavailableError(str(e)) from e
+            if settings.llm_fallback == "degraded":
+                logger.warning(f"Scoring unavailable ({e}), scoring job {job.id} locally")
+                return self.scorer.degraded_scores(candidate_profile, requirements), "scored"
+            logger.error(f"Error scoring candidate for job {job.id}: {e}")
+            return None, "parsed"
+        except Exception as e:
+            logger.error(f"Error scoring candidate for job {job.id}: {e}")
+            # Continue without scores (stored as NULL: not scored)
+            return None, "parsed"
+
+    async def _find_duplicate(
+        self,
+        job_ids: List[uuid.UUID],
+        signature: Optional[List[int]],
+        phone: Optional[str],
+        linkedin: Optional[str],
+        name: Optional[str],
+        candidate_id: Optional[uuid.UUID]
+    ) -> Optional[DuplicateMatch]:
+        """Return the most similar probable duplicate, if any (lookup failures never fail the application)."""
+        if not settings.dedup_enabled:
+            return None
+        try:
+            async with read_session() as db:
+                matches = await candidate_dedup_service.find_duplicates(
+                    db, signature, phone, linkedin, name,
+                    job_ids=job_ids, exclude_ids=[candidate_id] if candidate_id else []
+                )
+        except Exception as e:
+            logger.warning(f"Duplicate lookup failed: {e}")
+            return None
+        return matches[0] if matches else None
+
+
+class DeferredApplicationWorker:
+    """
+    Processes applications accepted as deferred while the worker was overloaded.
+    
+    Deferred applications are stored with status ``applied``. The worker leases
+    them one at a time with ``FOR UPDATE SKIP LOCKED`` in a short transaction
+    (so several API workers can drain the same backlog, and a restart loses
+    nothing) whenever the admission controller reports spare capacity, and
+    stores the outcome in a second transaction once the CV is analyzed. Processing spans link back to
+    the request that deferred the application when this worker accepted it.
+    """
+
+    def __init__(self, pipeline: ApplicationPipeline):
+        self.pipeline = pipeline
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+        self._trace_origins: Dict[uuid.UUID, Dict[str, str]] = {}
+        drain_state.on_drain(self.notify)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run()) for _ in range(settings.admission_deferred_concurrency)
+            ]
+
+    async def stop(self, timeout: Optional[float] = None):
+        """Let applications being processed finish within ``timeout`` seconds, then cancel."""
+        drain_state.begin()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self, application_id: Optional[uuid.UUID] = None):
+        """Wake the workers after a deferred application was committed."""
+        if application_id is not None:
+            if len(self._trace_origins) >= MAX_TRACE_ORIGINS:
+                self._trace_origins.pop(next(iter(self._trace_origins)))
+            self._trace_origins[application_id] = trace_headers()
+        self._wakeup.set()
+
+    async def _run(self):
+        while not drain_state.draining:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.admission_deferred_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while admission_controller.overload_reason() is None and await self.process_next():
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Deferred application worker error: {e}")
+
+    async def process_next(self) -> bool:
+        """
+        Process the oldest deferred application.
+        
+        Returns:
+            True if an application was processed, False if none was waiting or it failed
+        """
+        claimed = await self._claim()
+        if claimed is None:
+            return False
+        application, attempt = claimed
+        
+        link = span_link(self._trace_origins.pop(application.id, None))
+        with tracer.start_as_current_span(
+            "deferred_application.process",
+            links=[link] if link else None,
+            attributes={"application.id": str(application.id), "application.attempt": attempt}
+        ):
+            status = await self._process(application, attempt)
+        if status is None:
+            return False
+        
+        if status == "scored":
+            await score_calibration_service.calibrate_new_applications([application.id])
+        logger.info(f"Processed deferred application {application.id} ({status})")
+        return True
+
+    async def _claim(self) -> Optional[Tuple[Application, int]]:
+        """
+        Lease the oldest unleased deferred application in a short transaction.
+        
+        The row is locked with ``FOR UPDATE SKIP LOCKED`` only while the lease
+        is written, so no transaction stays open during download, parsing and
+        scoring. A lease left by a crashed worker expires after
+        ``ADMISSION_DEFERRED_LEASE_SECONDS``.
+        
+        Returns:
+            The application (with candidate and job loaded) and its attempt number, or None
+        """
+        now = datetime.utcnow()
+        async with write_session() as db:
+            result = await db.execute(
+                deferred_claim_statement(now)
+                .options(selectinload(Application.candidate), selectinload(Application.job))
+            )
+            application = result.scalar_one_or_none()
+            if application is None:
+                return None
+            application.attempts += 1
+            application.leased_until = now + timedelta(seconds=settings.admission_deferred_lease_seconds)
+        return application, application.attempts
+
+    async def _reclaim(self, db: AsyncSession, application_id: uuid.UUID, attempt: int) -> Optional[Application]:
+        """Lock a leased application again to store its outcome; None if the lease was lost meanwhile."""
+        result = await db.execute(
+            select(Application)
+            .where(
+                Application.id == application_id,
+                Application.status == DEFERRED_STATUS,
+                Application.attempts == attempt
+            )
+            .with_for_update(of=Application)
+            .options(selectinload(Application.candidate))
+        )
+        application = result.scalar_one_or_none()
+        if application is None:
+            logger.warning(f"Lease on deferred application {application_id} was lost, leaving it to its new owner")
+        return application
+
+    async def _process(self, claimed: Application, attempt: int) -> Optional[str]:
+        """
+        Analyze a leased application outside any transaction, then store the outcome.
+        
+        Returns:
+            The new status, "duplicate" if the application was merged away, or None on failure
+        """
+        candidate = claimed.candidate
+        try:
+            async with admission_controller.admit(job_id=str(claimed.job_id)):
+                file_content = await self.pipeline.storage.download_file(
+                    self.pipeline.storage.object_name_from_url(candidate.resume_url)
+                )
+                candidate_values, scores, status = await self.pipeline.analyze(
+                    claimed.job,
+                    file_content,
+                    candidate.resume_url,
+                    None,
+                    {
+                        "name": candidate.name if candidate.name != "Unknown" else None,
+                        "email": None if is_placeholder_email(candidate.email) else candidate.email,
+                        "phone": candidate.phone,
+                        "linkedin": candidate.linkedin
+                    },
+                    candidate_id=candidate.id
+                )
+        except DuplicateApplicationError as e:
+            async with write_session() as db:
+                if await self._reclaim(db, claimed.id, attempt) is None:
+                    return None
+                # The placeholder candidate is a known one who already applied: fold it in
+                await candidate_dedup_service.merge(db, e.candidate_id, [candidate.id])
+            logger.info(f"Deferred application {claimed.id} duplicates one of candidate {e.candidate_id}, removed")
+            return "duplicate"
+        except (AIUnavailableError, AdmissionRejected, *UNAVAILABLE_ERRORS) as e:
+            logger.warning(f"Deferred application {claimed.id} postponed, processing unavailable: {e}")
+            await self._release(claimed.id, attempt, counted=False)
+            return None
+        except Exception as e:
+            logger.error(f"Error processing deferred application {claimed.id} (attempt {attempt}): {e}")
+            await self._release(claimed.id, attempt, counted=True)
+            return None
+        
+        async with write_session() as db:
+            application = await self._reclaim(db, claimed.id, attempt)
+            if application is None:
+                return None
+            return await self._store(db, application, candidate_values, scores, status)
+
+    async def _release(self, application_id: uuid.UUID, attempt: int, counted: bool):
+        """
+        End a lease after a failed attempt.
+        
+        Counted failures move the application to the back of the backlog, or to
+        ``failed`` once ``ADMISSION_DEFERRED_MAX_ATTEMPTS`` is reached; uncounted
+        ones (LLM or capacity unavailable) do not use up an attempt.
+        """
+        async with write_session() as db:
+            application = await self._reclaim(db, application_id, attempt)
+            if application is None:
+                return
+            application.leased_until = None
+            application.updated_at = datetime.utcnow()
+            if not counted:
+                application.attempts -= 1
+                return
+            if application.attempts < settings.admission_deferred_max_attempts:
+                return
+            logger.error(f"Deferred application {application_id} failed {application.attempts} time(s), giving up")
+            stats_delta = JobStatsDelta()
+            stats_delta.changed(application.job_id, application.status, FAILED_STATUS, application.scores, application.scores)
+            status_changes = StatusChanges()
+            status_changes.changed(application.id, application.job_id, application.status, FAILED_STATUS)
+            application.status = FAILED_STATUS
+            await job_stats_service.apply(db, stats_delta)
+            await application_event_broker.record(db, status_changes)
+
+    async def _store(
+        self,
+        db: AsyncSession,
+        application: Application,
+        candidate_values: Dict[str, Any],
+        scores: Optional[Dict[str, Any]],
+        status: str
+    ) -> str:
+        """Update a reclaimed application and its candidate with the analysis results."""
+        candidate = application.candidate
+        new_email = candidate_values.pop("email")
+        if new_email != candidate.email:
+            taken = (await db.execute(select(Candidate.id).where(Candidate.email == new_email))).scalar_one_or_none()
+            if taken is None:
+                candidate.email = new_email
+            elif is_placeholder_email(candidate.email):
+                # The CV belongs to a known candidate: fold the placeholder candidate into it
+                merge = await candidate_dedup_service.merge(db, taken, [candidate.id])
+                if application.id in merge.removed_application_ids:
+                    logger.info(f"Deferred application {application.id} duplicates one of candidate {taken}, removed")
+                    return "duplicate"
+                candidate = await db.get(Candidate, taken, populate_existing=True)
+        for key, value in candidate_values.items():
+            setattr(candidate, key, value)
+        await candidate_dedup_service.index(
+            db, candidate.id, candidate_values["minhash"], candidate.phone, candidate.linkedin
+        )
+        
+        stats_delta = JobStatsDelta()
+        stats_delta.changed(application.job_id, application.status, status, application.scores, scores)
+        status_changes = StatusChanges()
+        status_changes.changed(application.id, application.job_id, application.status, status)
+        application.status = status
+        application.scores = scores
+        application.leased_until = None
+        await job_stats_service.apply(db, stats_delta)
+        await application_event_broker.record(db, status_changes)
+        return status
+
+
+# Singleton instances
+application_pipeline = ApplicationPipeline()
+deferred_application_worker = DeferredApplicationWorker(application_pipeline)
@@ -0,0 +1,287 @@
+"""Applications partition maintenance and cold archival of closed jobs."""
+import gzip
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Candidate, Job
+from app.services.storage import StorageService, storage_service
+
+logger = logging.getLogger(__name__)
+
+HOT_PARENT = "applications_hot"
+
+# Prefix of uploaded CVs (through /apply or a presigned direct upload)
+RESUME_PREFIX = "resumes/"
+
+# Transaction-scoped advisory lock serializing partition DDL: every worker provisions at startup, and
+# concurrent CREATE TABLE IF NOT EXISTS ... PARTITION OF can still fail with a duplicate relation
+PARTITION_LOCK_KEY = 7_300_001
+PARTITION_LOCK_SQL = text("SELECT pg_advisory_xact_lock(:key)")
+
+# Partition tree (also created by the Alembic migration); idempotent
+PARTITION_TREE_SQL = [
+    "CREATE TABLE IF NOT EXISTS applications_archive PARTITION OF applications FOR VALUES IN (true)",
+    f"CREATE TABLE IF NOT EXISTS {HOT_PARENT} PARTITION OF applications FOR VALUES IN (false) PARTITION BY RANGE (created_at)",
+    f"CREATE TABLE IF NOT EXISTS {HOT_PARENT}_default PARTITION OF {HOT_PARENT} DEFAULT",
+]
+
+# Moves every hot application of the jobs into the archive partition (row movement)
+ARCHIVE_APPLICATIONS_SQL = text("""
+UPDATE applications
+SET archived = true, updated_at = :now
+WHERE job_id = ANY(:job_ids) AND archived = false
+""")
+
+# Candidates whose CV is still hot although all their applications are archived
+COLD_CANDIDATES_SQL = text("""
+SELECT c.id, c.resume_url
+FROM candidates c
+WHERE c.resume_url NOT LIKE :cold_pattern
+  AND EXISTS (SELECT 1 FROM applications a WHERE a.candidate_id = c.id AND a.archived = true)
+  AND NOT EXISTS (SELECT 1 FROM applications a WHERE a.candidate_id = c.id AND a.archived = false)
+ORDER BY c.id
+LIMIT :limit
+""")
+
+
+# Oldest events first along the primary key, so each batch stops early instead of scanning the log
+PRUNE_EVENTS_SQL = text("""
+DELETE FROM application_events
+WHERE id IN (
+    SELECT id FROM application_events
+    WHERE created_at < :cutoff
+    ORDER BY id
+    LIMIT :limit
+)
+""")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{HOT_PARENT}_p{month:%Y_%m}"
+
+
+def hot_window_start(now: Optional[datetime] = None) -> datetime:
+    """Earliest created_at that default (hot) application queries look at."""
+    return (now or datetime.utcnow()) - timedelta(days=settings.applications_hot_window_days)
+
+
+class ArchivalService:
+    """Service for applications partition maintenance and archival of closed jobs."""
+
+    def __init__(self, storage: Optional[StorageService] = None):
+        self.storage = storage or storage_service
+
+    async def ensure_partitions(self, db: AsyncSession, months_ahead: Optional[int] = None) -> List[str]:
+        """
+        Create the partition tree and the monthly hot partitions up to ``months_ahead`` months out.
+        
+        Future partitions are created ahead of time so new rows never land in
+        the default partition (which would block creating their month later).
+        Holds an advisory lock until the caller's transaction ends, so workers
+        starting together provision one after another.
+        
+        Args:
+            db: Database session (the caller commits)
+            months_ahead: Months after the current one to provision
+            
+        Returns:
+            Names of the monthly partitions that exist for the provisioned range
+        """
+        months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+        await db.execute(PARTITION_LOCK_SQL, {"key": PARTITION_LOCK_KEY})
+        for statement in PARTITION_TREE_SQL:
+            await db.execute(text(statement))
+
+        current = month_start(datetime.utcnow().date())
+        names = []
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            name = partition_name(start)
+            try:
+                async with db.begin_nested():
+                    await db.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {HOT_PARENT} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+                    ))
+                names.append(name)
+            except Exception as e:
+                # Typically rows for that month already sit in the default partition
+                logger.error(f"Could not create partition {name}: {e}")
+        logger.info(f"Ensured {len(names)} monthly applications partition(s) through {names[-1] if names else '-'}")
+        return names
+
+    async def archive_closed_jobs(self, db: AsyncSession, limit: Optional[int] = None) -> List[UUID]:
+        """
+        Move applications of jobs closed for longer than the grace period to the archive partition.
+        
+        Args:
+            db: Database session (the caller commits)
+            limit: Maximum number of jobs to archive in this call
+            
+        Returns:
+            Ids of the archived jobs
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=settings.archive_after_days)
+        result = await db.execute(
+            select(Job.id)
+            .where(Job.status == "closed", Job.archived_at.is_(None), Job.updated_at < cutoff)
+            .order_by(Job.updated_at)
+            .limit(limit or settings.archive_batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        job_ids = list(result.scalars().all())
+        if not job_ids:
+            return []
+
+        moved = await db.execute(ARCHIVE_APPLICATIONS_SQL, {"job_ids": job_ids, "now": now})
+        await db.execute(update(Job).where(Job.id.in_(job_ids)).values(archived_at=now))
+        logger.info(f"Archived {moved.rowcount} application(s) of {len(job_ids)} closed job(s)")
+        return job_ids
+
+    async def archive_cvs(self, db: AsyncSession, limit: Optional[int] = None) -> int:
+        """
+        Move CVs of candidates with only archived applications to the compressed cold prefix.
+        
+        Each CV is gzip-compressed to ``<cold prefix><object>.gz``; the candidate's
+        resume_url is updated before the hot object is deleted, so an interrupted
+        run is simply picked up again by the next one. The update only applies
+        while the candidate still has the CV that was copied: if they applied
+        again meanwhile (new resume_url), the cold copy is deleted instead.
+        
+        Args:
+            db: Database session (committed per CV so storage and database stay in step)
+            limit: Maximum number of CVs to move in this call
+            
+        Returns:
+            Number of CVs moved
+        """
+        prefix = settings.archive_cold_prefix
+        rows = (await db.execute(COLD_CANDIDATES_SQL, {
+            "cold_pattern": f"%/{prefix}%",
+            "limit": limit or settings.archive_batch_size
+        })).all()
+
+        moved = 0
+        for candidate_id, resume_url in rows:
+            object_name = self.storage.object_name_from_url(resume_url)
+            cold_name = f"{prefix}{object_name}.gz"
+            try:
+                content = await self.storage.download_file(object_name)
+                cold_url = await self.storage.upload_file(gzip.compress(content), cold_name, "application/gzip")
+                updated = await db.execute(
+                    update(Candidate)
+                    .where(Candidate.id == candidate_id, Candidate.resume_url == resume_url)
+                    .values(resume_url=cold_url)
+                )
+                await db.commit()
+                if updated.rowcount != 1:
+                    logger.info(f"Candidate {candidate_id} replaced CV {object_name} while it was archived, keeping it hot")
+                    await self.storage.delete_file(cold_name)
+                    continue
+                await self.storage.delete_file(object_name)
+                moved += 1
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Error archiving CV {object_name} of candidate {candidate_id}: {e}")
+        logger.info(f"Moved {moved} CV(s) to {prefix}")
+        return moved
+
+    async def sweep_orphan_uploads(self, db: AsyncSession) -> int:
+        """
+        Delete uploaded CVs no candidate refers to.
+        
+        Direct uploads that were never finalized (or whose application failed
+        after the upload) leave objects under ``resumes/``. Only objects older
+        than ``STORAGE_ORPHAN_GRACE_SECONDS`` are considered, so uploads still
+        awaiting finalize or being persisted by /apply are kept.
+        
+        Returns:
+            Number of objects deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.storage_orphan_grace_seconds)
+        checked = removed = 0
+        # Each listed batch is checked before the next one is read
+        async for listed in self.storage.list_files(RESUME_PREFIX, settings.archive_batch_size):
+            stale = [name for name, modified in listed if modified < cutoff]
+            checked += len(stale)
+            if not stale:
+                continue
+            urls = {self.storage.object_url(name): name for name in stale}
+            referenced = set((await db.execute(
+                select(Candidate.resume_url).where(Candidate.resume_url.in_(list(urls)))
+            )).scalars())
+            for url, object_name in urls.items():
+                if url in referenced:
+                    continue
+                try:
+                    await self.storage.delete_file(object_name)
+                    removed += 1
+                except Exception as e:
+                    logger.error(f"Error deleting orphaned upload {object_name}: {e}")
+        logger.info(f"Deleted {removed} orphaned upload(s) of {checked} checked")
+        return removed
+
+    async def prune_events(self, db: AsyncSession, limit: Optional[int] = None) -> int:
+        """
+        Delete status events older than ``EVENTS_RETENTION_DAYS`` (one batch).
+        
+        Clients resuming from an older Last-Event-ID replay from the oldest event kept.
+        
+        Returns:
+            Number of events deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.events_retention_days)
+        result = await db.execute(PRUNE_EVENTS_SQL, {"cutoff": cutoff, "limit": limit or settings.archive_batch_size * 10})
+        return result.rowcount
+
+    async def run(self, db: AsyncSession) -> Dict[str, Any]:
+        """Provision partitions, archive closed jobs, move their CVs to cold storage, delete orphaned uploads and prune old events."""
+        partitions = await self.ensure_partitions(db)
+        await db.commit()
+        archived_jobs = []
+        while True:
+            job_ids = await self.archive_closed_jobs(db)
+            await db.commit()
+            if not job_ids:
+                break
+            archived_jobs.extend(job_ids)
+        moved_cvs = 0
+        while True:
+            moved = await self.archive_cvs(db)
+            moved_cvs += moved
+            if not moved:
+                break
+        orphaned_uploads = await self.sweep_orphan_uploads(db)
+        pruned_events = 0
+        while True:
+            pruned = await self.prune_events(db)
+            await db.commit()
+            pruned_events += pruned
+            if not pruned:
+                break
+        logger.info(f"Pruned {pruned_events} status event(s) older than {settings.events_retention_days} day(s)")
+        return {
+            "partitions": partitions,
+            "archived_jobs": len(archived_jobs),
+            "cold_cvs": moved_cvs,
+            "orphaned_uploads": orphaned_uploads,
+            "pruned_events": pruned_events
+        }
+
+
+# Singleton instance
+archival_service = ArchivalService()
@@ -0,0 +1,112 @@
+"""Offline batch submission of LLM requests (request files out, result files in)."""
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from app.config import settings
+from app.services.llm_provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+COMPLETIONS_URL = "/v1/chat/completions"
+
+
+class BatchSubmitter(ABC):
+    """
+    Submits many completion requests at once and collects their results later.
+
+    Requests use the OpenAI batch input format (one ``custom_id`` per request,
+    ``body`` holding the chat completion arguments); results map each
+    ``custom_id`` to the response text, or to None when that request failed.
+    """
+
+    @abstractmethod
+    async def submit(self, batch_id: str, requests: Dict[str, Dict[str, Any]]):
+        """Submit completion requests (custom_id -> model/messages/temperature/max_tokens)."""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return custom_id -> response text (None if failed), or None while the batch is pending."""
+
+
+def _write_jsonl(path: Path, records: Iterable[Dict[str, Any]]):
+    """Write JSON lines atomically, so a crash never leaves a truncated file behind."""
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(partial, path)
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LocalBatchSubmitter(BatchSubmitter):
+    """
+    Local stand-in for a batch API.
+
+    ``submit`` writes ``<batch_id>.requests.jsonl`` to the batch directory;
+    the batch is complete once ``<batch_id>.results.jsonl`` exists there, in
+    the OpenAI batch output format (``custom_id`` plus ``response.body`` or
+    ``error``). The files can be uploaded to and downloaded from a provider's
+    batch API by hand, or answered locally with ``complete_locally``.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.reparse_batch_dir)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def requests_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}.requests.jsonl"
+
+    def results_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}.results.jsonl"
+
+    async def submit(self, batch_id: str, requests: Dict[str, Dict[str, Any]]):
+        _write_jsonl(self.requests_path(batch_id), (
+            {"custom_id": custom_id, "method": "POST", "url": COMPLETIONS_URL, "body": body}
+            for custom_id, body in requests.items()
+        ))
+        logger.info(f"Wrote {len(requests)} request(s) for batch {batch_id}")
+
+    async def results(self, batch_id: str) -> Optional[Dict[str, Optional[str]]]:
+        path = self.results_path(batch_id)
+        if not path.exists():
+            return None
+        results: Dict[str, Optional[str]] = {}
+        for record in _read_jsonl(path):
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code", 200) != 200:
+                results[record["custom_id"]] = None
+                continue
+            results[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        return results
+
+    async def complete_locally(self, batch_id: str, provider: LLMProvider, operation: str) -> int:
+        """
+        Answer a submitted batch with an LLM provider and write its results file.
+
+        Returns:
+            Number of requests answered successfully
+        """
+        answered = 0
+        records = []
+        for request in _read_jsonl(self.requests_path(batch_id)):
+            try:
+                content = await provider.complete(operation=operation, **request["body"])
+            except Exception as e:
+                logger.warning(f"Batch {batch_id} request {request['custom_id']} failed: {e}")
+                records.append({"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}})
+                continue
+            answered += 1
+            records.append({
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+                "error": None
+            })
+        _write_jsonl(self.results_path(batch_id), records)
+        return answered
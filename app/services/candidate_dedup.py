@@ -0,0 +1,515 @@
+"""Near-duplicate candidate detection (MinHash/LSH) and candidate merging."""
+import hashlib
+import logging
+import re
+import unicodedata
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import BigInteger, Integer, bindparam, delete, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Application, ApplicationKey, Candidate
+from app.services.cv_text import cv_text_store
+from app.services.application_events import StatusChanges, application_event_broker
+from app.services.job_stats import JobStatsDelta, job_stats_service
+from app.services.status_transitions import STATUS_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_WORDS = 3
+
+PLACEHOLDER_EMAIL_PREFIX = "unknown_"
+PLACEHOLDER_EMAIL_DOMAIN = "@example.com"
+
+# Exact identity keys share the bucket table under negative band numbers
+PHONE_BAND = -1
+LINKEDIN_BAND = -2
+
+# Signatures are stored, so the permutations must never change
+_PRIME = (1 << 31) - 1
+_permutation_rng = np.random.RandomState(1_000_003)
+_A = _permutation_rng.randint(1, _PRIME, MINHASH_PERMUTATIONS).astype(np.uint64)
+_B = _permutation_rng.randint(0, _PRIME, MINHASH_PERMUTATIONS).astype(np.uint64)
+
+LINKEDIN_HANDLE = re.compile(r"linkedin\.com/in/([^/?#\s]+)", re.IGNORECASE)
+
+# Candidates sharing at least one bucket with the probe, best-connected first
+FIND_CANDIDATES_SQL = text("""
+SELECT c.id, c.name, c.email, c.phone, c.linkedin, c.skills, c.experience_years, c.education, c.minhash,
+       c.parser_version,
+       COUNT(*) AS shared_buckets,
+       ARRAY(
+           SELECT k.job_id FROM application_keys k WHERE k.candidate_id = c.id AND k.job_id = ANY(:job_ids)
+       ) AS applied_job_ids
+FROM candidate_lsh_buckets b
+JOIN candidates c ON c.id = b.candidate_id
+WHERE (b.band, b.bucket) IN (SELECT * FROM unnest(:bands, :buckets))
+  AND c.id <> ALL(:exclude_ids)
+GROUP BY c.id
+ORDER BY shared_buckets DESC
+LIMIT :probe_limit
+""").bindparams(
+    bindparam("bands", type_=ARRAY(Integer)),
+    bindparam("buckets", type_=ARRAY(BigInteger)),
+    bindparam("exclude_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("job_ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+)
+
+INDEX_BUCKETS_SQL = text("""
+INSERT INTO candidate_lsh_buckets (band, bucket, candidate_id)
+SELECT band, bucket, :candidate_id FROM unnest(:bands, :buckets) AS probe(band, bucket)
+ON CONFLICT DO NOTHING
+""").bindparams(
+    bindparam("bands", type_=ARRAY(Integer)),
+    bindparam("buckets", type_=ARRAY(BigInteger))
+)
+
+# Buckets shared by several candidates; oversized buckets (template text) are skipped
+COLLIDING_BUCKETS_SQL = text("""
+SELECT array_agg(candidate_id)
+FROM candidate_lsh_buckets
+GROUP BY band, bucket
+HAVING COUNT(*) BETWEEN 2 AND :max_bucket_size
+""")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    if not value:
+        return ""
+    # đ has no decomposition
+    decomposed = unicodedata.normalize("NFKD", value.replace("đ", "d").replace("Đ", "D"))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[\W_]+", " ", stripped.lower()).split())
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Return the last nine digits of a phone number (drops country/trunk prefixes)."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-9:] if len(digits) >= 7 else None
+
+
+def normalize_linkedin(linkedin: Optional[str]) -> Optional[str]:
+    """Return the LinkedIn profile handle of a URL (or a bare handle)."""
+    if not linkedin:
+        return None
+    match = LINKEDIN_HANDLE.search(linkedin)
+    handle = match.group(1) if match else linkedin.strip().strip("/")
+    return handle.lower() or None
+
+
+def name_similarity(first: Optional[str], second: Optional[str]) -> float:
+    """Jaccard similarity of the character trigrams of two normalized names."""
+    def trigrams(name: Optional[str]) -> Set[str]:
+        compact = normalize_text(name).replace(" ", "")
+        return {compact[index:index + 3] for index in range(max(len(compact) - 2, 1))} if compact else set()
+
+    first_grams, second_grams = trigrams(first), trigrams(second)
+    if not first_grams or not second_grams:
+        return 0.0
+    return len(first_grams & second_grams) / len(first_grams | second_grams)
+
+
+def text_shingles(cv_text: Optional[str]) -> Set[str]:
+    """Word shingles of the normalized CV text."""
+    words = normalize_text(cv_text).split()
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[index:index + SHINGLE_WORDS]) for index in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def minhash(features: Iterable[str]) -> Optional[List[int]]:
+    """
+    MinHash signature of a feature set.
+
+    Each feature is hashed once; the permutations are universal hashes
+    ``(a * x + b) mod (2^31 - 1)`` evaluated for all features at once.
+
+    Returns:
+        MINHASH_PERMUTATIONS values, or None for an empty set
+    """
+    hashes = np.fromiter((_hash64(feature) % _PRIME for feature in features), dtype=np.uint64)
+    if hashes.size == 0:
+        return None
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.int64).tolist()
+
+
+def cv_signature(cv_text: Optional[str]) -> Optional[List[int]]:
+    """MinHash signature of a CV's text shingles."""
+    return minhash(text_shingles(cv_text))
+
+
+def estimated_similarity(first: Optional[Sequence[int]], second: Optional[Sequence[int]]) -> Optional[float]:
+    """Estimated Jaccard similarity of two signatures (share of equal minimums)."""
+    if not first or not second or len(first) != len(second):
+        return None
+    return float(np.mean(np.asarray(first) == np.asarray(second)))
+
+
+def lsh_buckets(
+    signature: Optional[Sequence[int]],
+    phone: Optional[str] = None,
+    linkedin: Optional[str] = None
+) -> List[Tuple[int, int]]:
+    """Return the (band, bucket) keys of a candidate: one per signature band plus exact identity keys."""
+    buckets = []
+    if signature:
+        for band in range(LSH_BANDS):
+            rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+            buckets.append((band, _hash64(f"{band}:" + ",".join(map(str, rows)))))
+    normalized_phone = normalize_phone(phone)
+    if normalized_phone:
+        buckets.append((PHONE_BAND, _hash64(f"phone:{normalized_phone}")))
+    handle = normalize_linkedin(linkedin)
+    if handle:
+        buckets.append((LINKEDIN_BAND, _hash64(f"linkedin:{handle}")))
+    return buckets
+
+
+def placeholder_email() -> str:
+    """Email used when neither the form nor the CV provides one (candidates.email is required)."""
+    return f"{PLACEHOLDER_EMAIL_PREFIX}{uuid.uuid4().hex[:8]}{PLACEHOLDER_EMAIL_DOMAIN}"
+
+
+def is_placeholder_email(email: Optional[str]) -> bool:
+    return bool(email) and email.startswith(PLACEHOLDER_EMAIL_PREFIX) and email.endswith(PLACEHOLDER_EMAIL_DOMAIN)
+
+
+class DuplicateMatch:
+    """A probable duplicate of a probe candidate."""
+
+    def __init__(
+        self,
+        candidate: Dict[str, Any],
+        similarity: Optional[float],
+        matched_on: List[str],
+        applied_job_ids: List[UUID]
+    ):
+        self.candidate = candidate
+        self.similarity = similarity
+        self.matched_on = matched_on
+        self.applied_job_ids = applied_job_ids
+
+    @property
+    def candidate_id(self) -> UUID:
+        return self.candidate["id"]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.candidate["id"],
+            "name": self.candidate["name"],
+            "email": self.candidate["email"],
+            "similarity": self.similarity,
+            "matched_on": self.matched_on
+        }
+
+
+class MergeResult:
+    """Outcome of merging duplicates into a target candidate."""
+
+    def __init__(self, target_id: UUID, merged_ids: List[UUID], moved: List[UUID], removed: List[UUID]):
+        self.target_id = target_id
+        self.merged_ids = merged_ids
+        self.moved_application_ids = moved
+        self.removed_application_ids = removed
+
+
+class CandidateDedupService:
+    """
+    Finds and merges near-duplicate candidates.
+
+    Every candidate with a signature is indexed in ``candidate_lsh_buckets``:
+    one bucket per band of its CV-text MinHash signature (LSH_BANDS bands of
+    LSH_ROWS rows, so pairs above roughly 0.4 similarity usually share a
+    bucket) plus exact buckets for its phone number and LinkedIn handle.
+    Looking up a new CV reads only the buckets it falls into; the candidates
+    found are then verified by estimated similarity, or by a matching phone or
+    LinkedIn handle with a similar name.
+    """
+
+    def verify(
+        self,
+        row: Dict[str, Any],
+        signature: Optional[Sequence[int]],
+        phone: Optional[str],
+        linkedin: Optional[str],
+        name: Optional[str]
+    ) -> Optional[Tuple[Optional[float], List[str]]]:
+        """Return (similarity, matched_on) if the row is a probable duplicate of the probe, else None."""
+        matched_on = []
+        similarity = estimated_similarity(signature, row["minhash"])
+        if similarity is not None and similarity >= settings.dedup_similarity_threshold:
+            matched_on.append("cv_text")
+        if not name or not row["name"] or name_similarity(name, row["name"]) >= settings.dedup_name_similarity:
+            if normalize_phone(phone) and normalize_phone(phone) == normalize_phone(row["phone"]):
+                matched_on.append("phone")
+            if normalize_linkedin(linkedin) and normalize_linkedin(linkedin) == normalize_linkedin(row["linkedin"]):
+                matched_on.append("linkedin")
+        return (similarity, matched_on) if matched_on else None
+
+    async def find_duplicates(
+        self,
+        db: AsyncSession,
+        signature: Optional[Sequence[int]],
+        phone: Optional[str] = None,
+        linkedin: Optional[str] = None,
+        name: Optional[str] = None,
+        job_ids: Sequence[UUID] = (),
+        exclude_ids: Sequence[UUID] = ()
+    ) -> List[DuplicateMatch]:
+        """
+        Find probable duplicates of a candidate through the LSH index.
+
+        Args:
+            db: Database session
+            signature: CV text signature of the probe (may be None)
+            phone: Probe phone number
+            linkedin: Probe LinkedIn URL
+            name: Probe name (required to be similar for phone/LinkedIn matches)
+            job_ids: Report which of these jobs each duplicate already applied to
+            exclude_ids: Candidates to ignore (e.g. the probe itself)
+
+        Returns:
+            Verified duplicates, most similar first
+        """
+        buckets = lsh_buckets(signature, phone, linkedin)
+        if not settings.dedup_enabled or not buckets:
+            return []
+        bands, bucket_keys = zip(*buckets)
+        result = await db.execute(FIND_CANDIDATES_SQL, {
+            "bands": list(bands),
+            "buckets": list(bucket_keys),
+            "exclude_ids": list(exclude_ids),
+            "job_ids": list(job_ids),
+            "probe_limit": settings.dedup_probe_limit
+        })
+        matches = []
+        for row in result.mappings():
+            verified = self.verify(row, signature, phone, linkedin, name)
+            if verified is not None:
+                matches.append(DuplicateMatch(dict(row), verified[0], verified[1], list(row["applied_job_ids"])))
+        matches.sort(key=lambda match: (match.similarity or 0.0, len(match.matched_on)), reverse=True)
+        return matches
+
+    async def index(
+        self,
+        db: AsyncSession,
+        candidate_id: UUID,
+        signature: Optional[Sequence[int]],
+        phone: Optional[str] = None,
+        linkedin: Optional[str] = None
+    ):
+        """Replace a candidate's LSH buckets (within the caller's transaction)."""
+        await db.execute(text("DELETE FROM candidate_lsh_buckets WHERE candidate_id = :candidate_id"), {
+            "candidate_id": candidate_id
+        })
+        buckets = lsh_buckets(signature, phone, linkedin)
+        if buckets:
+            bands, bucket_keys = zip(*buckets)
+            await db.execute(INDEX_BUCKETS_SQL, {
+                "candidate_id": candidate_id, "bands": list(bands), "buckets": list(bucket_keys)
+            })
+
+    async def merge(self, db: AsyncSession, target_id: UUID, duplicate_ids: Sequence[UUID]) -> MergeResult:
+        """
+        Merge duplicate candidates into a target candidate (the caller commits).
+
+        Applications of the duplicates move to the target. Where several of the
+        candidates applied to the same job, the most advanced application is kept
+        (STATUS_PROGRESS, then the most recently updated), so a recruiter's
+        decision is never lost; the others, possibly the target's own, are
+        deleted with a ``removed`` status event. Empty target fields are filled
+        from the duplicates, skills are unioned, and a placeholder email is
+        replaced by a real one. The duplicates are deleted.
+
+        Raises:
+            LookupError: If the target or a duplicate does not exist
+        """
+        duplicate_ids = [candidate_id for candidate_id in dict.fromkeys(duplicate_ids) if candidate_id != target_id]
+        ids = [target_id, *duplicate_ids]
+        result = await db.execute(
+            select(Candidate.__table__).where(Candidate.id.in_(ids)).order_by(Candidate.id).with_for_update()
+        )
+        rows = {row["id"]: dict(row) for row in result.mappings()}
+        missing = [candidate_id for candidate_id in ids if candidate_id not in rows]
+        if missing:
+            raise LookupError(f"Candidates not found: {', '.join(map(str, missing))}")
+        if not duplicate_ids:
+            return MergeResult(target_id, [], [], [])
+
+        applications = (await db.execute(
+            select(
+                Application.id, Application.job_id, Application.candidate_id, Application.status,
+                Application.scores, Application.updated_at
+            ).where(Application.candidate_id.in_(ids)).order_by(Application.created_at)
+        )).all()
+        kept: Dict[UUID, Any] = {}
+        for application in applications:
+            current = kept.get(application.job_id)
+            if current is None or self._progress(application) > self._progress(current):
+                kept[application.job_id] = application
+        moved = [application for application in kept.values() if application.candidate_id != target_id]
+        removed = [application for application in applications if kept[application.job_id] is not application]
+
+        now = datetime.utcnow()
+        await db.execute(delete(ApplicationKey).where(ApplicationKey.candidate_id.in_(duplicate_ids)))
+        if removed:
+            removed_ids = [application.id for application in removed]
+            await db.execute(delete(ApplicationKey).where(ApplicationKey.application_id.in_(removed_ids)))
+            await db.execute(delete(Application.__table__).where(Application.id.in_(removed_ids)))
+            stats_delta = JobStatsDelta()
+            status_changes = StatusChanges()
+            for application in removed:
+                stats_delta.removed(application.job_id, application.status, application.scores)
+                status_changes.removed(application.id, application.job_id, application.status)
+            await job_stats_service.apply(db, stats_delta)
+            await application_event_broker.record(db, status_changes)
+        if moved:
+            await db.execute(
+                update(Application.__table__)
+                .where(Application.id.in_([application.id for application in moved]))
+                .values(candidate_id=target_id, updated_at=now)
+            )
+            await db.execute(pg_insert(ApplicationKey).values([
+                {"job_id": application.job_id, "candidate_id": target_id, "application_id": application.id}
+                for application in moved
+            ]).on_conflict_do_nothing())
+
+        target = rows[target_id]
+        values: Dict[str, Any] = {"updated_at": now}
+        skills = list(target["skills"] or [])
+        for duplicate_id in duplicate_ids:
+            duplicate = rows[duplicate_id]
+            for field in ("phone", "linkedin", "experience_years", "education", "minhash"):
+                if target[field] is None and values.get(field) is None and duplicate[field] is not None:
+                    values[field] = duplicate[field]
+            if target["name"] == "Unknown" and "name" not in values and duplicate["name"] != "Unknown":
+                values["name"] = duplicate["name"]
+            if is_placeholder_email(target["email"]) and "email" not in values and not is_placeholder_email(duplicate["email"]):
+                values["email"] = duplicate["email"]
+            skills.extend(duplicate["skills"] or [])
+        values["skills"] = list(dict.fromkeys(skills))
+
+        # Duplicates go first so the target can take over one of their emails
+        await db.execute(delete(Candidate.__table__).where(Candidate.id.in_(duplicate_ids)))
+        await db.execute(update(Candidate.__table__).where(Candidate.id == target_id).values(**values))
+        merged = {**target, **values}
+        await self.index(db, target_id, merged["minhash"], merged["phone"], merged["linkedin"])
+
+        logger.info(
+            f"Merged {len(duplicate_ids)} candidate(s) into {target_id}: "
+            f"{len(moved)} application(s) moved, {len(removed)} duplicate application(s) removed"
+        )
+        return MergeResult(
+            target_id,
+            duplicate_ids,
+            [application.id for application in moved],
+            [application.id for application in removed]
+        )
+
+    @staticmethod
+    def _progress(application: Any) -> Tuple[int, datetime]:
+        return STATUS_PROGRESS.get(application.status, 0), application.updated_at
+
+    async def backfill(self, db: AsyncSession, batch_size: Optional[int] = None) -> int:
+        """
+        Compute and index signatures of candidates that have none, committing per batch.
+        
+        CV text comes from the text cache, or the CV is downloaded and
+        extracted again (and cached); candidates whose CV cannot be read are
+        skipped and stay unsigned.
+        
+        Returns:
+            Number of candidates indexed
+        """
+        batch_size = batch_size or settings.dedup_batch_size
+        indexed = 0
+        after: Optional[UUID] = None
+        while True:
+            query = (
+                select(Candidate.id, Candidate.resume_url, Candidate.phone, Candidate.linkedin)
+                .where(Candidate.minhash.is_(None))
+                .order_by(Candidate.id)
+                .limit(batch_size)
+            )
+            if after is not None:
+                query = query.where(Candidate.id > after)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return indexed
+            for row in rows:
+                try:
+                    cv_text, _ = await cv_text_store.get(row.resume_url)
+                    signature = cv_signature(cv_text)
+                except Exception as e:
+                    logger.warning(f"Skipping candidate {row.id}, CV unreadable: {e}")
+                    continue
+                await db.execute(update(Candidate.__table__).where(Candidate.id == row.id).values(minhash=signature))
+                await self.index(db, row.id, signature, row.phone, row.linkedin)
+                indexed += 1
+            await db.commit()
+            after = rows[-1].id
+            logger.info(f"Indexed {indexed} candidate signature(s)")
+
+    async def cluster(self, db: AsyncSession) -> List[List[UUID]]:
+        """
+        Group indexed candidates into clusters of probable duplicates.
+
+        Pairs sharing a bucket are verified and joined with union-find, so
+        each cluster is a connected component of verified duplicate pairs.
+
+        Returns:
+            Clusters of two or more candidate ids
+        """
+        groups = [row[0] for row in await db.execute(COLLIDING_BUCKETS_SQL, {
+            "max_bucket_size": settings.dedup_max_bucket_size
+        })]
+        candidate_ids = {candidate_id for group in groups for candidate_id in group}
+        if not candidate_ids:
+            return []
+        result = await db.execute(
+            select(Candidate.id, Candidate.name, Candidate.phone, Candidate.linkedin, Candidate.minhash)
+            .where(Candidate.id.in_(candidate_ids))
+        )
+        rows = {row["id"]: row for row in result.mappings()}
+
+        parent = {candidate_id: candidate_id for candidate_id in rows}
+
+        def find(candidate_id: UUID) -> UUID:
+            while parent[candidate_id] != candidate_id:
+                parent[candidate_id] = parent[parent[candidate_id]]
+                candidate_id = parent[candidate_id]
+            return candidate_id
+
+        checked: Set[Tuple[UUID, UUID]] = set()
+        for group in groups:
+            members = sorted(candidate_id for candidate_id in group if candidate_id in rows)
+            for index, first in enumerate(members):
+                for second in members[index + 1:]:
+                    if (first, second) in checked or find(first) == find(second):
+                        continue
+                    checked.add((first, second))
+                    probe = rows[first]
+                    if self.verify(rows[second], probe["minhash"], probe["phone"], probe["linkedin"], probe["name"]):
+                        parent[find(second)] = find(first)
+
+        clusters: Dict[UUID, List[UUID]] = {}
+        for candidate_id in rows:
+            clusters.setdefault(find(candidate_id), []).append(candidate_id)
+        return [members for members in clusters.values() if len(members) > 1]
+
+
+# Singleton instance
+candidate_dedup_service = CandidateDedupService()
@@ -0,0 +1,222 @@
+"""Rule-based extraction of CV fields that do not need an LLM."""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+LINKEDIN_PATTERN = re.compile(
+    r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9_%-]+/?",
+    re.IGNORECASE
+)
+# International numbers: optional +country code, then 7-15 digits split by spaces, dots, dashes or parentheses
+PHONE_PATTERN = re.compile(r"(?<![\w+])(\+?\d{1,3}[\s.-]?)?(\(?\d{1,4}\)?[\s.-]?){2,5}\d{2,4}(?!\w)")
+EXPERIENCE_PATTERN = re.compile(
+    r"(\d{1,2}(?:\.\d)?)\+?\s*(?:years?|yrs?)(?:\s+of)?\s+(?:professional\s+|work\s+|industry\s+)?experience",
+    re.IGNORECASE
+)
+NAME_PATTERN = re.compile(r"^[A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-.]*){1,3}$")
+
+# Below any fast-path threshold: a CV's skills always come from the LLM
+DICTIONARY_SKILLS_CONFIDENCE = 0.5
+
+EDUCATION_KEYWORDS = [
+    ("phd", "PhD"), ("ph.d", "PhD"), ("doctor of", "PhD"),
+    ("master", "Master"), ("msc", "Master"), ("m.sc", "Master"), ("mba", "Master"),
+    ("bachelor", "Bachelor"), ("bsc", "Bachelor"), ("b.sc", "Bachelor"), ("b.eng", "Bachelor"),
+]
+INSTITUTION_KEYWORDS = ("university", "college", "institute", "school", "academy", "polytechnic")
+NAME_STOPWORDS = {"curriculum", "vitae", "resume", "cv", "profile", "contact", "summary"}
+
+DEFAULT_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#", "Ruby", "PHP",
+    "Kotlin", "Swift", "Scala", "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Redis",
+    "Elasticsearch", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow", "dbt", "Snowflake",
+    "FastAPI", "Django", "Flask", "Spring", "Node.js", "React", "Angular", "Vue", "Next.js",
+    "GraphQL", "REST", "gRPC", "Docker", "Kubernetes", "Terraform", "Ansible", "AWS", "Azure",
+    "GCP", "Linux", "Git", "CI/CD", "Jenkins", "Machine Learning", "Deep Learning", "NLP",
+    "Computer Vision", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "NumPy", "Tableau",
+    "Power BI", "Excel", "Agile", "Scrum", "Project Management", "Leadership", "Communication",
+    "SAP", "SuccessFactors", "Salesforce", "Microservices", "Data Analysis", "Data Engineering",
+]
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton matching a skill dictionary in one pass over the text.
+
+    Matching is case-insensitive and only accepts hits on word boundaries, so
+    "Go" does not match inside "Google".
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for skill in skills:
+            self._add(skill)
+        self._build()
+
+    def _add(self, skill: str):
+        state = 0
+        for char in skill.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(skill)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[str]:
+        """Return dictionary skills found in text, in order of first occurrence."""
+        lowered = text.lower()
+        found: Dict[str, None] = {}
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for skill in self._output[state]:
+                start = index - len(skill) + 1
+                if _is_boundary(lowered, start - 1) and _is_boundary(lowered, index + 1):
+                    found.setdefault(skill, None)
+        return list(found)
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+@dataclass
+class ExtractionResult:
+    """Fields extracted by rules, with a 0-1 confidence per field."""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+
+class CVFieldExtractor:
+    """Extracts contact details, skills, experience and education from CV text with rules."""
+
+    def __init__(self, skills: Optional[Iterable[str]] = None):
+        self.skill_matcher = SkillMatcher(skills or DEFAULT_SKILLS)
+
+    def extract(self, cv_text: str) -> ExtractionResult:
+        """
+        Extract fields from CV text.
+
+        Args:
+            cv_text: Raw text extracted from CV
+
+        Returns:
+            ExtractionResult with values and confidences for the fields found
+        """
+        result = ExtractionResult()
+        lines = [line.strip() for line in cv_text.splitlines() if line.strip()]
+
+        for name, (value, confidence) in {
+            "email": self._email(cv_text),
+            "linkedin": self._linkedin(cv_text),
+            "phone": self._phone(cv_text),
+            "name": self._name(lines),
+            "skills": self._skills(cv_text),
+            "experience_years": self._experience(cv_text),
+            "education": self._education(lines),
+        }.items():
+            if value is not None:
+                result.fields[name] = value
+                result.confidence[name] = confidence
+        return result
+
+    def _email(self, text: str) -> Tuple[Optional[str], float]:
+        emails = list(dict.fromkeys(match.lower() for match in EMAIL_PATTERN.findall(text)))
+        if not emails:
+            return None, 0.0
+        return emails[0], 0.95 if len(emails) == 1 else 0.7
+
+    def _linkedin(self, text: str) -> Tuple[Optional[str], float]:
+        match = LINKEDIN_PATTERN.search(text)
+        if not match:
+            return None, 0.0
+        url = match.group(0).rstrip("/")
+        if not url.lower().startswith("http"):
+            url = f"https://{url}"
+        return url, 0.95
+
+    def _phone(self, text: str) -> Tuple[Optional[str], float]:
+        for match in PHONE_PATTERN.finditer(text):
+            candidate = match.group(0).strip()
+            digits = re.sub(r"\D", "", candidate)
+            # Skip date ranges and years (e.g. "2015 - 2020") that look like numbers
+            if not 7 <= len(digits) <= 15 or re.fullmatch(r"(19|20)\d{2}\s*[-.]\s*(19|20)\d{2}", candidate):
+                continue
+            return candidate, 0.9 if candidate.startswith("+") or len(digits) >= 10 else 0.75
+        return None, 0.0
+
+    def _name(self, lines: List[str]) -> Tuple[Optional[str], float]:
+        for position, line in enumerate(lines[:5]):
+            cleaned = re.sub(r"\s+", " ", line)
+            if any(word.lower() in NAME_STOPWORDS for word in cleaned.split()):
+                continue
+            if NAME_PATTERN.match(cleaned):
+                # A name on the very first line is by far the most common layout
+                return cleaned, 0.85 if position == 0 else 0.6
+        return None, 0.0
+
+    def _skills(self, text: str) -> Tuple[Optional[List[str]], float]:
+        skills = self.skill_matcher.find(text)
+        if not skills:
+            return None, 0.0
+        # Dictionary hits are precise but the dictionary is not exhaustive, so
+        # however many there are they only stand in for the LLM in degraded mode
+        return skills, DICTIONARY_SKILLS_CONFIDENCE
+
+    def _experience(self, text: str) -> Tuple[Optional[float], float]:
+        values = [float(match) for match in EXPERIENCE_PATTERN.findall(text)]
+        if not values:
+            return None, 0.0
+        return max(values), 0.85 if len(set(values)) == 1 else 0.6
+
+    def _education(self, lines: List[str]) -> Tuple[Optional[str], float]:
+        best: Optional[Tuple[int, str]] = None
+        ranks = {"PhD": 3, "Master": 2, "Bachelor": 1}
+        for line in lines:
+            lowered = line.lower()
+            for keyword, level in EDUCATION_KEYWORDS:
+                if re.search(rf"(?<![a-z]){re.escape(keyword)}(?![a-z])", lowered):
+                    if best is None or ranks[level] > best[0]:
+                        best = (ranks[level], re.sub(r"^(education|degree)\s*[:\-]\s*", "", line, flags=re.IGNORECASE)[:500])
+                    break
+        if best is None:
+            return None, 0.0
+        # A degree line that also names the institution matches what the LLM is asked for
+        has_institution = any(keyword in best[1].lower() for keyword in INSTITUTION_KEYWORDS)
+        return best[1], 0.85 if has_institution else 0.65
+
+
+def load_skills_dictionary(path: Optional[str]) -> List[str]:
+    """Load a skills dictionary (one skill per line), falling back to the built-in list."""
+    if not path:
+        return DEFAULT_SKILLS
+    with open(path, encoding="utf-8") as dictionary:
+        return [line.strip() for line in dictionary if line.strip() and not line.startswith("#")]
+
+
+# Singleton instance
+cv_field_extractor = CVFieldExtractor(load_skills_dictionary(settings.cv_skills_dictionary_path))
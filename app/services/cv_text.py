@@ -0,0 +1,59 @@
+"""Extracted CV text, cached in object storage next to the CVs."""
+import asyncio
+import gzip
+import logging
+from pathlib import PurePosixPath
+from typing import Tuple
+from app.config import settings
+from app.services.document_extraction import detect_mime_type, extractor_registry
+from app.services.storage import storage_service
+
+logger = logging.getLogger(__name__)
+
+
+class CVTextStore:
+    """
+    Reads the text of stored CVs for offline jobs (duplicate backfill, re-parsing).
+
+    Text is extracted from the CV once (cold, gzip-compressed CVs included)
+    and cached gzip-compressed under ``REPARSE_TEXT_PREFIX``; later reads
+    download the small text object instead of extracting the document again.
+    """
+
+    @staticmethod
+    def text_object_name(cv_object_name: str) -> str:
+        """Cache object of a CV, stable across archival (resumes/<id>.pdf and cold/resumes/<id>.pdf.gz)."""
+        name = PurePosixPath(cv_object_name).name
+        if name.endswith(".gz"):
+            name = name[:-len(".gz")]
+        return f"{settings.reparse_text_prefix}{name}.txt.gz"
+
+    async def get(self, resume_url: str) -> Tuple[str, bool]:
+        """
+        Return a CV's text and whether it came from the cache.
+
+        Args:
+            resume_url: Stored resume URL of the candidate
+        """
+        object_name = storage_service.object_name_from_url(resume_url)
+        cache_name = self.text_object_name(object_name)
+        if await storage_service.stat_file(cache_name) is not None:
+            return gzip.decompress(await storage_service.download_file(cache_name)).decode("utf-8"), True
+
+        content = await storage_service.download_file(object_name)
+        if object_name.endswith(".gz"):
+            content = gzip.decompress(content)
+            object_name = object_name[:-len(".gz")]
+        cv_text = await asyncio.to_thread(
+            extractor_registry.extract_text, content, detect_mime_type(object_name), settings.extraction_max_chars
+        )
+        try:
+            await storage_service.upload_file(gzip.compress(cv_text.encode("utf-8")), cache_name, "application/gzip")
+        except Exception as e:
+            # The cache is an optimization: the text is still returned
+            logger.warning(f"Could not cache text of {object_name}: {e}")
+        return cv_text, False
+
+
+# Singleton instance
+cv_text_store = CVTextStore()
@@ -0,0 +1,207 @@
+"""Pluggable text extraction engines for CV documents."""
+import io
+import logging
+import mimetypes
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+import pdfplumber
+import PyPDF2
+from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from app.config import settings
+from app.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+EXTENSION_MIME_TYPES = {
+    ".pdf": PDF_MIME_TYPE,
+    ".docx": DOCX_MIME_TYPE,
+}
+
+
+class ExtractionEngine(ABC):
+    """Base class for text extraction engines."""
+
+    name: str = ""
+    mime_types: tuple = ()
+
+    @abstractmethod
+    def iter_pages(self, file_content: bytes) -> Iterator[str]:
+        """
+        Yield the document text one page (or block) at a time.
+
+        Args:
+            file_content: Raw document bytes
+
+        Yields:
+            Text of each page; callers may stop iterating early
+        """
+
+
+class PyPDF2Engine(ExtractionEngine):
+    """PDF extraction with PyPDF2 (fast, layout-agnostic)."""
+
+    name = "pypdf2"
+    mime_types = (PDF_MIME_TYPE,)
+
+    def iter_pages(self, file_content: bytes) -> Iterator[str]:
+        reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        for page in reader.pages:
+            yield page.extract_text() or ""
+
+
+class PdfplumberEngine(ExtractionEngine):
+    """PDF extraction with pdfplumber (slower, better reading order and tables)."""
+
+    name = "pdfplumber"
+    mime_types = (PDF_MIME_TYPE,)
+
+    def iter_pages(self, file_content: bytes) -> Iterator[str]:
+        with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+                # Release the parsed layout objects of pages already consumed
+                page.flush_cache()
+
+
+class DocxEngine(ExtractionEngine):
+    """DOCX extraction covering headers, body paragraphs, tables and footers."""
+
+    name = "docx"
+    mime_types = (DOCX_MIME_TYPE,)
+
+    def iter_pages(self, file_content: bytes) -> Iterator[str]:
+        doc = Document(io.BytesIO(file_content))
+
+        headers = _unique_lines(
+            paragraph.text for section in doc.sections for paragraph in section.header.paragraphs
+        )
+        if headers:
+            yield "\n".join(headers)
+
+        # Walk the body in document order so tables stay next to their headings
+        block: List[str] = []
+        for element in doc.element.body.iterchildren():
+            if element.tag.endswith("}p"):
+                text = Paragraph(element, doc).text
+                if text:
+                    block.append(text)
+            elif element.tag.endswith("}tbl"):
+                if block:
+                    yield "\n".join(block)
+                    block = []
+                yield _table_text(Table(element, doc))
+        if block:
+            yield "\n".join(block)
+
+        footers = _unique_lines(
+            paragraph.text for section in doc.sections for paragraph in section.footer.paragraphs
+        )
+        if footers:
+            yield "\n".join(footers)
+
+
+def _unique_lines(lines) -> List[str]:
+    """Drop empty and repeated lines (headers repeat across sections)."""
+    return list(dict.fromkeys(line for line in lines if line.strip()))
+
+
+def _table_text(table: Table) -> str:
+    """Render a DOCX table as tab-separated rows, skipping merged duplicate cells."""
+    rows = []
+    for row in table.rows:
+        cells = list(dict.fromkeys(cell.text.strip() for cell in row.cells))
+        rows.append("\t".join(cell for cell in cells if cell))
+    return "\n".join(row for row in rows if row)
+
+
+class ExtractorRegistry:
+    """Registry that selects an extraction engine by MIME type and configuration."""
+
+    def __init__(self, preferred: Optional[Dict[str, str]] = None):
+        self._engines: Dict[str, ExtractionEngine] = {}
+        self._preferred: Dict[str, str] = dict(preferred or {})
+
+    def register(self, engine: ExtractionEngine, preferred: bool = False):
+        """Register an engine; ``preferred`` makes it the default for its MIME types."""
+        self._engines[engine.name] = engine
+        for mime_type in engine.mime_types:
+            if preferred or mime_type not in self._preferred:
+                self._preferred[mime_type] = engine.name
+
+    def engines(self, mime_type: Optional[str] = None) -> List[ExtractionEngine]:
+        """List registered engines, optionally only those supporting mime_type."""
+        return [
+            engine for engine in self._engines.values()
+            if mime_type is None or mime_type in engine.mime_types
+        ]
+
+    def get(self, mime_type: str, engine_name: Optional[str] = None) -> ExtractionEngine:
+        """Return the named engine, or the preferred engine for the MIME type."""
+        name = engine_name or self._preferred.get(mime_type)
+        engine = self._engines.get(name) if name else None
+        if engine is None or mime_type not in engine.mime_types:
+            raise ValueError(f"No extraction engine for {mime_type}" + (f" named {engine_name}" if engine_name else ""))
+        return engine
+
+    def iter_text(
+        self,
+        file_content: bytes,
+        mime_type: str,
+        max_chars: Optional[int] = None,
+        engine_name: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield page texts, stopping once max_chars characters have been produced."""
+        produced = 0
+        for page_text in self.get(mime_type, engine_name).iter_pages(file_content):
+            yield page_text
+            produced += len(page_text)
+            if max_chars and produced >= max_chars:
+                break
+
+    def extract_text(
+        self,
+        file_content: bytes,
+        mime_type: str,
+        max_chars: Optional[int] = None,
+        engine_name: Optional[str] = None
+    ) -> str:
+        """Extract the document text, truncated to max_chars when given."""
+        engine = self.get(mime_type, engine_name)
+        with tracer.start_as_current_span("cv.extract", attributes={
+            "cv.mime_type": mime_type, "cv.bytes": len(file_content), "extraction.engine": engine.name
+        }) as span:
+            pages = list(self.iter_text(file_content, mime_type, max_chars, engine.name))
+            text = "\n".join(pages).strip()
+            text = text[:max_chars] if max_chars else text
+            span.set_attributes({"cv.pages": len(pages), "cv.chars": len(text)})
+            return text
+
+
+def detect_mime_type(filename: str, content_type: Optional[str] = None) -> str:
+    """Resolve a supported MIME type from the declared content type or the file extension."""
+    if content_type in EXTENSION_MIME_TYPES.values():
+        return content_type
+    extension = "." + filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
+    mime_type = EXTENSION_MIME_TYPES.get(extension) or mimetypes.guess_type(filename)[0]
+    if mime_type not in EXTENSION_MIME_TYPES.values():
+        raise ValueError(f"Unsupported file format: {filename}")
+    return mime_type
+
+
+def create_registry() -> ExtractorRegistry:
+    """Create a registry with the built-in engines and the configured PDF engine."""
+    registry = ExtractorRegistry()
+    registry.register(PdfplumberEngine())
+    registry.register(PyPDF2Engine())
+    registry.register(DocxEngine())
+    registry.register(registry.get(PDF_MIME_TYPE, settings.pdf_extraction_engine), preferred=True)
+    return registry
+
+
+# Singleton instance
+extractor_registry = create_registry()
@@ -0,0 +1,189 @@
+"""Streaming CSV and Parquet export of application pipelines."""
+import csv
+import io
+import logging
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import text
+from app.database import read_session
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 2000
+
+# Applications joined with candidate fields and flattened scores; skills are joined into one cell.
+# resume_url is the API path redirecting to a fresh presigned download, so links do not expire.
+EXPORT_SQL = """
+SELECT a.id AS application_id,
+       a.job_id,
+       j.title AS job_title,
+       a.status,
+       c.name AS candidate_name,
+       c.email AS candidate_email,
+       c.phone AS candidate_phone,
+       c.linkedin AS candidate_linkedin,
+       c.experience_years,
+       c.education,
+       array_to_string(ARRAY(SELECT json_array_elements_text(c.skills)), '; ') AS skills,
+       (a.scores->>'skill_fit')::FLOAT AS skill_fit,
+       (a.scores->>'experience_fit')::FLOAT AS experience_fit,
+       (a.scores->>'education_fit')::FLOAT AS education_fit,
+       (a.scores->>'keyword_match')::FLOAT AS keyword_match,
+       (a.scores->>'overall_score')::FLOAT AS overall_score,
+       a.calibrated_score,
+       a.score_percentile,
+       a.job_rank,
+       '/api/v1/candidates/' || c.id || '/resume' AS resume_url,
+       a.created_at,
+       a.updated_at
+FROM applications a
+JOIN candidates c ON c.id = a.candidate_id
+JOIN jobs j ON j.id = a.job_id
+{where}
+ORDER BY a.created_at DESC
+"""
+
+EXPORT_COLUMNS = [
+    "application_id", "job_id", "job_title", "status", "candidate_name", "candidate_email",
+    "candidate_phone", "candidate_linkedin", "experience_years", "education", "skills",
+    "skill_fit", "experience_fit", "education_fit", "keyword_match", "overall_score",
+    "calibrated_score", "score_percentile", "job_rank", "resume_url", "created_at", "updated_at"
+]
+
+
+def _parquet_schema():
+    """Arrow schema matching EXPORT_COLUMNS (fixed so every row group has identical types)."""
+    import pyarrow as pa
+    float_columns = {
+        "experience_years", "skill_fit", "experience_fit", "education_fit", "keyword_match",
+        "overall_score", "calibrated_score", "score_percentile"
+    }
+    fields = []
+    for column in EXPORT_COLUMNS:
+        if column in float_columns:
+            fields.append(pa.field(column, pa.float64()))
+        elif column == "job_rank":
+            fields.append(pa.field(column, pa.int32()))
+        elif column in ("created_at", "updated_at"):
+            fields.append(pa.field(column, pa.timestamp("us")))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Service for streaming application pipelines as CSV or Parquet."""
+
+    async def _iter_batches(self, job_id: Optional[UUID]) -> AsyncIterator[Sequence[Any]]:
+        """Yield batches of export rows from a server-side cursor on a read-only session."""
+        where = "WHERE a.job_id = :job_id" if job_id else ""
+        params = {"job_id": job_id} if job_id else {}
+        statement = text(EXPORT_SQL.format(where=where)).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        async with read_session() as db:
+            result = await db.stream(statement, params)
+            async for batch in result.partitions(EXPORT_BATCH_SIZE):
+                yield batch
+
+    async def iter_csv(self, job_id: Optional[UUID] = None, gzip: bool = False) -> AsyncIterator[bytes]:
+        """
+        Stream the export as CSV, one chunk per cursor batch.
+
+        Args:
+            job_id: Export only this job's applications; all when omitted
+            gzip: Compress the stream incrementally with gzip framing
+
+        Yields:
+            Encoded (and optionally compressed) CSV chunks
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzip else None
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> bytes:
+            data = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return compressor.compress(data) if compressor else data
+
+        writer.writerow(EXPORT_COLUMNS)
+        rows = 0
+        async for batch in self._iter_batches(job_id):
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in batch
+            )
+            rows += len(batch)
+            chunk = flush()
+            if chunk:
+                yield chunk
+
+        chunk = flush()
+        if compressor:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
+        logger.info(f"Exported {rows} application(s) as CSV")
+
+    async def iter_parquet(self, job_id: Optional[UUID] = None) -> AsyncIterator[bytes]:
+        """
+        Stream the export as Parquet, writing one row group per cursor batch.
+
+        Args:
+            job_id: Export only this job's applications; all when omitted
+
+        Yields:
+            Parquet file bytes as each row group is completed
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _parquet_schema()
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        rows = 0
+        try:
+            async for batch in self._iter_batches(job_id):
+                columns = list(zip(*batch))
+                arrays = [
+                    pa.array([str(value) if isinstance(value, UUID) else value for value in column], type=field.type)
+                    for column, field in zip(columns, schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(batch)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            writer.close()
+        yield sink.drain()
+        logger.info(f"Exported {rows} application(s) as Parquet")
+
+
+# Singleton instance
+export_service = ExportService()
@@ -0,0 +1,174 @@
+"""Compile job descriptions into compact, normalized requirements for scoring."""
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from app.config import settings
+from app.services.cv_extractor import EDUCATION_KEYWORDS, CVFieldExtractor, cv_field_extractor
+
+logger = logging.getLogger(__name__)
+
+# Bump when the compiled shape changes; jobs compiled by an older version are recompiled on use
+REQUIREMENTS_VERSION = 1
+
+EDUCATION_RANKS = {"Bachelor": 1, "Master": 2, "PhD": 3}
+EDUCATION_LEVELS = {rank: level for level, rank in EDUCATION_RANKS.items()}
+
+# Checked against the title first, then the description; the first level found wins
+SENIORITY_PATTERNS = [
+    ("intern", re.compile(r"\b(intern|internship|thực tập)\b", re.IGNORECASE)),
+    ("junior", re.compile(r"\b(junior|jr\.?|entry[- ]level|graduate|fresher)\b", re.IGNORECASE)),
+    ("lead", re.compile(r"\b(lead|staff|principal|head of|manager)\b", re.IGNORECASE)),
+    ("senior", re.compile(r"\b(senior|sr\.?)\b", re.IGNORECASE)),
+    ("mid", re.compile(r"\b(mid[- ]level|intermediate|middle)\b", re.IGNORECASE)),
+]
+
+YEARS = r"(?:years?|yrs?|năm)"
+EXPERIENCE_RANGE = re.compile(rf"(\d{{1,2}}(?:\.\d)?)\s*(?:-|–|to|đến)\s*(\d{{1,2}}(?:\.\d)?)\s*\+?\s*{YEARS}", re.IGNORECASE)
+EXPERIENCE_MIN = re.compile(rf"(\d{{1,2}}(?:\.\d)?)\s*\+?\s*{YEARS}", re.IGNORECASE)
+
+# Lines stating requirements are kept first when condensing a description
+REQUIREMENT_CUES = re.compile(
+    r"(require|must|experience|skill|qualif|responsib|degree|knowledge|proficien|yêu cầu|kinh nghiệm|kỹ năng)",
+    re.IGNORECASE
+)
+
+
+def normalize_skill(skill: str) -> str:
+    """Comparison key of a skill: lowercase with collapsed whitespace."""
+    return re.sub(r"\s+", " ", skill.strip().lower())
+
+
+def skill_coverage(candidate_skills: Iterable[str], requirements: Dict[str, Any]) -> Optional[float]:
+    """Share (0-1) of a job's required skills a candidate lists, or None if the job lists none."""
+    required = set(requirements.get("skill_keys") or [])
+    if not required:
+        return None
+    return len(required & {normalize_skill(skill) for skill in candidate_skills or []}) / len(required)
+
+
+def _education_ranks(text: str) -> List[int]:
+    lowered = text.lower()
+    return [
+        EDUCATION_RANKS[level] for keyword, level in EDUCATION_KEYWORDS
+        if re.search(rf"(?<![a-z]){re.escape(keyword)}(?![a-z])", lowered)
+    ]
+
+
+def education_rank(education: Optional[str]) -> Optional[int]:
+    """Highest degree level mentioned in a text (1 Bachelor, 2 Master, 3 PhD), or None."""
+    return max(_education_ranks(education), default=None) if education else None
+
+
+class JobRequirementsCompiler:
+    """
+    Turns a job's title, description and required skills into compiled requirements.
+
+    The result is stored on the job when it is created or updated, so scoring
+    neither re-sends nor re-interprets the full description: LLM prompts use
+    the compact form and local scoring and filtering use the normalized skill
+    and keyword keys directly.
+    """
+
+    def __init__(self, extractor: Optional[CVFieldExtractor] = None):
+        self.extractor = extractor or cv_field_extractor
+
+    def compile(self, title: str, jd_text: str, required_skills: Iterable[str]) -> Dict[str, Any]:
+        """
+        Compile a job's requirements.
+
+        Args:
+            title: Job title
+            jd_text: Job description
+            required_skills: Skills entered for the job
+
+        Returns:
+            Dictionary with skills, keywords (and their comparison keys),
+            seniority, experience range, minimum education and a condensed summary
+        """
+        dictionary = {normalize_skill(skill): skill for skill in self.extractor.skill_matcher.find(
+            " , ".join(required_skills or [])
+        )}
+        skills = self._unique(dictionary.get(normalize_skill(skill), skill.strip()) for skill in required_skills or [])
+        # Keywords already covered by a required skill ("REST" in "REST API") are left out
+        skill_keys = {normalize_skill(skill) for skill in skills}
+        skill_keys |= {word for key in skill_keys for word in key.split()}
+        keywords = [
+            keyword for keyword in self.extractor.skill_matcher.find(f"{title}\n{jd_text}")
+            if normalize_skill(keyword) not in skill_keys
+        ]
+        experience = self._experience(jd_text)
+
+        return {
+            "version": REQUIREMENTS_VERSION,
+            "title": title,
+            "skills": skills,
+            "skill_keys": [normalize_skill(skill) for skill in skills],
+            "keywords": keywords,
+            "keyword_keys": [normalize_skill(keyword) for keyword in keywords],
+            "seniority": self._seniority(title, jd_text, experience["min"]),
+            "experience_years": experience,
+            # "Bachelor's or Master's" sets the bar at the lowest degree mentioned
+            "education_rank": min(_education_ranks(jd_text), default=None),
+            "summary": self._summary(jd_text, settings.job_summary_max_chars)
+        }
+
+    @staticmethod
+    def _unique(values: Iterable[str]) -> List[str]:
+        seen: Dict[str, str] = {}
+        for value in values:
+            if value and normalize_skill(value) not in seen:
+                seen[normalize_skill(value)] = value
+        return list(seen.values())
+
+    @staticmethod
+    def _experience(jd_text: str) -> Dict[str, Optional[float]]:
+        ranges = EXPERIENCE_RANGE.findall(jd_text)
+        if ranges:
+            low, high = sorted(float(value) for value in ranges[0])
+            return {"min": low, "max": high}
+        # Several "N+ years" usually qualify single skills; the largest is the overall bar
+        minimums = [float(value) for value in EXPERIENCE_MIN.findall(jd_text) if float(value) <= 30]
+        return {"min": max(minimums) if minimums else None, "max": None}
+
+    @staticmethod
+    def _seniority(title: str, jd_text: str, min_years: Optional[float]) -> Optional[str]:
+        for text in (title, jd_text):
+            for level, pattern in SENIORITY_PATTERNS:
+                if pattern.search(text or ""):
+                    return level
+        if min_years is None:
+            return None
+        if min_years < 2:
+            return "junior"
+        return "mid" if min_years < 5 else "senior"
+
+    @staticmethod
+    def _summary(jd_text: str, max_chars: int) -> str:
+        """Condense a description to its requirement lines first, within max_chars."""
+        lines = list(dict.fromkeys(
+            re.sub(r"\s+", " ", line).strip(" -•*\t") for line in jd_text.splitlines()
+        ))
+        lines = [line for line in lines if line]
+        if sum(len(line) + 1 for line in lines) <= max_chars:
+            return "\n".join(lines)
+        ordered = [line for line in lines if REQUIREMENT_CUES.search(line)]
+        ordered += [line for line in lines if not REQUIREMENT_CUES.search(line)]
+        kept, size = set(), 0
+        for line in ordered:
+            if size + len(line) + 1 > max_chars:
+                continue
+            kept.add(line)
+            size += len(line) + 1
+        summary = "\n".join(line for line in lines if line in kept)
+        return summary or lines[0][:max_chars].rsplit(" ", 1)[0]
+
+    def for_job(self, job: Any) -> Dict[str, Any]:
+        """Compiled requirements of a job, compiling them when missing or outdated."""
+        requirements = getattr(job, "requirements", None)
+        if requirements and requirements.get("version") == REQUIREMENTS_VERSION:
+            return requirements
+        return self.compile(job.title, job.jd_text, job.required_skills)
+
+
+# Singleton instance
+job_requirements_compiler = JobRequirementsCompiler()
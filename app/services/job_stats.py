@@ -0,0 +1,227 @@
+"""Incremental maintenance of per-job pipeline statistics."""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import Integer, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import JobStats
+from app.models.job_stats import SCORE_BUCKET_COUNT, SCORE_BUCKET_WIDTH
+
+logger = logging.getLogger(__name__)
+
+# Adds a delta row to the job's stats (element-wise for the histogram, per key for status counts)
+APPLY_DELTA_SQL = text("""
+INSERT INTO job_stats (job_id, total_count, status_counts, score_histogram, score_count, score_sum, score_sum_sq, updated_at)
+VALUES (:job_id, :total_count, :status_counts, :score_histogram,
+        :score_count, :score_sum, :score_sum_sq, :updated_at)
+ON CONFLICT (job_id) DO UPDATE SET
+    total_count = job_stats.total_count + excluded.total_count,
+    status_counts = COALESCE((
+        SELECT jsonb_object_agg(key, total)
+        FROM (
+            SELECT key, SUM(value::INTEGER) AS total
+            FROM (
+                SELECT * FROM jsonb_each_text(job_stats.status_counts)
+                UNION ALL
+                SELECT * FROM jsonb_each_text(excluded.status_counts)
+            ) AS entries
+            GROUP BY key
+        ) AS merged
+    ), '{}'::JSONB),
+    score_histogram = ARRAY(
+        SELECT existing + delta
+        FROM unnest(job_stats.score_histogram, excluded.score_histogram) WITH ORDINALITY AS buckets(existing, delta, bucket)
+        ORDER BY bucket
+    ),
+    score_count = job_stats.score_count + excluded.score_count,
+    score_sum = job_stats.score_sum + excluded.score_sum,
+    score_sum_sq = job_stats.score_sum_sq + excluded.score_sum_sq,
+    updated_at = excluded.updated_at
+""").bindparams(
+    bindparam("status_counts", type_=JSONB),
+    bindparam("score_histogram", type_=ARRAY(Integer))
+)
+
+# Aggregates applications per job, status and score bucket for a rebuild
+REBUILD_AGGREGATE_SQL = """
+SELECT job_id,
+       status,
+       LEAST(FLOOR((scores->>'overall_score')::FLOAT / {bucket_width}), {last_bucket})::INTEGER AS bucket,
+       COUNT(*) AS application_count,
+       SUM((scores->>'overall_score')::FLOAT) AS score_sum,
+       SUM(POWER((scores->>'overall_score')::FLOAT, 2)) AS score_sum_sq
+FROM applications
+{where}
+GROUP BY job_id, status, bucket
+"""
+
+
+def overall_score(scores: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Return the overall score from an application's scores, if any."""
+    if not scores:
+        return None
+    value = scores.get("overall_score")
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def score_bucket(score: float) -> int:
+    """Return the 0-based histogram bucket for a 0-100 score."""
+    return min(max(int(score // SCORE_BUCKET_WIDTH), 0), SCORE_BUCKET_COUNT - 1)
+
+
+class _JobDelta:
+    """Accumulated changes to one job's statistics."""
+
+    def __init__(self):
+        self.total_count = 0
+        self.status_counts: Dict[str, int] = defaultdict(int)
+        self.score_histogram = [0] * SCORE_BUCKET_COUNT
+        self.score_count = 0
+        self.score_sum = 0.0
+        self.score_sum_sq = 0.0
+
+    def add(self, status: Optional[str], scores: Optional[Dict[str, Any]], sign: int, count_total: bool):
+        if count_total:
+            self.total_count += sign
+        if status:
+            self.status_counts[status] += sign
+        score = overall_score(scores)
+        if score is not None:
+            self.score_histogram[score_bucket(score)] += sign
+            self.score_count += sign
+            self.score_sum += sign * score
+            self.score_sum_sq += sign * score * score
+
+    def params(self, job_id: UUID, now: datetime) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "total_count": self.total_count,
+            "status_counts": {key: value for key, value in self.status_counts.items() if value},
+            "score_histogram": self.score_histogram,
+            "score_count": self.score_count,
+            "score_sum": self.score_sum,
+            "score_sum_sq": self.score_sum_sq,
+            "updated_at": now
+        }
+
+
+class JobStatsDelta:
+    """
+    Collects application changes so they can be applied to job_stats in one statement.
+
+    Record every application insert, status change or score change in the same
+    transaction as the change itself, then call ``JobStatsService.apply``.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[UUID, _JobDelta] = defaultdict(_JobDelta)
+
+    def created(self, job_id: UUID, status: str, scores: Optional[Dict[str, Any]] = None):
+        """Record a new application."""
+        self._jobs[job_id].add(status, scores, 1, count_total=True)
+
+    def removed(self, job_id: UUID, status: str, scores: Optional[Dict[str, Any]] = None):
+        """Record a deleted application."""
+        self._jobs[job_id].add(status, scores, -1, count_total=True)
+
+    def changed(
+        self,
+        job_id: UUID,
+        old_status: str,
+        new_status: str,
+        old_scores: Optional[Dict[str, Any]] = None,
+        new_scores: Optional[Dict[str, Any]] = None
+    ):
+        """Record a status and/or score change of an existing application."""
+        if old_status == new_status and overall_score(old_scores) == overall_score(new_scores):
+            return
+        self._jobs[job_id].add(old_status, old_scores, -1, count_total=False)
+        self._jobs[job_id].add(new_status, new_scores, 1, count_total=False)
+
+    def aggregated(
+        self,
+        job_id: UUID,
+        status: str,
+        bucket: Optional[int],
+        count: int,
+        score_sum: Optional[float],
+        score_sum_sq: Optional[float]
+    ):
+        """Record a pre-aggregated group of applications sharing status and score bucket."""
+        job_delta = self._jobs[job_id]
+        job_delta.total_count += count
+        job_delta.status_counts[status] += count
+        if bucket is not None:
+            job_delta.score_histogram[bucket] += count
+            job_delta.score_count += count
+            job_delta.score_sum += score_sum
+            job_delta.score_sum_sq += score_sum_sq
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __bool__(self) -> bool:
+        return bool(self._jobs)
+
+    def params(self) -> List[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return [delta.params(job_id, now) for job_id, delta in self._jobs.items()]
+
+
+class JobStatsService:
+    """Service for maintaining and reading per-job pipeline statistics."""
+
+    async def apply(self, db: AsyncSession, delta: JobStatsDelta):
+        """
+        Apply accumulated changes to job_stats within the caller's transaction.
+
+        Args:
+            db: Session whose transaction also holds the application changes
+            delta: Changes recorded for one or more jobs
+        """
+        if delta:
+            await db.execute(APPLY_DELTA_SQL, delta.params())
+
+    async def get(self, db: AsyncSession, job_id: UUID) -> Optional[JobStats]:
+        """Return the statistics row for a job (None if no application was recorded yet)."""
+        result = await db.execute(select(JobStats).where(JobStats.job_id == job_id))
+        return result.scalar_one_or_none()
+
+    async def rebuild(self, db: AsyncSession, job_id: Optional[UUID] = None) -> int:
+        """
+        Recompute job_stats from the applications table to repair drift.
+
+        Args:
+            db: Database session (the caller commits)
+            job_id: Rebuild only this job; all jobs when omitted
+
+        Returns:
+            Number of jobs whose statistics were rewritten
+        """
+        where = "WHERE job_id = :job_id" if job_id else ""
+        params = {"job_id": job_id} if job_id else {}
+        aggregate_sql = REBUILD_AGGREGATE_SQL.format(
+            where=where, bucket_width=SCORE_BUCKET_WIDTH, last_bucket=SCORE_BUCKET_COUNT - 1
+        )
+
+        # Block concurrent delta upserts until commit so none is lost between aggregate and rewrite
+        await db.execute(text("LOCK TABLE job_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+        deltas = JobStatsDelta()
+        result = await db.execute(text(aggregate_sql), params)
+        for row in result:
+            deltas.aggregated(
+                row.job_id, row.status, row.bucket, row.application_count, row.score_sum, row.score_sum_sq
+            )
+
+        await db.execute(text(f"DELETE FROM job_stats {where}"), params)
+        await self.apply(db, deltas)
+        logger.info(f"Rebuilt job stats for {len(deltas)} job(s)")
+        return len(deltas)
+
+
+# Singleton instance
+job_stats_service = JobStatsService()
@@ -0,0 +1,472 @@
+"""LLM provider abstraction with record/replay and synthetic stand-ins."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from openai import AsyncOpenAI, RateLimitError
+from opentelemetry import trace
+from app.config import settings
+from app.services.admission import admission_controller
+from app.utils.circuit_breaker import llm_circuit_breaker
+from app.utils.latency import LatencyModel
+from app.utils.tracing import trace_headers, tracer
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProviderError(Exception):
+    """Raised when an LLM provider fails to produce a completion."""
+
+
+class LLMRateLimitError(LLMProviderError):
+    """Raised when the provider rejects a request with HTTP 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMProviderError):
+    """Raised when a completion (including its hedged attempt) exceeds LLM_TIMEOUT_SECONDS."""
+
+
+class LLMCircuitOpenError(LLMProviderError):
+    """Raised without calling the provider while the LLM circuit breaker is open."""
+
+
+class CassetteMissError(LLMProviderError):
+    """Raised in strict replay mode when no recorded response matches a request."""
+
+
+def request_key(operation: str, model: str, messages: List[Dict[str, str]]) -> str:
+    """Build a stable cassette key for a chat completion request."""
+    canonical = json.dumps(
+        {"operation": operation, "model": model, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMProvider(ABC):
+    """Base class for chat completion providers."""
+
+    @abstractmethod
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Run a chat completion and return the assistant message content.
+
+        Args:
+            operation: Logical caller name (e.g. "parse_cv", "score_candidate")
+            messages: Chat messages sent to the model
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Raw message content returned by the model
+        """
+
+
+class OpenAIProvider(LLMProvider):
+    """Provider backed by the OpenAI API."""
+
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """Initialize OpenAI client."""
+        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_headers=trace_headers()
+            )
+        except RateLimitError as e:
+            retry_after = e.response.headers.get("retry-after") if e.response is not None else None
+            raise LLMRateLimitError(str(e), float(retry_after) if retry_after else None) from e
+        if response.usage is not None:
+            trace.get_current_span().set_attributes({
+                "llm.prompt_tokens": response.usage.prompt_tokens,
+                "llm.completion_tokens": response.usage.completion_tokens
+            })
+        return response.choices[0].message.content or ""
+
+
+class RecordingProvider(LLMProvider):
+    """Provider that forwards to another provider and appends each exchange to a cassette file."""
+
+    def __init__(self, inner: LLMProvider, cassette_path: str):
+        self.inner = inner
+        self.cassette_path = cassette_path
+        self._lock = asyncio.Lock()
+        directory = os.path.dirname(cassette_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        started = time.perf_counter()
+        content = await self.inner.complete(operation, messages, model, temperature, max_tokens)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        entry = {
+            "key": request_key(operation, model, messages),
+            "operation": operation,
+            "request": {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            },
+            "response": content,
+            "latency_ms": round(latency_ms, 2)
+        }
+        # One append at a time, off the event loop
+        async with self._lock:
+            await asyncio.to_thread(self._append, json.dumps(entry, ensure_ascii=False) + "\n")
+        return content
+
+    def _append(self, line: str):
+        with open(self.cassette_path, "a", encoding="utf-8") as cassette:
+            cassette.write(line)
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Provider that serves responses from a cassette file.
+
+    Exact request matches are served in recording order. In non-strict mode a
+    request without an exact match receives a recorded response of the same
+    operation, picked deterministically from the request key, so new CVs can be
+    replayed against a small cassette.
+    """
+
+    def __init__(self, cassette_path: str, strict: bool = False, latency_scale: float = 0.0):
+        self.strict = strict
+        self.latency_scale = latency_scale
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_operation: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._load(cassette_path)
+
+    def _load(self, cassette_path: str):
+        """Load cassette entries into lookup tables."""
+        if not os.path.exists(cassette_path):
+            raise FileNotFoundError(f"Cassette not found: {cassette_path}")
+        count = 0
+        with open(cassette_path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key.setdefault(entry["key"], []).append(entry)
+                self._by_operation.setdefault(entry["operation"], []).append(entry)
+                count += 1
+        logger.info(f"Loaded {count} cassette entries from {cassette_path}")
+
+    def _lookup(self, operation: str, key: str) -> Dict[str, Any]:
+        """Find the entry to replay for a request."""
+        entries = self._by_key.get(key)
+        if entries:
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return entries[cursor % len(entries)]
+
+        if self.strict:
+            raise CassetteMissError(f"No recorded response for {operation} request {key[:12]}")
+
+        candidates = self._by_operation.get(operation)
+        if not candidates:
+            raise CassetteMissError(f"Cassette has no entries for operation: {operation}")
+        return candidates[int(key[:8], 16) % len(candidates)]
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        entry = self._lookup(operation, request_key(operation, model, messages))
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry.get("latency_ms", 0) * self.latency_scale / 1000)
+        return entry["response"]
+
+
+class SyntheticProvider(LLMProvider):
+    """
+    Provider that fabricates plausible responses with injected latency and failures.
+
+    Failures are drawn per request: ``error_rate`` raises a generic provider
+    error, and ``rate_limit_burst_rate`` starts a burst during which the next
+    ``rate_limit_burst_length`` requests are rejected with a 429.
+    """
+
+    SKILLS = [
+        "Python", "SQL", "FastAPI", "Docker", "Kubernetes", "AWS", "React",
+        "TypeScript", "Machine Learning", "PostgreSQL", "Go", "Communication"
+    ]
+
+    def __init__(
+        self,
+        latency: LatencyModel,
+        error_rate: float = 0.0,
+        rate_limit_burst_rate: float = 0.0,
+        rate_limit_burst_length: int = 10,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_burst_rate = rate_limit_burst_rate
+        self.rate_limit_burst_length = rate_limit_burst_length
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._burst_remaining = 0
+
+    def _maybe_fail(self):
+        """Raise an injected failure according to the configured rates."""
+        if self._burst_remaining == 0 and self._random.random() < self.rate_limit_burst_rate:
+            self._burst_remaining = self.rate_limit_burst_length
+        if self._burst_remaining > 0:
+            self._burst_remaining -= 1
+            raise LLMRateLimitError("Synthetic rate limit (429)", self.retry_after)
+        if self._random.random() < self.error_rate:
+            raise LLMProviderError("Synthetic provider error")
+
+    def _respond(self, operation: str, key: str) -> Dict[str, Any]:
+        """Build a deterministic response body for the request."""
+        rng = random.Random(key)
+        if operation == "score_candidate":
+            scores = {
+                "skill_fit": round(rng.uniform(30, 100), 1),
+                "experience_fit": round(rng.uniform(30, 100), 1),
+                "education_fit": round(rng.uniform(30, 100), 1),
+                "keyword_match": round(rng.uniform(30, 100), 1)
+            }
+            scores["overall_score"] = round(
+                scores["skill_fit"] * 0.4 + scores["experience_fit"] * 0.3
+                + scores["education_fit"] * 0.15 + scores["keyword_match"] * 0.15,
+                1
+            )
+            return scores
+
+        suffix = key[:8]
+        return {
+            "name": f"Synthetic Candidate {suffix}",
+            "email": f"candidate_{suffix}@example.com",
+            "phone": f"+1555{int(key[8:16], 16) % 10_000_000:07d}",
+            "linkedin": f"https://www.linkedin.com/in/candidate-{suffix}",
+            "skills": rng.sample(self.SKILLS, rng.randint(3, 8)),
+            "experience_years": rng.randint(0, 20),
+            "education": rng.choice(["BSc Computer Science", "MSc Data Science", "MBA", None])
+        }
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        await self.latency.sleep()
+        self._maybe_fail()
+        return json.dumps(self._respond(operation, request_key(operation, model, messages)))
+
+
+class TracingProvider(LLMProvider):
+    """Provider wrapper recording each completion as an ``llm.complete`` span."""
+
+    def __init__(self, inner: LLMProvider):
+        self.inner = inner
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        with tracer.start_as_current_span("llm.complete", attributes={
+            "llm.operation": operation,
+            "llm.model": model,
+            "llm.max_tokens": max_tokens,
+            "llm.prompt_chars": sum(len(message["content"]) for message in messages)
+        }) as span:
+            content = await self.inner.complete(operation, messages, model, temperature, max_tokens)
+            span.set_attribute("llm.completion_chars", len(content))
+            return content
+
+
+class AdmissionTrackingProvider(LLMProvider):
+    """Provider wrapper reporting in-flight calls, latencies and rate limits to the admission controller."""
+
+    def __init__(self, inner: LLMProvider):
+        self.inner = inner
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        async with admission_controller.llm_call(operation):
+            try:
+                return await self.inner.complete(operation, messages, model, temperature, max_tokens)
+            except LLMRateLimitError as e:
+                admission_controller.rate_limited(e.retry_after)
+                raise
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Provider wrapper adding a timeout, hedged requests and circuit breaking.
+    
+    A call still running after its operation's recent p95 latency gets a
+    second, identical attempt; whichever succeeds first is returned and the
+    other is cancelled. Timeouts and provider errors (not rate limits) are
+    recorded in the LLM circuit breaker, and calls are refused while it is open.
+    """
+
+    def __init__(self, inner: LLMProvider):
+        self.inner = inner
+
+    async def complete(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        call = llm_circuit_breaker.allow()
+        if call is None:
+            raise LLMCircuitOpenError(f"LLM circuit open, retry in {llm_circuit_breaker.retry_after():.0f}s")
+        try:
+            async with asyncio.timeout(settings.llm_timeout_seconds or None):
+                content = await self._hedged(operation, messages, model, temperature, max_tokens)
+        except TimeoutError:
+            llm_circuit_breaker.record_failure(call)
+            raise LLMTimeoutError(f"{operation} timed out after {settings.llm_timeout_seconds:g}s") from None
+        except LLMRateLimitError:
+            llm_circuit_breaker.release(call)
+            raise
+        except asyncio.CancelledError:
+            llm_circuit_breaker.release(call)
+            raise
+        except Exception:
+            llm_circuit_breaker.record_failure(call)
+            raise
+        llm_circuit_breaker.record_success(call)
+        return content
+
+    async def _hedged(
+        self,
+        operation: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Run the call, adding a second attempt once it outlasts the hedge delay."""
+        delay = admission_controller.hedge_delay(operation)
+        if delay is None:
+            return await self.inner.complete(operation, messages, model, temperature, max_tokens)
+        
+        attempts = [asyncio.ensure_future(self.inner.complete(operation, messages, model, temperature, max_tokens))]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                admission_controller.hedged("sent")
+                trace.get_current_span().add_event("llm.hedge", {"llm.hedge_delay_seconds": round(delay, 3)})
+                attempts.append(asyncio.ensure_future(
+                    self.inner.complete(operation, messages, model, temperature, max_tokens)
+                ))
+            
+            # First success wins; an attempt failing only matters if the other fails too
+            pending = set(attempts)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if len(attempts) > 1:
+                            admission_controller.hedged("won_by_hedge" if attempt is attempts[1] else "won_by_first")
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+
+
+def create_llm_provider(mode: Optional[str] = None) -> LLMProvider:
+    """Create the LLM provider for the configured mode (openai, record, replay, synthetic)."""
+    mode = mode or settings.llm_provider_mode
+    if mode == "openai":
+        return OpenAIProvider()
+    if mode == "record":
+        return RecordingProvider(OpenAIProvider(), settings.llm_cassette_path)
+    if mode == "replay":
+        return ReplayProvider(
+            settings.llm_cassette_path,
+            strict=settings.llm_replay_strict,
+            latency_scale=settings.llm_replay_latency_scale
+        )
+    if mode == "synthetic":
+        return SyntheticProvider(
+            LatencyModel(
+                settings.synthetic_latency_distribution,
+                settings.synthetic_llm_latency_ms,
+                settings.synthetic_llm_latency_stddev_ms,
+                seed=settings.synthetic_seed
+            ),
+            error_rate=settings.synthetic_llm_error_rate,
+            rate_limit_burst_rate=settings.synthetic_llm_rate_limit_burst_rate,
+            rate_limit_burst_length=settings.synthetic_llm_rate_limit_burst_length,
+            seed=settings.synthetic_seed
+        )
+    raise ValueError(f"Unsupported LLM provider mode: {mode}")
+
+
+@lru_cache(maxsize=1)
+def get_llm_provider() -> LLMProvider:
+    """Return the process-wide LLM provider."""
+    provider = create_llm_provider()
+    logger.info(f"Using LLM provider: {type(provider).__name__}")
+    return ResilientProvider(AdmissionTrackingProvider(TracingProvider(provider)))
@@ -0,0 +1,295 @@
+"""Versioned re-parsing of stored CVs, online or through offline batches."""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import JSON, DateTime, Float, String, bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Candidate
+from app.services.ai_parser import PARSER_VERSION, AIParserService
+from app.services.batch_llm import BatchSubmitter
+from app.services.cv_text import cv_text_store
+
+logger = logging.getLogger(__name__)
+
+# Parsed fields refreshed by a re-parse; name, email, phone and LinkedIn keep
+# what the applicant entered
+REPARSE_FIELDS = ("skills", "experience_years", "education")
+
+_candidates = Candidate.__table__
+
+# Executed once per batch with one parameter set per candidate; rows already
+# at the target version (a re-run after a crash) are left alone
+UPDATE_PARSED = (
+    update(_candidates)
+    .where(_candidates.c.id == bindparam("candidate_id"))
+    .where(_candidates.c.parser_version.is_distinct_from(bindparam("version", type_=String)))
+    .values(
+        skills=bindparam("new_skills", type_=JSON),
+        experience_years=bindparam("new_experience_years", type_=Float),
+        education=bindparam("new_education", type_=String),
+        parser_version=bindparam("version", type_=String),
+        updated_at=bindparam("now", type_=DateTime)
+    )
+)
+
+
+@dataclass
+class ReparseSummary:
+    """Counts of one re-parse run."""
+    processed: int = 0
+    updated: int = 0
+    failed: int = 0
+    cached_text: int = 0
+    submitted: int = 0
+
+
+class CandidateReparseService:
+    """
+    Re-parses candidates whose fields come from an older PARSER_VERSION.
+
+    Candidates are walked in keyset batches (by id) and only those whose
+    ``parser_version`` differs from the current one are selected, so a run
+    that stops part-way resumes where it left off and re-running is cheap.
+    CV text comes from the text cache or is extracted again from storage.
+
+    Online mode calls the LLM directly. Batch mode submits each keyset batch
+    through a BatchSubmitter and ingests results as they arrive; its progress
+    (cursor and pending batches) is kept in ``REPARSE_BATCH_DIR/state.json``.
+    """
+
+    def __init__(self, parser: Optional[AIParserService] = None):
+        self.parser = parser or AIParserService()
+
+    async def _outdated(self, db: AsyncSession, after: Optional[UUID], limit: int) -> List[Any]:
+        query = (
+            select(Candidate.id, Candidate.resume_url)
+            .where(Candidate.parser_version.is_distinct_from(PARSER_VERSION))
+            .order_by(Candidate.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(Candidate.id > after)
+        return (await db.execute(query)).all()
+
+    async def _prepare(
+        self,
+        row: Any,
+        summary: ReparseSummary
+    ) -> Optional[Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]]:
+        """Load a candidate's CV text and split it into local fields and an LLM request (None if unreadable)."""
+        try:
+            cv_text, cached = await cv_text_store.get(row.resume_url)
+        except Exception as e:
+            logger.warning(f"Skipping candidate {row.id}, CV unreadable: {e}")
+            summary.failed += 1
+            return None
+        summary.cached_text += cached
+        return self.parser.build_parse_request(cv_text, REPARSE_FIELDS)
+
+    @staticmethod
+    def _params(candidate_id: UUID, parsed_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        return {
+            "candidate_id": candidate_id,
+            "new_skills": parsed_data.get("skills") or [],
+            "new_experience_years": parsed_data.get("experience_years"),
+            "new_education": parsed_data.get("education"),
+            "version": PARSER_VERSION,
+            "now": now
+        }
+
+    async def reparse(
+        self,
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> ReparseSummary:
+        """
+        Re-parse outdated candidates with direct LLM calls, committing per batch.
+
+        Args:
+            db: Database session
+            batch_size: Candidates per keyset batch
+            limit: Stop after this many candidates
+
+        Returns:
+            Counts of processed, updated and failed candidates
+        """
+        batch_size = batch_size or settings.reparse_batch_size
+        semaphore = asyncio.Semaphore(settings.reparse_concurrency)
+        summary = ReparseSummary()
+        after: Optional[UUID] = None
+
+        async def parse(row: Any) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                prepared = await self._prepare(row, summary)
+                if prepared is None:
+                    return None
+                local_fields, missing_fields, request = prepared
+                if request is None:
+                    return local_fields
+                try:
+                    response_text = await self.parser.provider.complete(operation="parse_cv", **request)
+                    return self.parser.read_parse_response(response_text, local_fields, missing_fields)
+                except Exception as e:
+                    logger.warning(f"Re-parsing candidate {row.id} failed: {e}")
+                    summary.failed += 1
+                    return None
+
+        while limit is None or summary.processed < limit:
+            rows = await self._outdated(db, after, min(batch_size, limit - summary.processed) if limit else batch_size)
+            if not rows:
+                break
+            results = await asyncio.gather(*(parse(row) for row in rows))
+            now = datetime.utcnow()
+            params = [self._params(row.id, parsed, now) for row, parsed in zip(rows, results) if parsed is not None]
+            if params:
+                await db.execute(UPDATE_PARSED, params)
+            await db.commit()
+            summary.processed += len(rows)
+            summary.updated += len(params)
+            after = rows[-1].id
+            logger.info(f"Re-parsed {summary.updated}/{summary.processed} candidate(s) to parser {PARSER_VERSION}")
+        return summary
+
+    # Batch mode
+
+    @staticmethod
+    def _state_path() -> Path:
+        return Path(settings.reparse_batch_dir) / "state.json"
+
+    def load_state(self) -> Dict[str, Any]:
+        """Batch-mode progress; starts over when the parser version changed since the last run."""
+        path = self._state_path()
+        if path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("parser_version") == PARSER_VERSION:
+                return state
+            logger.info(f"Parser version changed ({state.get('parser_version')} -> {PARSER_VERSION}), starting over")
+        return {"parser_version": PARSER_VERSION, "cursor": None, "exhausted": False, "next_batch": 0, "pending": []}
+
+    def _save_state(self, state: Dict[str, Any]):
+        path = self._state_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".partial")
+        partial.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(partial, path)
+
+    @staticmethod
+    def _batch_fields_path(batch_id: str) -> Path:
+        return Path(settings.reparse_batch_dir) / f"{batch_id}.fields.json"
+
+    async def submit_batches(
+        self,
+        db: AsyncSession,
+        submitter: BatchSubmitter,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> ReparseSummary:
+        """
+        Submit outdated candidates as LLM batches, one per keyset batch.
+
+        Candidates whose fields are all extracted locally are updated right
+        away. Once the walk reaches the end and no batch is pending, the next
+        call starts again from the first id to pick up candidates whose
+        results failed.
+
+        Returns:
+            Counts of processed candidates, requests submitted and local updates
+        """
+        batch_size = batch_size or settings.reparse_batch_size
+        state = self.load_state()
+        if state["exhausted"]:
+            if state["pending"]:
+                logger.info(f"All outdated candidates submitted, {len(state['pending'])} batch(es) pending")
+                return ReparseSummary()
+            state.update(cursor=None, exhausted=False)
+        summary = ReparseSummary()
+
+        while limit is None or summary.processed < limit:
+            after = UUID(state["cursor"]) if state["cursor"] else None
+            rows = await self._outdated(db, after, min(batch_size, limit - summary.processed) if limit else batch_size)
+            if not rows:
+                state["exhausted"] = True
+                break
+            batch_id = f"reparse-{state['next_batch']:06d}"
+            requests: Dict[str, Dict[str, Any]] = {}
+            batch_fields: Dict[str, Dict[str, Any]] = {}
+            params = []
+            now = datetime.utcnow()
+            for row in rows:
+                prepared = await self._prepare(row, summary)
+                if prepared is None:
+                    continue
+                local_fields, missing_fields, request = prepared
+                if request is None:
+                    params.append(self._params(row.id, local_fields, now))
+                    continue
+                requests[str(row.id)] = request
+                batch_fields[str(row.id)] = {"local": local_fields, "missing": missing_fields}
+            if params:
+                await db.execute(UPDATE_PARSED, params)
+                await db.commit()
+            if requests:
+                # Fields first: a batch is only recorded as pending once it can be ingested
+                self._batch_fields_path(batch_id).write_text(json.dumps(batch_fields), encoding="utf-8")
+                await submitter.submit(batch_id, requests)
+                state["pending"].append(batch_id)
+            state["next_batch"] += 1
+            state["cursor"] = str(rows[-1].id)
+            self._save_state(state)
+            summary.processed += len(rows)
+            summary.updated += len(params)
+            summary.submitted += len(requests)
+            logger.info(f"Batch {batch_id}: {len(requests)} request(s) submitted, {len(params)} parsed locally")
+
+        self._save_state(state)
+        return summary
+
+    async def ingest_batches(self, db: AsyncSession, submitter: BatchSubmitter) -> ReparseSummary:
+        """
+        Apply the results of pending batches that have completed, one transaction per batch.
+
+        Returns:
+            Counts of candidates updated and failed requests
+        """
+        state = self.load_state()
+        summary = ReparseSummary()
+        for batch_id in list(state["pending"]):
+            results = await submitter.results(batch_id)
+            if results is None:
+                continue
+            batch_fields = json.loads(self._batch_fields_path(batch_id).read_text(encoding="utf-8"))
+            params = []
+            now = datetime.utcnow()
+            for custom_id, fields in batch_fields.items():
+                response_text = results.get(custom_id)
+                if response_text is None:
+                    summary.failed += 1
+                    continue
+                try:
+                    parsed = self.parser.read_parse_response(response_text, fields["local"], fields["missing"])
+                except ValueError as e:
+                    logger.warning(f"Batch {batch_id}: unusable result for candidate {custom_id}: {e}")
+                    summary.failed += 1
+                    continue
+                params.append(self._params(UUID(custom_id), parsed, now))
+            if params:
+                await db.execute(UPDATE_PARSED, params)
+            await db.commit()
+            state["pending"].remove(batch_id)
+            self._save_state(state)
+            summary.processed += len(batch_fields)
+            summary.updated += len(params)
+            logger.info(f"Ingested batch {batch_id}: {len(params)}/{len(batch_fields)} candidate(s) updated")
+        return summary
+
+
+# Singleton instance
+candidate_reparse_service = CandidateReparseService()
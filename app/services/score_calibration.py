@@ -0,0 +1,340 @@
+"""Vectorized calibration and percentile ranking of applicant scores within a job."""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import numpy as np
+from sqlalchemy import Float, Integer, String, bindparam, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import write_session
+from app.models import Application, Job, JobStats
+from app.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+CRITERIA = ["skill_fit", "experience_fit", "education_fit", "keyword_match"]
+
+# One row per scored application of the job, criteria in CRITERIA order (oldest first: ties rank by age)
+SCORE_MATRIX_SQL = text("""
+SELECT id,
+       (scores->>'skill_fit')::FLOAT,
+       (scores->>'experience_fit')::FLOAT,
+       (scores->>'education_fit')::FLOAT,
+       (scores->>'keyword_match')::FLOAT
+FROM applications
+WHERE job_id = :job_id AND scores->>'overall_score' IS NOT NULL
+ORDER BY created_at
+""")
+
+BULK_UPDATE_SQL = text("""
+UPDATE applications
+SET calibrated_score = calibrated.calibrated_score,
+    score_percentile = calibrated.score_percentile,
+    job_rank = calibrated.job_rank
+FROM unnest(:ids, :calibrated_scores, :percentiles, :ranks)
+    AS calibrated(id, calibrated_score, score_percentile, job_rank)
+WHERE applications.id = calibrated.id
+""").bindparams(
+    bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+    bindparam("calibrated_scores", type_=ARRAY(Float)),
+    bindparam("percentiles", type_=ARRAY(Float)),
+    bindparam("ranks", type_=ARRAY(Integer))
+)
+
+
+# Re-derives ranks and percentiles of a job's calibrated applications from their stored composites
+# (same definitions as calibrate_matrix: rank 1 is best, percentile = share of others ranked below)
+RERANK_SQL = text("""
+UPDATE applications
+SET job_rank = ranked.job_rank,
+    score_percentile = ranked.score_percentile
+FROM (
+    SELECT id,
+           ROW_NUMBER() OVER (ORDER BY calibrated_score DESC, created_at) AS job_rank,
+           CASE WHEN COUNT(*) OVER () > 1
+                THEN (COUNT(*) OVER () - ROW_NUMBER() OVER (ORDER BY calibrated_score DESC, created_at))
+                     * 100.0 / (COUNT(*) OVER () - 1)
+                ELSE 100.0
+           END AS score_percentile
+    FROM applications
+    WHERE job_id = :job_id AND calibrated_score IS NOT NULL
+) AS ranked
+WHERE applications.id = ranked.id
+  AND (applications.job_rank IS DISTINCT FROM ranked.job_rank
+       OR applications.score_percentile IS DISTINCT FROM ranked.score_percentile)
+""")
+
+
+# Transaction-scoped advisory lock (namespace, job) serializing writes of a job's ranks across workers
+RANK_LOCK_NAMESPACE = 32
+TRY_LOCK_JOB_SQL = text(
+    "SELECT pg_try_advisory_xact_lock(:namespace, hashtext(:job_id))"
+).bindparams(bindparam("job_id", type_=String))
+LOCK_JOB_SQL = text(
+    "SELECT pg_advisory_xact_lock(:namespace, hashtext(:job_id))"
+).bindparams(bindparam("job_id", type_=String))
+
+
+def normalized_weights(weights: Dict[str, float]) -> np.ndarray:
+    """Weight vector in CRITERIA order, scaled to sum to 1."""
+    weight_vector = np.array([weights.get(criterion, 0.0) for criterion in CRITERIA], dtype=np.float64)
+    total_weight = weight_vector.sum()
+    if total_weight <= 0:
+        raise ValueError("Score weights must sum to a positive value")
+    return weight_vector / total_weight
+
+
+def weighted_overall(scores: Dict[str, float], weights: Optional[Dict[str, float]] = None) -> float:
+    """Combine raw 0-100 criterion scores into an overall score with the configured weights."""
+    weights = weights or settings.score_weights
+    total_weight = sum(weights.get(criterion, 0.0) for criterion in CRITERIA)
+    if total_weight <= 0:
+        raise ValueError("Score weights must sum to a positive value")
+    return round(sum(scores[criterion] * weights.get(criterion, 0.0) for criterion in CRITERIA) / total_weight, 1)
+
+
+def calibrate_matrix(matrix: np.ndarray, weights: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Calibrate a score matrix (rows: applications, columns: CRITERIA).
+
+    Args:
+        matrix: Raw criterion scores; NaN for missing values
+        weights: Weight per criterion
+
+    Returns:
+        Dictionary with per-criterion means/stds and per-row z-scores,
+        composite (calibrated) scores, percentiles and ranks
+
+    Raises:
+        ValueError: If the weights do not sum to a positive value
+    """
+    means = np.nanmean(matrix, axis=0)
+    stds = np.nanstd(matrix, axis=0)
+    safe_stds = np.where(stds > 0, stds, 1.0)
+    # Missing criteria count as average (z = 0) rather than dropping the applicant
+    z_scores = np.nan_to_num((matrix - means) / safe_stds, nan=0.0)
+
+    composite = z_scores @ normalized_weights(weights)
+
+    count = len(composite)
+    order = np.argsort(-composite, kind="stable")
+    ranks = np.empty(count, dtype=np.int64)
+    ranks[order] = np.arange(1, count + 1)
+    percentiles = (count - ranks) / (count - 1) * 100 if count > 1 else np.full(count, 100.0)
+
+    return {
+        "means": means,
+        "stds": stds,
+        "z_scores": z_scores,
+        "calibrated_scores": composite,
+        "percentiles": percentiles,
+        "ranks": ranks
+    }
+
+
+class ScoreCalibrationService:
+    """
+    Service for calibrating applicant scores across a job's pipeline.
+
+    Newly scored applications only get their own ``calibrated_score``, from
+    the job's stored calibration parameters. Ranks and percentiles of the job
+    are refreshed by a debounced pass per job (``CALIBRATION_RERANK_DELAY_SECONDS``
+    after the first new score), which also recalibrates the whole job when it
+    has outgrown its parameters. Rank writes of a job take an advisory lock, so
+    workers never run overlapping multi-row UPDATEs on the same job.
+    """
+
+    def __init__(self):
+        self._pending: Dict[UUID, int] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def calibrate_job(self, db: AsyncSession, job_id: UUID) -> Dict[str, Any]:
+        """
+        Recalibrate every scored application of a job.
+
+        Loads the job's score matrix in one query, computes per-criterion
+        z-scores, weighted composites, percentiles and ranks with NumPy, and
+        writes them back with one bulk UPDATE, holding the job's rank lock
+        until the transaction ends.
+
+        Args:
+            db: Database session (the caller commits)
+            job_id: Job to calibrate
+
+        Returns:
+            Summary of the calibration
+        """
+        started = time.perf_counter()
+        weights = dict(settings.score_weights)
+
+        await db.execute(LOCK_JOB_SQL, {"namespace": RANK_LOCK_NAMESPACE, "job_id": str(job_id)})
+        rows = (await db.execute(SCORE_MATRIX_SQL, {"job_id": job_id})).all()
+        ids = [row[0] for row in rows]
+        matrix = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(CRITERIA))
+
+        calibration = {
+            "weights": weights,
+            "count": len(ids),
+            "calibrated_at": datetime.utcnow().isoformat()
+        }
+        if ids:
+            result = calibrate_matrix(matrix, weights)
+            await db.execute(BULK_UPDATE_SQL, {
+                "ids": ids,
+                "calibrated_scores": result["calibrated_scores"].tolist(),
+                "percentiles": result["percentiles"].tolist(),
+                "ranks": result["ranks"].tolist()
+            })
+            calibration["means"] = dict(zip(CRITERIA, np.nan_to_num(result["means"]).tolist()))
+            calibration["stds"] = dict(zip(CRITERIA, np.nan_to_num(result["stds"]).tolist()))
+
+        await db.execute(update(Job).where(Job.id == job_id).values(score_calibration=calibration))
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Calibrated {len(ids)} application(s) for job {job_id} in {duration_ms:.0f} ms")
+        return {"job_id": job_id, "duration_ms": round(duration_ms, 1), **calibration}
+
+    async def rerank_job(self, db: AsyncSession, job_id: UUID) -> int:
+        """Refresh job_rank and score_percentile of a job's calibrated applications; returns rows changed."""
+        await db.execute(LOCK_JOB_SQL, {"namespace": RANK_LOCK_NAMESPACE, "job_id": str(job_id)})
+        result = await db.execute(RERANK_SQL, {"job_id": job_id})
+        return result.rowcount
+
+    @staticmethod
+    def needs_full_calibration(calibration: Optional[Dict[str, Any]], scored_count: int) -> bool:
+        """Whether a job's stored parameters are missing, use other weights or predate too much growth."""
+        return (
+            not calibration
+            or not calibration.get("count")
+            or calibration.get("weights") != settings.score_weights
+            or scored_count > calibration["count"] * (1 + settings.calibration_refresh_ratio)
+        )
+
+    async def _calibrate_score(self, db: AsyncSession, application_id: UUID) -> Optional[UUID]:
+        """
+        Store an application's calibrated score from its job's stored parameters (a single-row UPDATE).
+
+        Without stored parameters the score is left NULL for the job's refresh pass.
+
+        Returns:
+            The application's job id, or None if it has no scores
+        """
+        result = await db.execute(
+            select(Application.job_id, Application.scores, Job.score_calibration)
+            .join(Job, Job.id == Application.job_id)
+            .where(Application.id == application_id)
+        )
+        row = result.one_or_none()
+        if row is None or not row.scores or row.scores.get("overall_score") is None:
+            return None
+
+        calibration = row.score_calibration
+        if not calibration or not calibration.get("means"):
+            return row.job_id
+
+        vector = np.array([row.scores.get(criterion, np.nan) for criterion in CRITERIA], dtype=np.float64)
+        means = np.array([calibration["means"][criterion] for criterion in CRITERIA])
+        stds = np.array([calibration["stds"][criterion] for criterion in CRITERIA])
+        z_scores = np.nan_to_num((vector - means) / np.where(stds > 0, stds, 1.0), nan=0.0)
+        calibrated_score = float(z_scores @ normalized_weights(calibration["weights"]))
+
+        await db.execute(
+            update(Application)
+            .where(Application.id == application_id)
+            .values(calibrated_score=calibrated_score)
+        )
+        return row.job_id
+
+    @traced("calibrate_new_applications")
+    async def calibrate_new_applications(self, application_ids: List[UUID]):
+        """Background task: store calibrated scores of newly scored applications and schedule their jobs' refresh."""
+        job_ids: List[UUID] = []
+        try:
+            async with write_session() as db:
+                for application_id in application_ids:
+                    job_id = await self._calibrate_score(db, application_id)
+                    if job_id is not None and job_id not in job_ids:
+                        job_ids.append(job_id)
+        except Exception as e:
+            logger.error(f"Error calibrating applications {application_ids}: {e}")
+            return
+        self.schedule_refresh(job_ids)
+
+    # Debounced per-job refresh
+
+    def schedule_refresh(self, job_ids: List[UUID]):
+        """Refresh the jobs' ranks (or recalibrate them) after CALIBRATION_RERANK_DELAY_SECONDS."""
+        for job_id in job_ids:
+            self._pending.setdefault(job_id, 0)
+        if self._pending and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush_pending())
+
+    async def _flush_pending(self):
+        while self._pending:
+            await asyncio.sleep(settings.calibration_rerank_delay_seconds)
+            await self.flush()
+
+    async def flush(self):
+        """
+        Refresh every pending job now.
+
+        A job whose lock another worker holds stays pending (that worker's
+        pass may predate the new scores); a failed refresh is retried up to
+        CALIBRATION_RERANK_MAX_ATTEMPTS times.
+        """
+        pending, self._pending = self._pending, {}
+        for job_id, failures in pending.items():
+            try:
+                refreshed = await self.refresh_job(job_id)
+            except Exception as e:
+                failures += 1
+                if failures >= settings.calibration_rerank_max_attempts:
+                    logger.error(f"Giving up refreshing ranks of job {job_id} after {failures} failures: {e}")
+                    continue
+                logger.warning(f"Error refreshing ranks of job {job_id} (attempt {failures}), retrying: {e}")
+                refreshed = False
+            if not refreshed:
+                self._pending.setdefault(job_id, failures)
+
+    @traced("refresh_job_ranks")
+    async def refresh_job(self, job_id: UUID) -> bool:
+        """
+        Rerank a job (or recalibrate it when its parameters are stale) in its own transaction.
+
+        Returns:
+            False if another worker holds the job's rank lock
+        """
+        async with write_session() as db:
+            locked = await db.execute(TRY_LOCK_JOB_SQL, {"namespace": RANK_LOCK_NAMESPACE, "job_id": str(job_id)})
+            if not locked.scalar():
+                return False
+            result = await db.execute(
+                select(Job.score_calibration, JobStats.score_count)
+                .outerjoin(JobStats, JobStats.job_id == Job.id)
+                .where(Job.id == job_id)
+            )
+            row = result.one_or_none()
+            if row is None:
+                return True
+            if self.needs_full_calibration(row.score_calibration, row.score_count or 0):
+                await self.calibrate_job(db, job_id)
+            else:
+                await self.rerank_job(db, job_id)
+        return True
+
+    async def stop(self):
+        """Cancel the debounce timer and refresh the jobs still pending once (at shutdown)."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self._pending:
+            await self.flush()
+
+
+# Singleton instance
+score_calibration_service = ScoreCalibrationService()
@@ -0,0 +1,139 @@
+"""Set-based application status transitions (bulk and top-K shortlisting)."""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Application, Job
+from app.services.application_events import StatusChanges, application_event_broker
+from app.services.job_stats import JobStatsDelta, job_stats_service
+from app.utils.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Target status -> statuses an application may be moved from by a manual transition
+ALLOWED_TRANSITIONS: Dict[str, tuple] = {
+    "shortlisted": ("parsed", "scored"),
+    "rejected": ("applied", "parsed", "scored", "shortlisted", "failed"),
+    "scored": ("shortlisted",),
+}
+
+# How far an application has progressed; recruiter decisions rank above pipeline statuses
+STATUS_PROGRESS: Dict[str, int] = {
+    "failed": 0,
+    "applied": 1,
+    "parsed": 2,
+    "scored": 3,
+    "rejected": 4,
+    "shortlisted": 5,
+    "synced": 6,
+}
+
+
+@dataclass
+class TransitionResult:
+    """Outcome of a bulk transition."""
+    status: str
+    applications: List[Dict[str, Any]] = field(default_factory=list)
+    skipped_ids: List[UUID] = field(default_factory=list)
+
+
+class StatusTransitionService:
+    """Service for moving many applications to a new status in one statement."""
+
+    @traced("status_transition")
+    async def transition(
+        self,
+        db: AsyncSession,
+        status: str,
+        application_ids: Optional[Sequence[UUID]] = None,
+        job_id: Optional[UUID] = None,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None
+    ) -> TransitionResult:
+        """
+        Move the selected applications to ``status`` with one UPDATE ... RETURNING.
+
+        Applications are selected by id or by job; a job selection can be limited
+        to the ``top_k`` highest overall scores at or above ``min_score``. Only
+        non-archived applications whose current status may move to ``status``
+        (ALLOWED_TRANSITIONS) are updated; the rest are left untouched. Job stats
+        and status events are recorded in the same transaction (the caller commits).
+
+        Args:
+            db: Database session
+            status: Target status
+            application_ids: Explicit applications to move
+            job_id: Move applications of this job instead
+            top_k: Only the K best-scored eligible applications of the job
+            min_score: Only applications with overall_score at or above this
+
+        Returns:
+            Updated rows (application columns plus ``old_status``) and requested ids left unchanged
+
+        Raises:
+            ValueError: If the target status or selection is invalid
+        """
+        if status not in ALLOWED_TRANSITIONS:
+            raise ValueError(f"Status must be one of: {', '.join(ALLOWED_TRANSITIONS)}")
+        if (application_ids is None) == (job_id is None):
+            raise ValueError("Select applications by application_ids or by job_id")
+        if application_ids is not None and (top_k is not None or min_score is not None):
+            raise ValueError("top_k and min_score only apply to a job selection")
+
+        overall_score = Application.scores["overall_score"].as_float()
+        selected = select(
+            Application.id, Application.created_at, Application.archived, Application.status
+        ).where(
+            Application.archived.is_(False),
+            Application.status.in_(ALLOWED_TRANSITIONS[status])
+        )
+        if application_ids is not None:
+            selected = selected.where(Application.id.in_(application_ids))
+        else:
+            # Applications cannot predate their job, so older partitions are pruned
+            job_created_at = select(Job.created_at).where(Job.id == job_id).scalar_subquery()
+            selected = selected.where(Application.job_id == job_id, Application.created_at >= job_created_at)
+            if min_score is not None:
+                selected = selected.where(overall_score >= min_score)
+            if top_k is not None:
+                selected = selected.where(overall_score.is_not(None)).order_by(
+                    overall_score.desc(), Application.created_at
+                ).limit(top_k)
+        selected = selected.cte("selected")
+
+        table = Application.__table__
+        # Matching the selected status skips rows another transaction moved in the meantime
+        statement = (
+            update(table)
+            .where(and_(
+                table.c.id == selected.c.id,
+                table.c.created_at == selected.c.created_at,
+                table.c.archived == selected.c.archived,
+                table.c.status == selected.c.status
+            ))
+            .values(status=status, updated_at=datetime.utcnow())
+            .returning(*table.c, selected.c.status.label("old_status"))
+        )
+        rows = [dict(row._mapping) for row in (await db.execute(statement)).all()]
+
+        stats_delta = JobStatsDelta()
+        status_changes = StatusChanges()
+        for row in rows:
+            stats_delta.changed(row["job_id"], row["old_status"], status, row["scores"], row["scores"])
+            status_changes.changed(row["id"], row["job_id"], row["old_status"], status)
+        await job_stats_service.apply(db, stats_delta)
+        await application_event_broker.record(db, status_changes)
+
+        updated_ids = {row["id"] for row in rows}
+        skipped_ids = [application_id for application_id in application_ids or () if application_id not in updated_ids]
+        # RETURNING order is unspecified: best scores first
+        rows.sort(key=lambda row: (row["scores"] or {}).get("overall_score") or 0.0, reverse=True)
+        logger.info(f"Moved {len(rows)} applications to {status} ({len(skipped_ids)} skipped)")
+        return TransitionResult(status=status, applications=rows, skipped_ids=skipped_ids)
+
+
+# Singleton instance
+status_transition_service = StatusTransitionService()
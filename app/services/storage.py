@@ -1,27 +1,73 @@
 """MinIO storage service."""
+import asyncio
 import io
+import itertools
 import logging
-from typing import BinaryIO
+from datetime import datetime, timedelta
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
 from minio import Minio
 from minio.error import S3Error
+from opentelemetry import trace
 from app.config import settings
+from app.services.synthetic_storage import get_synthetic_object_store
+from app.utils.tracing import traced, tracer
 
 logger = logging.getLogger(__name__)
 
+# Content types of CV files, served for their gzip-compressed (archived) copies
+CV_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
 
 class StorageService:
     """Service for handling file storage with MinIO."""
     
-    def __init__(self):
-        """Initialize MinIO client."""
-        self.client = Minio(
+    def __init__(self, client: Optional[Minio] = None, signing_client: Optional[Minio] = None):
+        """Initialize MinIO client (or the configured stand-in) and the client that presigns URLs."""
+        self.client = client or self._create_client()
+        self.signing_client = signing_client or (self.client if client else self._create_signing_client())
+        self.bucket_name = settings.minio_bucket
+        self._ensure_bucket_exists()
+    
+    @staticmethod
+    def _create_client():
+        """Create the object storage client for the configured storage mode."""
+        if settings.storage_mode == "synthetic":
+            return get_synthetic_object_store()
+        return Minio(
             settings.minio_endpoint,
             access_key=settings.minio_access_key,
             secret_key=settings.minio_secret_key,
             secure=settings.minio_secure
         )
-        self.bucket_name = settings.minio_bucket
-        self._ensure_bucket_exists()
+    
+    @staticmethod
+    def _create_signing_client():
+        """
+        Create the client used to presign URLs.
+        
+        Signatures cover the host, so URLs are signed for the endpoint clients
+        reach (MINIO_PUBLIC_ENDPOINT) rather than the internal one; the region is
+        fixed so presigning never makes a network call.
+        """
+        if settings.storage_mode == "synthetic":
+            return get_synthetic_object_store()
+        secure = settings.minio_public_secure if settings.minio_public_secure is not None else settings.minio_secure
+        return Minio(
+            settings.minio_public_endpoint or settings.minio_endpoint,
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            secure=secure,
+            region=settings.minio_region
+        )
+    
+    def reset_connections(self):
+        """Close pooled HTTP connections (e.g. inherited across fork)."""
+        http = getattr(self.client, "_http", None)
+        if http is not None:
+            http.clear()
     
     def _ensure_bucket_exists(self):
         """Ensure the bucket exists, create if not."""
@@ -33,6 +79,7 @@ class StorageService:
             logger.error(f"Error ensuring bucket exists: {e}")
             raise
     
+    @traced("storage.upload_file")
     async def upload_file(self, file_content: bytes, object_name: str, content_type: str = "application/octet-stream") -> str:
         """
         Upload a file to MinIO.
@@ -48,8 +95,13 @@ class StorageService:
         try:
             file_stream = io.BytesIO(file_content)
             file_size = len(file_content)
+            trace.get_current_span().set_attributes({
+                "storage.bucket": self.bucket_name, "storage.object": object_name, "storage.bytes": file_size
+            })
             
-            self.client.put_object(
+            # In a thread so the request can be cancelled (e.g. client disconnect) without blocking the loop
+            await asyncio.to_thread(
+                self.client.put_object,
                 self.bucket_name,
                 object_name,
                 file_stream,
@@ -57,8 +109,7 @@ class StorageService:
                 content_type=content_type
             )
             
-            # Generate URL
-            url = f"http://{settings.minio_endpoint}/{self.bucket_name}/{object_name}"
+            url = self.object_url(object_name)
             logger.info(f"Uploaded file: {object_name}")
             return url
             
@@ -66,6 +117,87 @@ class StorageService:
             logger.error(f"Error uploading file: {e}")
             raise
     
+    def object_url(self, object_name: str) -> str:
+        """Return the stored (unsigned) URL of an object, as kept in candidates.resume_url."""
+        return f"http://{settings.minio_endpoint}/{self.bucket_name}/{object_name}"
+    
+    def object_name_from_url(self, url: str) -> str:
+        """Return the object name of a URL produced by ``upload_file``."""
+        prefix = f"/{self.bucket_name}/"
+        return url.split(prefix, 1)[1] if prefix in url else url
+    
+    def presigned_upload_url(self, object_name: str) -> str:
+        """
+        Presign a PUT URL through which a client uploads an object directly.
+        
+        Args:
+            object_name: Name the object will have in storage
+            
+        Returns:
+            URL valid for STORAGE_UPLOAD_EXPIRY_SECONDS
+        """
+        return self.signing_client.presigned_put_object(
+            self.bucket_name,
+            object_name,
+            expires=timedelta(seconds=settings.storage_upload_expiry_seconds)
+        )
+    
+    def presigned_download_url(self, url: str) -> str:
+        """
+        Presign a short-lived GET URL for a stored object.
+        
+        Args:
+            url: Stored URL (or object name) of the object
+            
+        Gzip-compressed objects (CVs moved to the cold prefix by archival) are
+        presigned with response header overrides, so clients receive the
+        original file type and name with ``Content-Encoding: gzip`` and
+        decompress it transparently.
+        
+        Returns:
+            URL valid for STORAGE_DOWNLOAD_EXPIRY_SECONDS
+        """
+        object_name = self.object_name_from_url(url)
+        response_headers = None
+        if object_name.endswith(".gz"):
+            filename = object_name[:-len(".gz")].rsplit("/", 1)[-1]
+            response_headers = {
+                "response-content-type": CV_CONTENT_TYPES.get(
+                    filename.rsplit(".", 1)[-1].lower(), "application/octet-stream"
+                ),
+                "response-content-encoding": "gzip",
+                "response-content-disposition": f'inline; filename="{filename}"'
+            }
+        return self.signing_client.presigned_get_object(
+            self.bucket_name,
+            object_name,
+            expires=timedelta(seconds=settings.storage_download_expiry_seconds),
+            response_headers=response_headers
+        )
+    
+    @traced("storage.stat_file")
+    async def stat_file(self, object_name: str) -> Optional[Tuple[int, Optional[str]]]:
+        """
+        Look up an object's size and content type.
+        
+        Args:
+            object_name: Name of the object in storage
+            
+        Returns:
+            Tuple of size in bytes and content type, or None if the object does not exist
+        """
+        trace.get_current_span().set_attributes({"storage.bucket": self.bucket_name, "storage.object": object_name})
+        try:
+            stat = self.client.stat_object(self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            logger.error(f"Error reading file metadata: {e}")
+            raise
+        trace.get_current_span().set_attribute("storage.bytes", stat.size)
+        return stat.size, stat.content_type
+    
+    @traced("storage.download_file")
     async def download_file(self, object_name: str) -> bytes:
         """
         Download a file from MinIO.
@@ -77,16 +209,48 @@ class StorageService:
             File content as bytes
         """
         try:
-            response = self.client.get_object(self.bucket_name, object_name)
-            content = response.read()
-            response.close()
-            response.release_conn()
+            content = await asyncio.to_thread(self._read_object, object_name)
+            trace.get_current_span().set_attributes({
+                "storage.bucket": self.bucket_name, "storage.object": object_name, "storage.bytes": len(content)
+            })
             return content
             
         except S3Error as e:
             logger.error(f"Error downloading file: {e}")
             raise
     
+    def _read_object(self, object_name: str) -> bytes:
+        response = self.client.get_object(self.bucket_name, object_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+    
+    async def list_files(self, prefix: str, batch_size: int = 1000) -> AsyncIterator[List[Tuple[str, datetime]]]:
+        """
+        List objects under a prefix lazily, one batch at a time.
+        
+        The listing is paged as the batches are consumed, so a large prefix is
+        never held in memory at once.
+        
+        Args:
+            prefix: Object name prefix, e.g. "resumes/"
+            batch_size: Objects per yielded batch
+            
+        Yields:
+            (object name, last modified time in UTC) per object
+        """
+        objects = self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True)
+        while True:
+            with tracer.start_as_current_span("storage.list_files") as span:
+                batch = await asyncio.to_thread(lambda: list(itertools.islice(objects, batch_size)))
+                span.set_attributes({"storage.prefix": prefix, "storage.objects": len(batch)})
+            if not batch:
+                return
+            yield [(item.object_name, item.last_modified) for item in batch]
+    
+    @traced("storage.delete_file")
     async def delete_file(self, object_name: str) -> bool:
         """
         Delete a file from MinIO.
@@ -98,6 +262,7 @@ class StorageService:
             True if successful
         """
         try:
+            trace.get_current_span().set_attributes({"storage.bucket": self.bucket_name, "storage.object": object_name})
             self.client.remove_object(self.bucket_name, object_name)
             logger.info(f"Deleted file: {object_name}")
             return True
@@ -1,8 +1,12 @@
 """SuccessFactors integration service (Mock implementation)."""
+import json
 import logging
 from typing import Dict, Any, List
 from uuid import UUID
 from datetime import datetime
+from opentelemetry import trace
+from app.utils.structured_logging import truncate_payload
+from app.utils.tracing import trace_headers, traced
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +14,7 @@ logger = logging.getLogger(__name__)
 class SuccessFactorsService:
     """Service for integrating with SAP SuccessFactors (Mock)."""
     
+    @traced("sync_applications")
     async def sync_applications(self, applications: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Sync applications to SuccessFactors.
@@ -48,8 +53,19 @@ class SuccessFactorsService:
                 }
                 payload["applications"].append(sf_application)
             
-            # Log the mock payload
-            logger.info(f"Mock SuccessFactors sync payload: {payload}")
+            # Headers the real API call would send (W3C trace context continues the trace)
+            headers = {"Content-Type": "application/json", **trace_headers()}
+            payload_json = json.dumps(payload, default=str)
+            trace.get_current_span().set_attributes({
+                "sync.applications": len(applications),
+                "sync.payload_bytes": len(payload_json)
+            })
+            
+            # Log the mock payload (in full only at DEBUG, and cut to LOG_MAX_MESSAGE_CHARS)
+            logger.info(f"Mock SuccessFactors sync: {len(applications)} application(s), {len(payload_json)} bytes")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Mock SuccessFactors sync headers: {headers}")
+                logger.debug(f"Mock SuccessFactors sync payload: {truncate_payload(payload_json)}")
             
             # Simulate successful sync
             result = {
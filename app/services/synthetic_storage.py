@@ -0,0 +1,135 @@
+"""In-memory stand-in for the MinIO client with latency and failure injection."""
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+from minio.error import S3Error
+from app.config import settings
+from app.utils.latency import LatencyModel
+
+
+class _SyntheticObject:
+    """Response object mimicking the urllib3 response returned by ``Minio.get_object``."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class _SyntheticStat:
+    """Subset of the ``minio.datatypes.Object`` returned by ``Minio.stat_object``."""
+
+    def __init__(self, size: int, content_type: str = "application/octet-stream"):
+        self.size = size
+        self.content_type = content_type
+
+
+class _SyntheticListedObject:
+    """Subset of the ``minio.datatypes.Object`` yielded by ``Minio.list_objects``."""
+
+    def __init__(self, object_name: str, last_modified: datetime):
+        self.object_name = object_name
+        self.last_modified = last_modified
+
+
+class SyntheticObjectStore:
+    """
+    Drop-in replacement for the subset of ``minio.Minio`` used by StorageService.
+
+    Objects are kept in process memory. Every call blocks for a sampled latency,
+    like the real synchronous client, and fails with ``S3Error`` at ``error_rate``.
+    """
+
+    def __init__(self, latency: LatencyModel, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._buckets: Dict[str, Dict[str, bytes]] = {}
+        self._modified: Dict[Tuple[str, str], datetime] = {}
+        self._lock = threading.Lock()
+
+    def _simulate(self, operation: str, bucket_name: str, object_name: str = ""):
+        """Apply injected latency and failures to a call."""
+        self.latency.block()
+        if self._random.random() < self.error_rate:
+            raise S3Error(
+                "InternalError", f"Synthetic {operation} failure", object_name or bucket_name,
+                "synthetic", "synthetic", None, bucket_name=bucket_name, object_name=object_name
+            )
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return bucket_name in self._buckets
+
+    def make_bucket(self, bucket_name: str):
+        with self._lock:
+            self._buckets.setdefault(bucket_name, {})
+
+    def put_object(self, bucket_name: str, object_name: str, data: BinaryIO, length: int, content_type: str = "application/octet-stream"):
+        self._simulate("put_object", bucket_name, object_name)
+        with self._lock:
+            self._buckets.setdefault(bucket_name, {})[object_name] = data.read(length)
+            self._modified[(bucket_name, object_name)] = datetime.now(timezone.utc)
+
+    def _lookup(self, bucket_name: str, object_name: str) -> bytes:
+        try:
+            return self._buckets[bucket_name][object_name]
+        except KeyError:
+            raise S3Error(
+                "NoSuchKey", "Object does not exist", object_name,
+                "synthetic", "synthetic", None, bucket_name=bucket_name, object_name=object_name
+            )
+
+    def get_object(self, bucket_name: str, object_name: str) -> _SyntheticObject:
+        self._simulate("get_object", bucket_name, object_name)
+        return _SyntheticObject(self._lookup(bucket_name, object_name))
+
+    def stat_object(self, bucket_name: str, object_name: str) -> _SyntheticStat:
+        self._simulate("stat_object", bucket_name, object_name)
+        return _SyntheticStat(len(self._lookup(bucket_name, object_name)))
+
+    def presigned_put_object(self, bucket_name: str, object_name: str, expires: timedelta) -> str:
+        return f"synthetic://{bucket_name}/{object_name}?method=PUT&expires={int(expires.total_seconds())}"
+
+    def presigned_get_object(
+        self, bucket_name: str, object_name: str, expires: timedelta, response_headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        query = urlencode({"method": "GET", "expires": int(expires.total_seconds()), **(response_headers or {})})
+        return f"synthetic://{bucket_name}/{object_name}?{query}"
+
+    def list_objects(self, bucket_name: str, prefix: str = "", recursive: bool = False) -> Iterator[_SyntheticListedObject]:
+        self._simulate("list_objects", bucket_name, prefix)
+        with self._lock:
+            names = [name for name in self._buckets.get(bucket_name, {}) if name.startswith(prefix)]
+            listed = [_SyntheticListedObject(name, self._modified[(bucket_name, name)]) for name in sorted(names)]
+        return iter(listed)
+
+    def remove_object(self, bucket_name: str, object_name: str):
+        self._simulate("remove_object", bucket_name, object_name)
+        with self._lock:
+            self._buckets.get(bucket_name, {}).pop(object_name, None)
+            self._modified.pop((bucket_name, object_name), None)
+
+
+@lru_cache(maxsize=1)
+def get_synthetic_object_store() -> SyntheticObjectStore:
+    """Return the process-wide synthetic store so every StorageService sees the same objects."""
+    return SyntheticObjectStore(
+        LatencyModel(
+            settings.synthetic_latency_distribution,
+            settings.synthetic_storage_latency_ms,
+            settings.synthetic_storage_latency_stddev_ms,
+            seed=settings.synthetic_seed
+        ),
+        error_rate=settings.synthetic_storage_error_rate,
+        seed=settings.synthetic_seed
+    )
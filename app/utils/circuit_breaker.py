@@ -0,0 +1,152 @@
+"""Circuit breaker for remote dependencies (the LLM provider)."""
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitCall:
+    """Permission for one call, returned by ``CircuitBreaker.allow`` and handed back with its outcome."""
+
+    __slots__ = ("trial",)
+
+    def __init__(self, trial: bool):
+        self.trial = trial
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that keeps failing.
+
+    Outcomes are kept for ``window_seconds``. Once at least ``min_calls``
+    outcomes are in the window and the failure ratio reaches
+    ``failure_ratio`` the circuit opens and calls are refused. After
+    ``cooldown_seconds`` one trial call is let through (half-open): success
+    closes the circuit, failure opens it for another cooldown. Outcomes of
+    calls let through before the circuit opened are ignored until it closes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_ratio: float,
+        min_calls: int,
+        window_seconds: float,
+        cooldown_seconds: float
+    ):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._trial_in_flight = False
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def available(self) -> bool:
+        """Return True unless the circuit is open and still cooling down (does not claim the trial call)."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= self.cooldown_seconds
+        return not (self.state == HALF_OPEN and self._trial_in_flight)
+
+    def allow(self) -> Optional[CircuitCall]:
+        """
+        Let a call through unless the circuit refuses it.
+
+        Returns:
+            The call's permission, to be passed to record_success, record_failure
+            or release; None if the call may not proceed. In half-open state only
+            the trial call is let through.
+        """
+        if not self.available():
+            return None
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, letting a trial call through")
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = True
+            return CircuitCall(trial=True)
+        return CircuitCall(trial=False)
+
+    def retry_after(self) -> float:
+        """Seconds until the open circuit lets a trial call through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.cooldown_seconds - (time.monotonic() - self.opened_at), 0.0)
+
+    def record_success(self, call: CircuitCall):
+        if call.trial:
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN:
+                logger.info(f"Circuit {self.name} closed after a successful trial call")
+                self.state = CLOSED
+                self._outcomes.clear()
+        elif self.state != CLOSED:
+            return
+        self._outcomes.append((time.monotonic(), True))
+        self._prune()
+
+    def record_failure(self, call: CircuitCall):
+        if call.trial:
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN:
+                self._open()
+                return
+        if self.state != CLOSED:
+            return
+        self._outcomes.append((time.monotonic(), False))
+        self._prune()
+        failures = sum(1 for _, success in self._outcomes if not success)
+        if (
+            self.state == CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._open()
+
+    def release(self, call: CircuitCall):
+        """End a call without an outcome (cancelled, or rejected for reasons the breaker ignores)."""
+        if call.trial:
+            self._trial_in_flight = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._outcomes.clear()
+        logger.warning(f"Circuit {self.name} open for {self.cooldown_seconds:.0f}s after sustained failures")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state for monitoring."""
+        self._prune()
+        return {
+            "state": self.state,
+            "failures": sum(1 for _, success in self._outcomes if not success),
+            "calls": len(self._outcomes),
+            "retry_after": round(self.retry_after(), 1),
+            "times_opened": self.times_opened
+        }
+
+
+# Singleton instance
+llm_circuit_breaker = CircuitBreaker(
+    "llm",
+    settings.llm_breaker_failure_ratio,
+    settings.llm_breaker_min_calls,
+    settings.llm_breaker_window_seconds,
+    settings.llm_breaker_cooldown_seconds
+)
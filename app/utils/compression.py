@@ -0,0 +1,127 @@
+"""Response compression (brotli or gzip, negotiated per request) as ASGI middleware."""
+import asyncio
+import gzip
+import logging
+from typing import Callable, Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Media types worth compressing; everything else (PDFs, parquet, images) is sent as is
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Bodies at least this large are compressed in a worker thread instead of on the event loop
+OFFLOAD_SIZE = 256 * 1024
+
+
+def _encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Available encodings, in order of preference."""
+    encoders = {}
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=settings.compression_brotli_quality)
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=settings.compression_gzip_level)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw header value, e.g. ``"gzip, deflate, br;q=0.9"``
+        encodings: Encodings the response can use, in order of preference
+            (default: every available encoder)
+
+    Returns:
+        "br" or "gzip" (highest q-value, earlier encoding on ties), or None for identity
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings if encodings is not None else _encoders():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete JSON and text responses of at least ``COMPRESSION_MINIMUM_SIZE`` bytes.
+
+    The encoding is negotiated from Accept-Encoding: brotli when the ``brotli``
+    package is installed and accepted, otherwise gzip. Streaming responses (SSE,
+    exports) and responses that already carry a Content-Encoding pass through
+    untouched, so event streams are never buffered. Every other JSON or text
+    response gets ``Vary: Accept-Encoding``, compressed or not, so caches never
+    serve one client's encoding to another.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.encoders = _encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                )
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start_message is not None:
+                initial, start_message = start_message, None
+                body = message.get("body", b"")
+                if not passthrough and not message.get("more_body", False):
+                    # Eligible whatever this client accepts, so caches must key on Accept-Encoding
+                    headers = MutableHeaders(raw=initial["headers"])
+                    headers.add_vary_header("Accept-Encoding")
+                    if encoding is not None and len(body) >= settings.compression_minimum_size:
+                        compressed = await self._compress(encoding, body)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(compressed))
+                        message = {**message, "body": compressed}
+                await send(initial)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        encode = self.encoders[encoding]
+        if len(body) >= OFFLOAD_SIZE:
+            return await asyncio.to_thread(encode, body)
+        return encode(body)
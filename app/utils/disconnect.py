@@ -0,0 +1,51 @@
+"""Cancel request work when the HTTP client goes away."""
+import asyncio
+import logging
+from typing import Awaitable, TypeVar
+from fastapi import Request
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Non-standard status (nginx convention) for requests whose client closed the connection
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """Raised when work was cancelled because the client disconnected."""
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await work, cancelling it if the client disconnects first.
+
+    The connection is polled every ``DISCONNECT_POLL_SECONDS``; call this only
+    after the request body has been read.
+
+    Raises:
+        ClientDisconnected: If the client disconnected and the work was cancelled
+    """
+    work = asyncio.ensure_future(awaitable)
+
+    async def watch() -> bool:
+        while not work.done():
+            if await request.is_disconnected():
+                work.cancel()
+                return True
+            await asyncio.sleep(settings.disconnect_poll_seconds)
+        return False
+
+    watcher = asyncio.create_task(watch())
+    try:
+        return await work
+    except asyncio.CancelledError:
+        if watcher.done() and not watcher.cancelled() and watcher.result():
+            logger.info(f"Client disconnected, cancelled {request.method} {request.url.path}")
+            raise ClientDisconnected() from None
+        raise
+    finally:
+        watcher.cancel()
+        if not work.done():
+            work.cancel()
@@ -0,0 +1,46 @@
+"""Sparse fieldsets (``?fields=a,b,c``) for list endpoints."""
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FieldsetError(ValueError):
+    """Raised when ``fields`` names a field the response model does not have."""
+
+
+def parse_fields(
+    fields: Optional[str],
+    model: Type[BaseModel],
+    always: Sequence[str] = ("id",)
+) -> Optional[List[str]]:
+    """
+    Parse a comma-separated ``fields`` query parameter against a response model.
+
+    Args:
+        fields: Raw parameter value, e.g. ``"title,status"``
+        model: Response model whose fields may be requested
+        always: Fields returned even when not requested
+
+    Returns:
+        ``always`` fields, then the requested ones in the model's declaration order;
+        None when every field is wanted
+
+    Raises:
+        FieldsetError: If a requested name is not a field of the model
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise FieldsetError(
+            f"Unknown fields: {', '.join(sorted(unknown))} (available: {', '.join(model.model_fields)})"
+        )
+    return [*always, *(name for name in model.model_fields if name in requested and name not in always)]
+
+
+def sparse_response(rows: Iterable[Sequence[Any]], names: List[str]) -> JSONResponse:
+    """Serialize rows of the selected columns (in ``names`` order) without the full response model."""
+    return JSONResponse(jsonable_encoder([dict(zip(names, row)) for row in rows]))
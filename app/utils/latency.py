@@ -0,0 +1,66 @@
+"""Latency models used by the synthetic service stand-ins."""
+import asyncio
+import math
+import random
+import time
+from typing import Optional
+
+
+class LatencyModel:
+    """
+    Draws latencies (in milliseconds) from a configurable distribution.
+
+    Supported distributions: fixed, uniform, normal, lognormal, exponential.
+    For ``uniform`` the range is ``mean_ms +/- stddev_ms``; for the others
+    ``mean_ms`` and ``stddev_ms`` describe the resulting latency.
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(
+        self,
+        distribution: str = "lognormal",
+        mean_ms: float = 0.0,
+        stddev_ms: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unsupported latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean_ms = max(mean_ms, 0.0)
+        self.stddev_ms = max(stddev_ms, 0.0)
+        self._random = random.Random(seed)
+
+    def sample_ms(self) -> float:
+        """Draw a single latency sample in milliseconds."""
+        if self.mean_ms == 0:
+            return 0.0
+        if self.distribution == "fixed" or self.stddev_ms == 0:
+            return self.mean_ms
+        if self.distribution == "uniform":
+            low = max(self.mean_ms - self.stddev_ms, 0.0)
+            return self._random.uniform(low, self.mean_ms + self.stddev_ms)
+        if self.distribution == "normal":
+            return max(self._random.gauss(self.mean_ms, self.stddev_ms), 0.0)
+        if self.distribution == "exponential":
+            return self._random.expovariate(1.0 / self.mean_ms)
+        # lognormal: convert the requested mean/stddev into the underlying normal parameters
+        variance = self.stddev_ms ** 2
+        sigma_sq = math.log1p(variance / (self.mean_ms ** 2))
+        mu = math.log(self.mean_ms) - sigma_sq / 2
+        return self._random.lognormvariate(mu, math.sqrt(sigma_sq))
+
+    async def sleep(self) -> float:
+        """Sleep asynchronously for one sampled latency and return it."""
+        latency_ms = self.sample_ms()
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+        return latency_ms
+
+    def block(self) -> float:
+        """Block the calling thread for one sampled latency and return it."""
+        latency_ms = self.sample_ms()
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+        return latency_ms
+
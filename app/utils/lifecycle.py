@@ -0,0 +1,39 @@
+"""Process lifecycle: graceful drain on shutdown."""
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class DrainState:
+    """
+    Process-wide drain flag.
+    
+    Set when the server stops accepting connections. Long-lived work checks it
+    (or registers a callback) to stop taking new work and finish what is in
+    flight before the process exits.
+    """
+
+    def __init__(self):
+        self.draining = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    def on_drain(self, callback: Callable[[], None]):
+        """Register a callback run once when draining begins."""
+        self._callbacks.append(callback)
+
+    def begin(self):
+        """Start draining (idempotent)."""
+        if self.draining:
+            return
+        self.draining = True
+        logger.info("Draining: no new work will be accepted")
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in drain callback {callback}: {e}")
+
+
+# Singleton instance
+drain_state = DrainState()
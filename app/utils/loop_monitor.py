@@ -0,0 +1,173 @@
+"""Event-loop stall detection: measures loop lag and attributes stalls to code locations."""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames under this directory are the application's own code
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+
+# Locations tracked at most; the one with the least stalled time is evicted first
+MAX_LOCATIONS = 500
+
+# Innermost frames kept as the sample stack of a location
+STACK_DEPTH = 12
+
+
+def _location(frame: traceback.FrameSummary) -> str:
+    path = frame.filename
+    if path.startswith(APP_DIR):
+        path = "app" + path[len(APP_DIR):]
+    elif "site-packages/" in path:
+        path = path.split("site-packages/", 1)[1]
+    return f"{path}:{frame.lineno} in {frame.name}"
+
+
+class LoopStallMonitor:
+    """
+    Watchdog for code that blocks the event loop.
+
+    A heartbeat task sleeps for ``interval`` seconds in a loop; the time it
+    oversleeps is the loop lag. A watchdog thread notices when the heartbeat
+    is overdue by more than ``threshold`` and captures the loop thread's stack
+    while it is still blocked. When the heartbeat resumes, the stall's
+    duration is attributed to the innermost application frame of that stack
+    (the call site in app/ that blocked, e.g. a sync client or a parser), and
+    counts and durations are aggregated per location.
+    """
+
+    def __init__(self, interval: float, threshold: float, window_seconds: float = 60.0):
+        self.interval = interval
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.stalls = 0
+        self.stalled_seconds = 0.0
+        self._lags: Deque[Tuple[float, float]] = deque()
+        self._locations: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._captured: Optional[traceback.StackSummary] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the heartbeat and watchdog (call from the event loop to monitor)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-stall-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Event loop stall detection enabled (threshold {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self):
+        """Stop the heartbeat and watchdog."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - started - self.interval, 0.0)
+            with self._lock:
+                self._last_beat = now
+                captured, self._captured = self._captured, None
+            self._lags.append((now, lag))
+            self._prune(now)
+            if captured is not None and lag >= self.threshold:
+                self._record(captured, lag)
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack while the heartbeat is overdue."""
+        while not self._stopped.wait(self.interval / 2):
+            with self._lock:
+                if self._captured is not None:
+                    continue
+                if time.monotonic() - self._last_beat < self.interval + self.threshold:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._captured = traceback.extract_stack(frame)
+
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._lags and self._lags[0][0] < cutoff:
+            self._lags.popleft()
+
+    def _record(self, stack: traceback.StackSummary, duration: float):
+        app_frames = [frame for frame in stack if frame.filename.startswith(APP_DIR) and frame.filename != __file__]
+        frame = app_frames[-1] if app_frames else stack[-1]
+        location = _location(frame)
+        blocking_call = _location(stack[-1])
+
+        self.stalls += 1
+        self.stalled_seconds += duration
+        entry = self._locations.get(location)
+        if entry is None:
+            if len(self._locations) >= MAX_LOCATIONS:
+                del self._locations[min(self._locations, key=lambda key: self._locations[key]["total_seconds"])]
+            entry = self._locations[location] = {
+                "location": location, "count": 0, "total_seconds": 0.0, "max_seconds": 0.0
+            }
+        entry["count"] += 1
+        entry["total_seconds"] += duration
+        entry["max_seconds"] = max(entry["max_seconds"], duration)
+        entry["last_seen"] = time.time()
+        entry["blocking_call"] = blocking_call
+        entry["stack"] = [_location(frame) for frame in stack[-STACK_DEPTH:]]
+        logger.warning(f"Event loop blocked for {duration * 1000:.0f}ms at {location} (in {blocking_call})")
+
+    def top_offenders(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Code locations that blocked the loop longest in total, worst first."""
+        entries = sorted(self._locations.values(), key=lambda entry: entry["total_seconds"], reverse=True)
+        return [
+            {**entry, "total_seconds": round(entry["total_seconds"], 3), "max_seconds": round(entry["max_seconds"], 3)}
+            for entry in entries[:limit]
+        ]
+
+    def snapshot(self, limit: int = 10) -> Dict[str, Any]:
+        """Current loop lag, stall totals and top offending locations."""
+        self._prune(time.monotonic())
+        lags = sorted(lag for _, lag in self._lags)
+        lag_ms = None
+        if lags:
+            lag_ms = {
+                "p50": round(lags[len(lags) // 2] * 1000, 1),
+                "p99": round(lags[min(int(len(lags) * 0.99), len(lags) - 1)] * 1000, 1),
+                "max": round(lags[-1] * 1000, 1)
+            }
+        return {
+            "running": self._task is not None,
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": lag_ms,
+            "stalls": self.stalls,
+            "stalled_seconds": round(self.stalled_seconds, 3),
+            "top_offenders": self.top_offenders(limit)
+        }
+
+
+# Singleton instance
+loop_stall_monitor = LoopStallMonitor(settings.loop_monitor_interval_seconds, settings.loop_stall_threshold_seconds)
@@ -0,0 +1,138 @@
+"""Per-request statistical profiling (pyinstrument) as ASGI middleware."""
+import asyncio
+import hmac
+import logging
+import random
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.config import settings
+from app.utils.structured_logging import REQUEST_ID_HEADER, SAFE_REQUEST_ID, request_id_var
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_FORMAT_HEADER = b"x-profile-format"
+PROFILE_INLINE_HEADER = b"x-profile-inline"
+
+# Output formats: file suffix and media type of the inline response
+PROFILE_FORMATS = {
+    "speedscope": (".speedscope.json", "application/json"),
+    "html": (".html", "text/html; charset=utf-8"),
+}
+
+
+def profiling_configured() -> bool:
+    """Return True when the middleware should be installed at all."""
+    return bool(settings.profiling_token) or settings.profiling_sample_rate > 0
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests with pyinstrument.
+
+    A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>`` or is
+    picked by ``PROFILING_SAMPLE_RATE``. The profiler runs in async mode, so it
+    samples only the request's own task context. The profile is written to
+    ``PROFILING_OUTPUT_DIR/<request id>-<random><suffix>`` (path returned in
+    ``X-Profile-Path``); authorized requests that also send ``X-Profile-Inline: 1``
+    get the profile as the response body instead of the endpoint's response.
+    ``X-Profile-Format`` selects speedscope (default) or html.
+
+    The middleware is only installed when a token or sample rate is configured;
+    unprofiled requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.output_dir = Path(settings.profiling_output_dir)
+
+    def _should_profile(self, scope) -> Tuple[bool, bool]:
+        """Return (profile, authorized) for the request."""
+        token = _header(scope, PROFILE_HEADER)
+        if token is not None and settings.profiling_token:
+            if hmac.compare_digest(token.encode(), settings.profiling_token.encode()):
+                return True, True
+        sample_rate = settings.profiling_sample_rate
+        return sample_rate > 0 and random.random() < sample_rate, False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile, authorized = self._should_profile(scope)
+        if not profile:
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        request_id = (
+            request_id_var.get()
+            or SAFE_REQUEST_ID.sub("", _header(scope, REQUEST_ID_HEADER) or "")[:64]
+            or uuid.uuid4().hex
+        )
+        profile_format = (_header(scope, PROFILE_FORMAT_HEADER) or settings.profiling_format).lower()
+        if profile_format not in PROFILE_FORMATS:
+            profile_format = settings.profiling_format
+        suffix, media_type = PROFILE_FORMATS[profile_format]
+        inline = authorized and (_header(scope, PROFILE_INLINE_HEADER) or "").lower() in ("1", "true", "yes")
+        # The request id is client-controlled: a server-generated part keeps names unique and unguessable
+        path = self.output_dir / f"{request_id}-{uuid.uuid4().hex[:8]}{suffix}"
+
+        async def send_with_profile_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode()))
+                headers.append((b"x-profile-path", str(path).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        async def discard(message):
+            pass
+
+        profiler = Profiler(interval=settings.profiling_interval_seconds, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard if inline else send_with_profile_headers)
+        finally:
+            profiler.stop()
+            output = self._render(profiler, profile_format)
+            if not inline:
+                await asyncio.to_thread(self._write, path, output)
+
+        if inline:
+            body = output.encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", media_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (REQUEST_ID_HEADER, request_id.encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _render(profiler, profile_format: str) -> str:
+        from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+
+        renderer = SpeedscopeRenderer() if profile_format == "speedscope" else HTMLRenderer()
+        return profiler.output(renderer)
+
+    def _write(self, path: Path, output: str):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(output, encoding="utf-8")
+            logger.info(f"Wrote request profile {path}")
+        except OSError as e:
+            logger.error(f"Error writing request profile {path}: {e}")
@@ -0,0 +1,248 @@
+"""Non-blocking structured logging: records are queued on the request path and written by a background thread."""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterable, Optional
+
+from opentelemetry import trace
+
+from app.config import settings
+
+REQUEST_ID_HEADER = b"x-request-id"
+SAFE_REQUEST_ID = re.compile(r"[^A-Za-z0-9_.-]")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s"
+
+# Loggers that servers configure with their own (synchronous) handlers
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Set per request by RequestIdMiddleware; tasks started while handling the request inherit it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed with extra= and becomes a JSON field
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "request_id", "trace_id"
+}
+
+
+def truncate_payload(text: Any, limit: Optional[int] = None) -> str:
+    """
+    Cut a payload for logging, noting how much was left out.
+
+    Args:
+        text: Payload (converted with str())
+        limit: Characters kept (default LOG_MAX_MESSAGE_CHARS)
+    """
+    text = str(text)
+    limit = limit or settings.log_max_message_chars
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} chars truncated]"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with timestamp, level, logger, message, request and trace ids and extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for name in ("request_id", "trace_id"):
+            value = getattr(record, name, None)
+            if value:
+                entry[name] = value
+        for name, value in vars(record).items():
+            if name not in RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the background writer without blocking the caller.
+
+    On the calling thread a record only has its message resolved, cut to
+    ``max_chars`` and tagged with the current request and trace ids; the
+    writer thread formats and writes it. Messages longer than ``max_chars``
+    below WARNING are kept with probability ``sample_rate``. When the queue is
+    full records are dropped (and counted) rather than stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue, max_chars: int, sample_rate: float):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.sampled_out = 0
+        self._reported_drops = 0
+
+    def prepare(self, record: logging.LogRecord) -> Optional[logging.LogRecord]:
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            if record.levelno < logging.WARNING and random.random() >= self.sample_rate:
+                self.sampled_out += 1
+                return None
+            message = truncate_payload(message, self.max_chars)
+        # The writer runs in this process, so exc_info is kept as is and formatted there
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        request_id = request_id_var.get()
+        if request_id is not None:
+            record.request_id = request_id
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            record.trace_id = format(span_context.trace_id, "032x")
+        return record
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            prepared = self.prepare(record)
+            if prepared is None:
+                return
+            self.enqueue(prepared)
+        except queue.Full:
+            self.dropped += 1
+            return
+        except Exception:
+            self.handleError(record)
+            return
+        if self.dropped > self._reported_drops:
+            self._report_drops()
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put_nowait(record)
+
+    def _report_drops(self):
+        dropped = self.dropped
+        notice = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"Log queue full, dropped {dropped - self._reported_drops} record(s)", None, None
+        )
+        try:
+            self.enqueue(notice)
+            self._reported_drops = dropped
+        except queue.Full:
+            pass
+
+
+class LogWriter(QueueListener):
+    """Background thread writing queued records to the configured handlers."""
+
+    def enqueue_sentinel(self):
+        # Blocks until the writer makes room, so records queued before shutdown are still written
+        self.queue.put(self._sentinel)
+
+
+class RequestIdMiddleware:
+    """
+    Assigns each HTTP request an id for its log records.
+
+    The id is taken from ``X-Request-ID`` (sanitized) or generated, stored in
+    ``request_id_var`` for the duration of the request and returned in the
+    response's ``X-Request-ID`` header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = next((value for key, value in scope.get("headers", ()) if key == REQUEST_ID_HEADER), b"")
+        request_id = SAFE_REQUEST_ID.sub("", header.decode("latin-1"))[:64] or uuid.uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if not any(key.lower() == REQUEST_ID_HEADER for key, _ in headers):
+                    headers.append((REQUEST_ID_HEADER, request_id.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[LogWriter] = None
+
+
+def _start_listener():
+    global _listener
+    stream = logging.StreamHandler()
+    if settings.log_format == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"}))
+    _listener = LogWriter(_handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork():
+    """Threads do not survive fork: give the child its own queue and writer thread."""
+    global _listener
+    if _handler is None:
+        return
+    _handler.queue = queue.Queue(settings.log_queue_size)
+    _listener = None
+    _start_listener()
+
+
+def configure_logging():
+    """Route the root logger (and the server's loggers) through the queue to a background writer (once per process)."""
+    global _handler
+    if _handler is not None:
+        return
+    _handler = NonBlockingQueueHandler(
+        queue.Queue(settings.log_queue_size),
+        settings.log_max_message_chars,
+        settings.log_large_message_sample_rate
+    )
+    root = logging.getLogger()
+    root.handlers = [_handler]
+    root.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    adopt_loggers(SERVER_LOGGERS)
+    _start_listener()
+    atexit.register(shutdown_logging)
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def adopt_loggers(names: Iterable[str]):
+    """Replace the handlers of loggers configured elsewhere (e.g. by the server) with the queue."""
+    if _handler is None:
+        return
+    for name in names:
+        named = logging.getLogger(name)
+        named.handlers = [_handler]
+        named.propagate = False
+
+
+def shutdown_logging():
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
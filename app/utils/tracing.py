@@ -0,0 +1,216 @@
+"""OpenTelemetry tracing: provider setup, exporters, request and SQL spans."""
+import functools
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Spans created before configure_tracing() (or with tracing disabled) are no-ops
+tracer = trace.get_tracer("app")
+
+MAX_STATEMENT_LENGTH = 2000
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(json.loads(span.to_json()), separators=(",", ":")) + "\n" for span in spans)
+        try:
+            # One append per batch keeps lines from several workers intact
+            with self._lock, open(self.path, "a", encoding="utf-8") as output:
+                output.write(lines)
+        except OSError as e:
+            logger.error(f"Error writing spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def create_span_exporter(mode: Optional[str] = None) -> Optional[SpanExporter]:
+    """Create the span exporter for the configured mode (file, console, none)."""
+    mode = mode or settings.tracing_exporter
+    if mode == "file":
+        return JsonLinesSpanExporter(settings.tracing_file_path)
+    if mode == "console":
+        return ConsoleSpanExporter(formatter=lambda span: span.to_json(indent=None) + os.linesep)
+    if mode == "none":
+        return None
+    raise ValueError(f"Unsupported tracing exporter: {mode}")
+
+
+_provider: Optional[TracerProvider] = None
+
+
+def configure_tracing() -> Optional[TracerProvider]:
+    """
+    Install the process-wide tracer provider (once per process, after fork).
+
+    Returns:
+        The provider, or None when tracing is disabled
+    """
+    global _provider
+    if _provider is not None or not settings.tracing_enabled:
+        return _provider
+    exporter = create_span_exporter()
+    if exporter is None:
+        return None
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name, "process.pid": os.getpid()}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio))
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+    logger.info(f"Tracing enabled ({settings.tracing_exporter} exporter)")
+    return _provider
+
+
+def shutdown_tracing():
+    """Flush buffered spans and stop the exporter."""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def trace_headers() -> Dict[str, str]:
+    """Return W3C trace context headers (traceparent) for an outgoing request."""
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def traced(name: str):
+    """Decorator running an async function inside a span (attributes via ``trace.get_current_span()``)."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_exception(span: trace.Span, error: BaseException):
+    """Mark a span as failed with the exception."""
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def instrument_engine(engine: Optional[AsyncEngine]):
+    """
+    Create a client span for every SQL statement executed on the engine.
+
+    The async driver runs cursor events in a greenlet sharing the caller's
+    context, so statement spans nest under the span that issued the query.
+    """
+    if engine is None or not settings.tracing_enabled:
+        return
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+        if context is None or not trace.get_current_span().is_recording():
+            return
+        span = tracer.start_span(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": sync_engine.dialect.name,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+                "db.executemany": executemany,
+            }
+        )
+        context._trace_span = span
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+            context._trace_span = None
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _fail_statement_span(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            record_exception(span, exception_context.original_exception)
+            span.end()
+            exception_context.execution_context._trace_span = None
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TracingMiddleware:
+    """
+    Opens a server span per HTTP request.
+
+    An incoming ``traceparent`` header continues the caller's trace. Background
+    tasks run inside the request's ASGI call, so their spans share its trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {"traceparent": _header(scope, b"traceparent"), "tracestate": _header(scope, b"tracestate")}
+        parent = propagate.extract({key: value for key, value in carrier.items() if value})
+        method = scope["method"]
+
+        with tracer.start_as_current_span(
+            f"{method} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]}
+        ) as span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                span.update_name(f"{method} {route.path}")
+                span.set_attribute("http.route", route.path)
+
+
+def span_link(carrier: Optional[Dict[str, str]]) -> Optional[trace.Link]:
+    """Build a link to the span whose context was captured with ``trace_headers``."""
+    span_context = trace.get_current_span(propagate.extract(carrier or {})).get_span_context()
+    return trace.Link(span_context) if span_context.is_valid else None
@@ -0,0 +1,37 @@
+"""Signed tokens binding a direct CV upload to the job and object it was issued for."""
+import hashlib
+import hmac
+import time
+from typing import Optional
+from uuid import UUID
+
+from app.config import settings
+
+
+def _signature(object_name: str, job_id: UUID, expires: int) -> str:
+    key = (settings.upload_token_secret or settings.minio_secret_key).encode()
+    message = f"{object_name}\n{job_id}\n{expires}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def issue_upload_token(object_name: str, job_id: UUID, expires: int) -> str:
+    """
+    Sign an upload for ``POST /apply/finalize``.
+
+    Args:
+        object_name: Object the client was allowed to upload
+        job_id: Job the upload was requested for
+        expires: Unix time after which finalize rejects the token
+
+    Returns:
+        Token of the form ``<expires>.<hex HMAC-SHA256>``
+    """
+    return f"{expires}.{_signature(object_name, job_id, expires)}"
+
+
+def verify_upload_token(token: str, object_name: str, job_id: UUID, now: Optional[float] = None) -> bool:
+    """Return True if ``token`` was issued for this object and job and has not expired."""
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(signature, _signature(object_name, job_id, int(expires)))
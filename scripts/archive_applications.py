@@ -0,0 +1,47 @@
+"""
+Maintain applications partitions and archive closed jobs.
+
+    python scripts/archive_applications.py                 # partitions, archival, cold CVs, orphaned uploads, old events
+    python scripts/archive_applications.py --partitions-only
+
+Run daily (e.g. from cron). It provisions the monthly applications partitions
+ahead of time, moves applications of jobs closed for ARCHIVE_AFTER_DAYS into
+the archive partition, and moves CVs of candidates left with only archived
+applications to the gzip-compressed ARCHIVE_COLD_PREFIX in object storage.
+Uploaded CVs no candidate refers to are deleted after STORAGE_ORPHAN_GRACE_SECONDS,
+and status events older than EVENTS_RETENTION_DAYS are deleted from the replay log.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import write_session  # noqa: E402
+from app.services.archival import archival_service  # noqa: E402
+
+
+async def run(partitions_only: bool):
+    async with write_session() as db:
+        if partitions_only:
+            partitions = await archival_service.ensure_partitions(db)
+            print(f"Ensured {len(partitions)} monthly partition(s)")
+            return
+        summary = await archival_service.run(db)
+    print(
+        f"Ensured {len(summary['partitions'])} monthly partition(s), archived {summary['archived_jobs']} job(s), "
+        f"moved {summary['cold_cvs']} CV(s) to cold storage, deleted {summary['orphaned_uploads']} orphaned upload(s), "
+        f"pruned {summary['pruned_events']} status event(s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain applications partitions and archive closed jobs")
+    parser.add_argument("--partitions-only", action="store_true", help="Only provision monthly partitions")
+    args = parser.parse_args()
+    asyncio.run(run(args.partitions_only))
+
+
+if __name__ == "__main__":
+    main()
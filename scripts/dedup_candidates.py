@@ -0,0 +1,74 @@
+"""
+Find (and optionally merge) duplicate candidates across the whole table.
+
+    python scripts/dedup_candidates.py --backfill        # index candidates without a signature first
+    python scripts/dedup_candidates.py                   # report clusters of probable duplicates
+    python scripts/dedup_candidates.py --merge           # merge each cluster into one candidate
+
+New CVs are indexed when they are analyzed; --backfill computes signatures of
+candidates created before duplicate detection (their CVs are downloaded and
+extracted again). Clusters are connected groups of verified duplicate pairs;
+--merge keeps the candidate with a real email (earliest first) and merges the
+others into it, one transaction per cluster.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.database import write_session  # noqa: E402
+from app.models import Candidate  # noqa: E402
+from app.services.candidate_dedup import candidate_dedup_service, is_placeholder_email  # noqa: E402
+
+
+async def run(backfill: bool, merge: bool, batch_size: int):
+    if backfill:
+        async with write_session() as db:
+            indexed = await candidate_dedup_service.backfill(db, batch_size)
+        print(f"Indexed {indexed} candidate(s)")
+
+    async with write_session() as db:
+        clusters = await candidate_dedup_service.cluster(db)
+    print(f"Found {len(clusters)} cluster(s) of probable duplicates")
+
+    merged = 0
+    for cluster in clusters:
+        async with write_session() as db:
+            result = await db.execute(
+                select(Candidate.id, Candidate.name, Candidate.email, Candidate.created_at)
+                .where(Candidate.id.in_(cluster))
+            )
+            # Real emails first, then the oldest candidate
+            members = sorted(result.all(), key=lambda row: (is_placeholder_email(row.email), row.created_at))
+            if len(members) < 2:
+                continue
+            target, duplicates = members[0], members[1:]
+            print(f"{target.id} {target.name} <{target.email}>")
+            for duplicate in duplicates:
+                print(f"  ~ {duplicate.id} {duplicate.name} <{duplicate.email}>")
+            if merge:
+                outcome = await candidate_dedup_service.merge(db, target.id, [row.id for row in duplicates])
+                merged += len(outcome.merged_ids)
+                print(
+                    f"  merged: {len(outcome.moved_application_ids)} application(s) moved, "
+                    f"{len(outcome.removed_application_ids)} removed"
+                )
+    if merge:
+        print(f"Merged {merged} duplicate candidate(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and merge duplicate candidates")
+    parser.add_argument("--backfill", action="store_true", help="Index candidates without a signature first")
+    parser.add_argument("--merge", action="store_true", help="Merge each cluster into one candidate")
+    parser.add_argument("--batch-size", type=int, default=None, help="Candidates per backfill batch")
+    args = parser.parse_args()
+    asyncio.run(run(args.backfill, args.merge, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
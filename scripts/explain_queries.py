@@ -0,0 +1,109 @@
+"""
+Verify with EXPLAIN that the hot endpoint queries can use an index.
+
+    python scripts/explain_queries.py            # exits 1 if a query needs a sequential scan
+    python scripts/explain_queries.py --verbose  # also print every plan
+
+Each query mirrors the statement an endpoint or worker issues. Plans are
+taken with enable_seqscan off, so the check asks "is there a usable index?"
+independently of how small the tables are in the environment it runs in.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.models import Application, ApplicationEvent, ApplicationKey, Candidate, Job, JobStats  # noqa: E402
+from app.services.application_pipeline import deferred_claim_statement  # noqa: E402
+
+SCAN_NODES = ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+
+def endpoint_queries() -> List[Tuple[str, Any]]:
+    """(name, statement) for every hot query, with representative parameters."""
+    job_id = uuid.uuid4()
+    since = datetime.utcnow() - timedelta(days=365)
+    return [
+        ("GET /jobs?status=", select(Job).where(Job.status == "active").order_by(Job.created_at.desc())),
+        ("GET /jobs", select(Job).order_by(Job.created_at.desc())),
+        ("GET /jobs/{id}", select(Job).where(Job.id == job_id)),
+        ("GET /jobs/{id} applications", select(Application).where(
+            Application.job_id == job_id, Application.created_at >= since
+        )),
+        ("GET /jobs/{id}/stats", select(JobStats).where(JobStats.job_id == job_id)),
+        ("GET /applications", select(Application).where(
+            Application.created_at >= since, Application.archived.is_(False)
+        ).order_by(Application.created_at.desc())),
+        ("POST /successfactors/sync", select(Application).where(
+            Application.id.in_([uuid.uuid4(), uuid.uuid4()]), Application.archived.is_(False)
+        )),
+        ("POST /applications/{id}/shortlist", select(Application).where(Application.id == uuid.uuid4())),
+        ("POST /apply candidate upsert", select(Candidate.id).where(Candidate.email == "someone@example.com")),
+        ("POST /apply application key", select(ApplicationKey).where(
+            ApplicationKey.job_id == job_id, ApplicationKey.candidate_id == uuid.uuid4()
+        )),
+        ("POST /apply/finalize / upload sweep", select(Candidate.id).where(
+            Candidate.resume_url == "http://minio:9000/resumes/resumes/upload.pdf"
+        )),
+        ("deferred worker claim", deferred_claim_statement(datetime.utcnow())),
+        ("job stats rebuild / export", select(Application.status).where(Application.job_id == job_id)),
+        ("GET /applications/events replay", select(ApplicationEvent).where(
+            ApplicationEvent.job_id == job_id, ApplicationEvent.id > 0
+        ).order_by(ApplicationEvent.id)),
+    ]
+
+
+def scans(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten the scan nodes of a JSON plan."""
+    found = [plan] if plan.get("Node Type") in SCAN_NODES else []
+    for child in plan.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+async def explain(verbose: bool) -> int:
+    dialect = postgresql.dialect()
+    failures = 0
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, statement in endpoint_queries():
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            nodes = scans(plan[0]["Plan"])
+            sequential = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+            indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+            status = "SEQ SCAN" if sequential else "ok"
+            print(f"{status:<9} {name:<36} {', '.join(indexes) or '-'}"
+                  + (f"  (seq: {', '.join(sorted(set(sequential)))})" if sequential else ""))
+            if verbose:
+                print(json.dumps(plan, indent=2))
+            failures += bool(sequential)
+        await db.rollback()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use indexes")
+    parser.add_argument("--verbose", action="store_true", help="Print full plans")
+    args = parser.parse_args()
+    failures = asyncio.run(explain(args.verbose))
+    if failures:
+        print(f"{failures} query(ies) need a sequential scan")
+        sys.exit(1)
+    print("All hot queries use an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Load test for the /apply pipeline.
+
+Run the API with the synthetic or replay stand-ins, e.g.
+
+    LLM_PROVIDER_MODE=synthetic STORAGE_MODE=synthetic uvicorn app.main:app
+
+then drive it with
+
+    python scripts/load_test_apply.py --job-id <uuid> --requests 500 --concurrency 50
+
+The script generates small DOCX CVs in memory, submits them concurrently and
+reports throughput, latency percentiles and the distribution of status codes
+(429/503 responses show backpressure, 5xx show failures).
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from collections import Counter
+from typing import List, Tuple
+
+import httpx
+from docx import Document
+
+
+def build_cv(index: int) -> bytes:
+    """Build a small synthetic DOCX CV."""
+    document = Document()
+    document.add_heading(f"Load Test Candidate {index}", level=1)
+    document.add_paragraph(f"Email: loadtest_{index}@example.com")
+    document.add_paragraph("Phone: +1 555 010 0000")
+    document.add_paragraph("Skills: Python, FastAPI, PostgreSQL, Docker")
+    document.add_paragraph(f"Experience: {index % 15} years as a software engineer")
+    document.add_paragraph("Education: BSc Computer Science")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def submit(client: httpx.AsyncClient, job_id: str, index: int) -> Tuple[int, float]:
+    """Submit one application and return (status_code, latency_seconds)."""
+    files = {
+        "cv_file": (
+            f"cv_{index}.docx",
+            build_cv(index),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+    }
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/v1/apply", data={"job_id": job_id}, files=files)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        status_code = 0
+    return status_code, time.perf_counter() - started
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[rank]
+
+
+async def run(base_url: str, job_id: str, total: int, concurrency: int, timeout: float):
+    """Run the load test and print a summary."""
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Tuple[int, float]] = []
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        async def worker(index: int):
+            async with semaphore:
+                results.append(await submit(client, job_id, index))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = [latency for _, latency in results]
+    ok_latencies = [latency for status, latency in results if 200 <= status < 300]
+    statuses = Counter(status for status, _ in results)
+
+    print(f"Requests:     {total} (concurrency {concurrency})")
+    print(f"Elapsed:      {elapsed:.2f}s")
+    print(f"Throughput:   {total / elapsed:.1f} req/s ({len(ok_latencies) / elapsed:.1f} successful/s)")
+    print(f"Latency mean: {statistics.mean(latencies) * 1000:.0f} ms")
+    for pct in (50, 90, 95, 99):
+        print(f"Latency p{pct}:  {percentile(latencies, pct) * 1000:.0f} ms")
+    print("Status codes: " + ", ".join(f"{code or 'error'}={count}" for code, count in sorted(statuses.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /apply endpoint")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--job-id", required=True)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.job_id, args.requests, args.concurrency, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Rebuild the job_stats table from the applications table.
+
+    python scripts/rebuild_job_stats.py            # all jobs
+    python scripts/rebuild_job_stats.py --job-id <uuid>
+
+Use this after manual data fixes or whenever the incrementally maintained
+statistics are suspected to have drifted.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import write_session  # noqa: E402
+from app.services.job_stats import job_stats_service  # noqa: E402
+
+
+async def rebuild(job_id: UUID = None):
+    async with write_session() as db:
+        count = await job_stats_service.rebuild(db, job_id)
+    print(f"Rebuilt statistics for {count} job(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-job pipeline statistics")
+    parser.add_argument("--job-id", type=UUID, default=None, help="Rebuild a single job")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.job_id))
+
+
+if __name__ == "__main__":
+    main()
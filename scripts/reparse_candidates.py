@@ -0,0 +1,75 @@
+"""
+Re-parse stored CVs of candidates parsed by an older parser version.
+
+    python scripts/reparse_candidates.py                      # re-parse online (direct LLM calls)
+    python scripts/reparse_candidates.py --submit             # write batch request files
+    python scripts/reparse_candidates.py --complete-locally   # answer pending batches with the configured provider
+    python scripts/reparse_candidates.py --ingest             # apply result files that have arrived
+
+Only candidates whose parser_version differs from the current PARSER_VERSION
+(bump PARSE_PROMPT_REVISION in app/services/ai_parser.py when the prompt
+changes) are selected, in keyset batches, so an interrupted run resumes by
+running it again. skills, experience_years and education are refreshed; CV
+text is read from the text cache or extracted again from storage.
+
+Batch mode writes <batch>.requests.jsonl files (OpenAI batch input format)
+to REPARSE_BATCH_DIR and ingests <batch>.results.jsonl files once they exist;
+upload and download them with the provider's batch tooling, or use
+--complete-locally to answer them with LLM_PROVIDER_MODE (e.g. synthetic or
+replay). Progress is kept in REPARSE_BATCH_DIR/state.json.
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import write_session  # noqa: E402
+from app.services.ai_parser import PARSER_VERSION  # noqa: E402
+from app.services.batch_llm import LocalBatchSubmitter  # noqa: E402
+from app.services.reparse import candidate_reparse_service  # noqa: E402
+
+
+async def run(args):
+    print(f"Parser version {PARSER_VERSION}")
+    submitter = LocalBatchSubmitter()
+
+    if args.submit:
+        async with write_session() as db:
+            summary = await candidate_reparse_service.submit_batches(db, submitter, args.batch_size, args.limit)
+        print(
+            f"Submitted {summary.submitted} request(s) for {summary.processed} candidate(s); "
+            f"{summary.updated} parsed locally, {summary.failed} unreadable, {summary.cached_text} from cached text"
+        )
+    if args.complete_locally:
+        for batch_id in candidate_reparse_service.load_state()["pending"]:
+            if not submitter.results_path(batch_id).exists():
+                answered = await submitter.complete_locally(batch_id, candidate_reparse_service.parser.provider, "parse_cv")
+                print(f"Answered {answered} request(s) of {batch_id}")
+    if args.ingest:
+        async with write_session() as db:
+            summary = await candidate_reparse_service.ingest_batches(db, submitter)
+        pending = len(candidate_reparse_service.load_state()["pending"])
+        print(f"Updated {summary.updated} candidate(s), {summary.failed} failed; {pending} batch(es) still pending")
+    if not (args.submit or args.complete_locally or args.ingest):
+        async with write_session() as db:
+            summary = await candidate_reparse_service.reparse(db, args.batch_size, args.limit)
+        print(
+            f"Re-parsed {summary.updated} of {summary.processed} candidate(s), {summary.failed} failed, "
+            f"{summary.cached_text} from cached text"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse candidates parsed by an older parser version")
+    parser.add_argument("--submit", action="store_true", help="Write batch request files instead of calling the LLM")
+    parser.add_argument("--complete-locally", action="store_true", help="Answer pending batches with the configured provider")
+    parser.add_argument("--ingest", action="store_true", help="Apply batch result files that have arrived")
+    parser.add_argument("--batch-size", type=int, default=None, help="Candidates per keyset batch")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many candidates")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
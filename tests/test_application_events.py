@@ -0,0 +1,81 @@
+"""Tests for SSE subscriptions catching up from the event log."""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.application_events import REPLAY_ID_OVERLAP, Subscription
+
+
+def event(event_id):
+    return {"id": event_id, "job_id": None, "new_status": "scored"}
+
+
+class FakeBroker:
+    def __init__(self, log, high_water=0):
+        self.log = log
+        self.high_water = high_water
+        self.replays = []
+
+    async def high_water_id(self):
+        return self.high_water
+
+    async def replay(self, after_id, job_id=None):
+        self.replays.append(after_id)
+        for logged in sorted(self.log, key=lambda item: item["id"]):
+            if logged["id"] > after_id:
+                yield logged
+
+
+async def collect(subscription, broker, count, last_event_id=None):
+    received = []
+    async for item in subscription.events(broker, last_event_id):
+        if item is not None:
+            received.append(item["id"])
+        if len(received) == count:
+            break
+    return received
+
+
+@pytest.fixture(autouse=True)
+def short_keepalive(monkeypatch):
+    monkeypatch.setattr(settings, "events_keepalive_seconds", 0.01)
+
+
+@pytest.mark.asyncio
+async def test_overflow_before_first_delivery_replays_from_subscription():
+    broker = FakeBroker([event(5), event(11), event(12), event(13)], high_water=10)
+    subscription = Subscription(None, queue_size=2)
+    for event_id in (11, 12, 13):
+        subscription.deliver(event(event_id))
+    assert subscription.stale
+
+    received = await asyncio.wait_for(collect(subscription, broker, 3), timeout=1)
+    assert received == [11, 12, 13]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_includes_lower_ids_committed_late():
+    broker = FakeBroker([event(20), event(21)], high_water=19)
+    subscription = Subscription(None, queue_size=8)
+    subscription.deliver(event(21))
+
+    async def late_commit():
+        await asyncio.sleep(0.05)
+        # Id 20 was assigned before 21 but committed after it; its NOTIFY was missed
+        subscription.mark_stale()
+
+    task = asyncio.create_task(late_commit())
+    received = await asyncio.wait_for(collect(subscription, broker, 2), timeout=1)
+    await task
+    assert received == [21, 20]
+    assert broker.replays == [max(21 - REPLAY_ID_OVERLAP, 19)]
+
+
+@pytest.mark.asyncio
+async def test_resume_replays_strictly_after_last_event_id():
+    broker = FakeBroker([event(1), event(2), event(3)])
+    subscription = Subscription(None, queue_size=8)
+    received = await asyncio.wait_for(collect(subscription, broker, 2, last_event_id=1), timeout=1)
+    assert received == [2, 3]
+    assert broker.replays == [1]
@@ -0,0 +1,136 @@
+"""Tests for scoring in the application pipeline and the deferred worker's retries."""
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.models.application import Application
+from app.services import application_pipeline
+from app.services.application_pipeline import (
+    DEFERRED_STATUS, FAILED_STATUS, ApplicationPipeline, DeferredApplicationWorker
+)
+from app.services.llm_provider import LLMTimeoutError
+
+CANDIDATE_VALUES = {
+    "name": "Jane Doe",
+    "skills": ["Python", "SQL"],
+    "experience_years": 4,
+    "education": "Bachelor of Computer Science"
+}
+
+
+class FailingScorer:
+    async def score_candidate(self, candidate_profile, requirements):
+        raise ValueError("malformed LLM response")
+
+
+def make_job():
+    return SimpleNamespace(
+        id=uuid.uuid4(), title="Backend Engineer", jd_text="Python and SQL, 3+ years",
+        required_skills=["Python", "SQL"], requirements=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_scoring_leaves_scores_unset(monkeypatch):
+    monkeypatch.setattr(settings, "llm_fallback", "none")
+    pipeline = ApplicationPipeline(scorer=FailingScorer())
+    scores, status = await pipeline.score(make_job(), CANDIDATE_VALUES)
+    assert scores is None
+    assert status == "parsed"
+
+
+def test_unscored_application_is_stored_as_null():
+    scores_type = Application.__table__.c.scores.type
+    bind = scores_type.bind_processor(postgresql.dialect())
+    assert bind(None) is None
+    assert bind({"overall_score": 80}) == '{"overall_score": 80}'
+
+
+class FailingStorage:
+    def __init__(self, error):
+        self.error = error
+
+    def object_name_from_url(self, url):
+        return url
+
+    async def download_file(self, object_name):
+        raise self.error
+
+
+def leased_application(attempts=1):
+    candidate = SimpleNamespace(
+        id=uuid.uuid4(), name="Unknown", email="x@example.com", phone=None, linkedin=None, resume_url="resumes/cv.pdf"
+    )
+    return SimpleNamespace(
+        id=uuid.uuid4(), job_id=uuid.uuid4(), job=make_job(), candidate=candidate,
+        status=DEFERRED_STATUS, scores=None, attempts=attempts, leased_until=datetime.utcnow(), updated_at=None
+    )
+
+
+@pytest.fixture
+def worker_db(monkeypatch):
+    """Deferred worker transactions against a fake session; reclaims return ``state['application']``."""
+    state = {"application": None, "events": []}
+
+    @asynccontextmanager
+    async def fake_session():
+        yield SimpleNamespace()
+
+    async def reclaim(self, db, application_id, attempt):
+        return state["application"]
+
+    async def record(db, changes):
+        state["events"].append(changes.params()["new_statuses"])
+
+    async def apply_stats(db, delta):
+        pass
+
+    monkeypatch.setattr(application_pipeline, "write_session", fake_session)
+    monkeypatch.setattr(DeferredApplicationWorker, "_reclaim", reclaim)
+    monkeypatch.setattr(application_pipeline.application_event_broker, "record", record)
+    monkeypatch.setattr(application_pipeline.job_stats_service, "apply", apply_stats)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_only_real_failures_use_up_attempts(monkeypatch, worker_db):
+    released = []
+
+    async def release(self, application_id, attempt, counted):
+        released.append(counted)
+
+    monkeypatch.setattr(DeferredApplicationWorker, "_release", release)
+    for error, counted in ((LLMTimeoutError("slow"), False), (ValueError("corrupt PDF"), True)):
+        worker = DeferredApplicationWorker(ApplicationPipeline(storage=FailingStorage(error)))
+        assert await worker._process(leased_application(), 1) is None
+        assert released.pop() is counted
+
+
+@pytest.mark.asyncio
+async def test_release_retries_then_fails_terminally(monkeypatch, worker_db):
+    monkeypatch.setattr(settings, "admission_deferred_max_attempts", 2)
+    worker = DeferredApplicationWorker(ApplicationPipeline())
+
+    worker_db["application"] = application = leased_application(attempts=1)
+    await worker._release(application.id, 1, counted=True)
+    assert application.status == DEFERRED_STATUS
+    assert application.leased_until is None
+
+    worker_db["application"] = application = leased_application(attempts=2)
+    await worker._release(application.id, 2, counted=True)
+    assert application.status == FAILED_STATUS
+    assert worker_db["events"] == [[FAILED_STATUS]]
+
+
+@pytest.mark.asyncio
+async def test_postponed_attempt_is_not_counted(worker_db):
+    worker = DeferredApplicationWorker(ApplicationPipeline())
+    worker_db["application"] = application = leased_application(attempts=3)
+    await worker._release(application.id, 3, counted=False)
+    assert application.attempts == 2
+    assert application.status == DEFERRED_STATUS
@@ -0,0 +1,141 @@
+"""Tests for POST /apply with the database and storage side effects replaced."""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import applications
+from app.database import get_db
+from app.main import app
+from app.services.application_pipeline import DuplicateApplicationError
+
+JOB = SimpleNamespace(
+    id=uuid.uuid4(), title="Backend Engineer", jd_text="Python and SQL, 3+ years",
+    required_skills=["Python", "SQL"], requirements=None
+)
+CV_TEXT = "Nguyen Van A\nnguyen@example.com\nSkills: Python, SQL\n5 years of experience"
+
+
+class FakeSession:
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_db():
+        yield FakeSession()
+
+    async def get_job(db, job_id):
+        return JOB
+
+    async def persist(db, job_id, candidate_values, status, scores):
+        now = datetime.utcnow()
+        return SimpleNamespace(
+            id=uuid.uuid4(), job_id=job_id, candidate_id=uuid.uuid4(), status=status, scores=scores,
+            created_at=now, updated_at=now
+        )
+
+    async def nothing(*args, **kwargs):
+        return None
+
+    pipeline = applications.application_pipeline
+    monkeypatch.setattr(applications, "_get_job", get_job)
+    monkeypatch.setattr(applications, "_persist_application", persist)
+    monkeypatch.setattr(applications.job_stats_service, "apply", nothing)
+    monkeypatch.setattr(applications.application_event_broker, "record", nothing)
+    monkeypatch.setattr(applications.candidate_dedup_service, "index", nothing)
+    monkeypatch.setattr(applications.score_calibration_service, "calibrate_new_applications", nothing)
+    monkeypatch.setattr(pipeline, "_find_duplicate", nothing)
+    monkeypatch.setattr(pipeline.parser, "extract_text", lambda *args, **kwargs: CV_TEXT)
+    monkeypatch.setitem(app.dependency_overrides, get_db, fake_db)
+    # No lifespan: startup would check the schema of a real database
+    return TestClient(app)
+
+
+def test_apply_persists_inside_its_span(client):
+    response = client.post(
+        "/api/v1/apply",
+        data={"job_id": str(JOB.id), "email": "a@example.com"},
+        files={"cv_file": ("cv.pdf", b"%PDF-1.4 x", "application/pdf")}
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["status"] == "scored"
+
+
+def test_finalize_requires_the_issued_upload_token(client):
+    object_name = f"resumes/{uuid.uuid4()}.pdf"
+    response = client.post("/api/v1/apply/finalize", json={
+        "job_id": str(JOB.id), "object_name": object_name, "upload_token": "0.forged", "email": "a@example.com"
+    })
+    assert response.status_code == 403
+
+
+def apply(client):
+    return client.post(
+        "/api/v1/apply",
+        data={"job_id": str(JOB.id), "email": "a@example.com"},
+        files={"cv_file": ("cv.pdf", b"%PDF-1.4 x", "application/pdf")}
+    )
+
+
+@pytest.fixture
+def deleted(monkeypatch):
+    names = []
+
+    async def delete_file(object_name):
+        names.append(object_name)
+        return True
+
+    monkeypatch.setattr(applications.storage_service, "delete_file", delete_file)
+    return names
+
+
+def test_upload_is_removed_when_candidate_already_applied(client, monkeypatch, deleted):
+    async def already_applied(*args, **kwargs):
+        raise DuplicateApplicationError(None, [JOB.id])
+
+    monkeypatch.setattr(applications, "_persist_application", already_applied)
+    assert apply(client).status_code == 409
+    assert len(deleted) == 1 and deleted[0].startswith("resumes/")
+
+
+def test_upload_is_removed_when_analysis_fails(client, monkeypatch, deleted):
+    async def broken(*args, **kwargs):
+        raise RuntimeError("extraction crashed")
+
+    monkeypatch.setattr(applications.application_pipeline, "analyze_many", broken)
+    assert apply(client).status_code == 500
+    assert len(deleted) == 1
+
+
+def test_upload_is_kept_for_stored_applications(client, deleted):
+    assert apply(client).status_code == 201
+    assert deleted == []
+
+
+def test_finalize_maps_an_existing_application_to_409(client, monkeypatch):
+    object_name = f"resumes/{uuid.uuid4()}.pdf"
+
+    async def not_finalized(statement):
+        return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+    async def uploaded(name):
+        return 1024, "application/pdf"
+
+    async def already_applied(*args, **kwargs):
+        raise DuplicateApplicationError(None, [JOB.id])
+
+    monkeypatch.setattr(FakeSession, "execute", lambda self, statement: not_finalized(statement), raising=False)
+    monkeypatch.setattr(applications, "verify_upload_token", lambda *args: True)
+    monkeypatch.setattr(applications.storage_service, "stat_file", uploaded)
+    monkeypatch.setattr(applications, "_persist_application", already_applied)
+    response = client.post("/api/v1/apply/finalize", json={
+        "job_id": str(JOB.id), "object_name": object_name, "upload_token": "t", "email": "a@example.com"
+    })
+    assert response.status_code == 409
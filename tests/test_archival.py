@@ -0,0 +1,89 @@
+"""Tests for cold archival of CVs and partition provisioning."""
+import contextlib
+import gzip
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.archival import PARTITION_LOCK_KEY, ArchivalService
+from app.services.storage import StorageService
+from app.services.synthetic_storage import get_synthetic_object_store
+
+
+class CVSession:
+    """Returns one cold-eligible candidate, then applies the resume_url UPDATE if it still matches."""
+
+    def __init__(self, candidate_id, resume_url, current_url):
+        self.row = (candidate_id, resume_url)
+        self.current_url = current_url
+        self.executed = 0
+
+    async def execute(self, statement, params=None):
+        self.executed += 1
+        if self.executed == 1:
+            return SimpleNamespace(all=lambda: [self.row])
+        expected = statement.whereclause.compile().params
+        matches = self.row[1] in expected.values() and self.current_url == self.row[1]
+        return SimpleNamespace(rowcount=1 if matches else 0)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+async def uploaded_cv(storage):
+    object_name = f"resumes/{uuid.uuid4()}.pdf"
+    url = await storage.upload_file(b"%PDF-1.4 cv", object_name, "application/pdf")
+    return object_name, url
+
+
+@pytest.mark.asyncio
+async def test_cv_moves_to_the_cold_prefix():
+    storage = StorageService(client=get_synthetic_object_store())
+    object_name, url = await uploaded_cv(storage)
+
+    moved = await ArchivalService(storage).archive_cvs(CVSession(uuid.uuid4(), url, current_url=url))
+
+    assert moved == 1
+    assert await storage.stat_file(object_name) is None
+    assert gzip.decompress(await storage.download_file(f"cold/{object_name}.gz")) == b"%PDF-1.4 cv"
+
+
+@pytest.mark.asyncio
+async def test_replaced_cv_stays_hot_and_cold_copy_is_removed():
+    storage = StorageService(client=get_synthetic_object_store())
+    object_name, url = await uploaded_cv(storage)
+    _, new_url = await uploaded_cv(storage)
+
+    moved = await ArchivalService(storage).archive_cvs(CVSession(uuid.uuid4(), url, current_url=new_url))
+
+    assert moved == 0
+    assert await storage.stat_file(object_name) is not None
+    assert await storage.stat_file(f"cold/{object_name}.gz") is None
+
+
+class DDLSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+
+    @contextlib.asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_partitions_are_provisioned_under_the_advisory_lock():
+    session = DDLSession()
+
+    names = await ArchivalService().ensure_partitions(session, months_ahead=1)
+
+    assert len(names) == 2
+    first, params = session.statements[0]
+    assert first == "SELECT pg_advisory_xact_lock(:key)" and params == {"key": PARTITION_LOCK_KEY}
+    assert all("CREATE TABLE IF NOT EXISTS" in statement for statement, _ in session.statements[1:])
@@ -0,0 +1,164 @@
+"""Tests for CV signatures, LSH buckets, duplicate verification and merging."""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import candidate_dedup
+from app.services.application_events import REMOVED_STATUS
+from app.services.candidate_dedup import (
+    LINKEDIN_BAND, LSH_BANDS, MINHASH_PERMUTATIONS, PHONE_BAND, CandidateDedupService, cv_signature,
+    estimated_similarity, is_placeholder_email, lsh_buckets, minhash, name_similarity, normalize_linkedin,
+    normalize_phone, normalize_text, placeholder_email
+)
+
+CV = (
+    "Nguyễn Văn An, backend engineer. Six years building Python services with FastAPI and PostgreSQL, "
+    "running Kubernetes clusters on AWS, leading a team of four engineers and mentoring interns. "
+    "Bachelor of Computer Science, Hanoi University of Science and Technology."
+)
+OTHER_CV = (
+    "Tran Thi Binh, product designer. Figma, user research, design systems and accessibility audits "
+    "for mobile banking apps; previously a graphic designer at an advertising agency in Da Nang."
+)
+
+
+def row(**values):
+    return {"minhash": None, "name": None, "phone": None, "linkedin": None, **values}
+
+
+def test_normalization():
+    assert normalize_text("Nguyễn  Đức-Anh!") == "nguyen duc anh"
+    assert normalize_phone("+84 912 345 678") == normalize_phone("0912345678") == "912345678"
+    assert normalize_phone("12345") is None
+    assert normalize_linkedin("https://www.linkedin.com/in/Jane-Doe/") == "jane-doe"
+    assert normalize_linkedin("jane-doe") == "jane-doe"
+
+
+def test_signature_is_deterministic_and_sized():
+    signature = cv_signature(CV)
+    assert len(signature) == MINHASH_PERMUTATIONS
+    assert cv_signature(CV) == signature
+    assert minhash([]) is None
+    assert cv_signature("") is None
+
+
+def test_similarity_separates_reformatted_and_unrelated_cvs():
+    reformatted = CV.upper().replace(",", " ;")
+    assert estimated_similarity(cv_signature(CV), cv_signature(reformatted)) == 1.0
+    edited = CV.replace("four engineers", "five engineers")
+    assert estimated_similarity(cv_signature(CV), cv_signature(edited)) > 0.7
+    assert estimated_similarity(cv_signature(CV), cv_signature(OTHER_CV)) < 0.2
+    assert estimated_similarity(cv_signature(CV), None) is None
+
+
+def test_near_duplicates_share_a_band_bucket():
+    original = set(lsh_buckets(cv_signature(CV)))
+    edited = set(lsh_buckets(cv_signature(CV.replace("four engineers", "five engineers"))))
+    unrelated = set(lsh_buckets(cv_signature(OTHER_CV)))
+    assert len(original) == LSH_BANDS
+    assert original & edited
+    assert not original & unrelated
+
+
+def test_identity_buckets_match_across_formats():
+    first = lsh_buckets(None, phone="+84 912 345 678", linkedin="linkedin.com/in/an-nguyen")
+    second = lsh_buckets(None, phone="0912 345 678", linkedin="https://www.linkedin.com/in/AN-NGUYEN/")
+    assert [band for band, _ in first] == [PHONE_BAND, LINKEDIN_BAND]
+    assert first == second
+
+
+def test_verify_by_cv_text():
+    service = CandidateDedupService()
+    signature = cv_signature(CV)
+    similarity, matched_on = service.verify(row(minhash=signature), signature, None, None, None)
+    assert similarity == 1.0 and matched_on == ["cv_text"]
+    assert service.verify(row(minhash=cv_signature(OTHER_CV)), signature, None, None, None) is None
+
+
+def test_verify_identity_keys_need_a_similar_name():
+    service = CandidateDedupService()
+    known = row(name="Nguyen Van An", phone="0912345678", linkedin="an-nguyen")
+    assert service.verify(known, None, "+84 912 345 678", "linkedin.com/in/an-nguyen", "Nguyễn Văn An")[1] == [
+        "phone", "linkedin"
+    ]
+    # A shared phone (e.g. a recruiter's) with a different name is not a duplicate
+    assert service.verify(known, None, "0912345678", None, "Tran Thi Binh") is None
+    assert name_similarity("Nguyen Van An", "Nguyễn Văn An") == 1.0
+
+
+def test_placeholder_emails():
+    assert is_placeholder_email(placeholder_email())
+    assert not is_placeholder_email("an@example.com")
+    assert not is_placeholder_email(None)
+
+
+class MergeSession:
+    """Answers the merge's candidate and application reads and records the writes that follow."""
+
+    def __init__(self, candidates, applications):
+        self.reads = [
+            SimpleNamespace(mappings=lambda: candidates),
+            SimpleNamespace(all=lambda: applications),
+        ]
+        self.writes = []
+
+    async def execute(self, statement, params=None):
+        if self.reads:
+            return self.reads.pop(0)
+        self.writes.append(statement)
+        return SimpleNamespace(rowcount=1)
+
+
+def candidate(candidate_id, email):
+    return {
+        "id": candidate_id, "email": email, "name": "Nguyen Van An", "phone": None, "linkedin": None,
+        "experience_years": None, "education": None, "minhash": None, "skills": []
+    }
+
+
+def application(job_id, candidate_id, status, updated_minutes):
+    return SimpleNamespace(
+        id=uuid.uuid4(), job_id=job_id, candidate_id=candidate_id, status=status, scores=None,
+        updated_at=datetime(2024, 1, 1) + timedelta(minutes=updated_minutes)
+    )
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_the_most_advanced_application_per_job(monkeypatch):
+    service = CandidateDedupService()
+    target_id, duplicate_id = uuid.uuid4(), uuid.uuid4()
+    decided_job, pipeline_job, tied_job, own_job = (uuid.uuid4() for _ in range(4))
+    applications = [
+        application(decided_job, target_id, "rejected", 0),
+        application(decided_job, duplicate_id, "shortlisted", 0),
+        application(pipeline_job, target_id, "scored", 5),
+        application(pipeline_job, duplicate_id, "applied", 9),
+        application(tied_job, target_id, "scored", 1),
+        application(tied_job, duplicate_id, "scored", 2),
+        application(own_job, duplicate_id, "parsed", 0),
+    ]
+    session = MergeSession(
+        [candidate(target_id, "an@example.com"), candidate(duplicate_id, placeholder_email())], applications
+    )
+    recorded = {}
+
+    async def record_events(db, changes):
+        recorded["events"] = changes.params()
+
+    async def nothing(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(candidate_dedup.application_event_broker, "record", record_events)
+    monkeypatch.setattr(candidate_dedup.job_stats_service, "apply", nothing)
+    monkeypatch.setattr(service, "index", nothing)
+
+    result = await service.merge(session, target_id, [duplicate_id])
+
+    assert set(result.moved_application_ids) == {applications[1].id, applications[5].id, applications[6].id}
+    assert set(result.removed_application_ids) == {applications[0].id, applications[3].id, applications[4].id}
+    events = recorded["events"]
+    assert set(events["application_ids"]) == set(result.removed_application_ids)
+    assert set(events["new_statuses"]) == {REMOVED_STATUS}
+    assert sorted(events["old_statuses"]) == ["applied", "rejected", "scored"]
@@ -0,0 +1,103 @@
+"""Tests for the circuit breaker's window, half-open trial call and call permissions."""
+import pytest
+
+from app.utils import circuit_breaker
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker("test", failure_ratio=0.5, min_calls=4, window_seconds=60, cooldown_seconds=30)
+
+
+def trip(b: CircuitBreaker):
+    while b.state == CLOSED:
+        b.record_failure(b.allow())
+
+
+def test_opens_only_after_min_calls_at_failure_ratio(clock):
+    b = breaker()
+    b.record_success(b.allow())
+    for _ in range(2):
+        b.record_failure(b.allow())
+    assert b.state == CLOSED
+    b.record_failure(b.allow())
+    assert b.state == OPEN
+    assert b.allow() is None
+
+
+def test_outcomes_leave_the_window(clock):
+    b = breaker()
+    for _ in range(3):
+        b.record_failure(b.allow())
+    clock.now += 61
+    b.record_failure(b.allow())
+    assert b.state == CLOSED
+    assert b.snapshot()["calls"] == 1
+
+
+def test_single_trial_call_after_cooldown(clock):
+    b = breaker()
+    trip(b)
+    clock.now += 29
+    assert b.allow() is None
+    clock.now += 1
+    trial = b.allow()
+    assert trial is not None and trial.trial
+    assert b.state == HALF_OPEN
+    assert b.allow() is None
+
+
+def test_trial_success_closes_and_failure_reopens(clock):
+    b = breaker()
+    trip(b)
+    clock.now += 30
+    b.record_success(b.allow())
+    assert b.state == CLOSED
+
+    trip(b)
+    clock.now += 30
+    b.record_failure(b.allow())
+    assert b.state == OPEN
+    assert b.times_opened == 3
+
+
+def test_released_trial_lets_another_through(clock):
+    b = breaker()
+    trip(b)
+    clock.now += 30
+    b.release(b.allow())
+    assert b.state == HALF_OPEN
+    assert b.allow().trial
+
+
+def test_calls_admitted_before_opening_do_not_decide_the_trial(clock):
+    b = breaker()
+    stale = [b.allow() for _ in range(3)]
+    trip(b)
+    clock.now += 30
+    trial = b.allow()
+
+    b.record_success(stale[0])
+    b.release(stale[1])
+    b.record_failure(stale[2])
+    assert b.state == HALF_OPEN
+    assert b.allow() is None
+
+    b.record_success(trial)
+    assert b.state == CLOSED
+    assert b.snapshot()["calls"] == 1
@@ -0,0 +1,78 @@
+"""Tests for Accept-Encoding negotiation and the compression middleware."""
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, negotiate_encoding
+
+
+def test_identity_when_nothing_acceptable():
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+
+
+def test_highest_q_value_wins():
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0") in (None, "br")
+
+
+def test_wildcard_and_malformed_q():
+    assert negotiate_encoding("*", ("gzip",)) == "gzip"
+    assert negotiate_encoding("gzip;q=abc", ("gzip",)) is None
+
+
+def test_restricted_encodings():
+    assert negotiate_encoding("br, gzip;q=0.5", ("gzip",)) == "gzip"
+    assert negotiate_encoding("br", ("gzip",)) is None
+    assert negotiate_encoding("GZIP; q=0.8", ("gzip",)) == "gzip"
+
+
+def test_prefers_brotli_on_ties_when_available(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate_encoding("gzip, br") == "gzip"
+
+
+def compressed_app(monkeypatch) -> TestClient:
+    monkeypatch.setattr(compression, "brotli", None)
+    monkeypatch.setattr(compression.settings, "compression_minimum_size", 100)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/rows")
+    def rows(count: int):
+        return JSONResponse([{"id": i, "title": "Backend engineer"} for i in range(count)])
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"data: 1\n\n" * 50]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped(monkeypatch):
+    client = compressed_app(monkeypatch)
+    response = client.get("/rows", params={"count": 50}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 50
+
+
+def test_small_and_unaccepted_responses_pass_through(monkeypatch):
+    client = compressed_app(monkeypatch)
+    small = client.get("/rows", params={"count": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert "Accept-Encoding" in small.headers["vary"]
+    identity = client.get("/rows", params={"count": 50}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert "Accept-Encoding" in identity.headers["vary"]
+
+
+def test_streaming_responses_are_not_buffered(monkeypatch):
+    client = compressed_app(monkeypatch)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content.startswith(b"data: 1")
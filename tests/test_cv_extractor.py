@@ -0,0 +1,53 @@
+"""Tests for the rule-based CV field extractor and the parser's fast path."""
+from app.services.ai_parser import AIParserService
+from app.services.cv_extractor import CVFieldExtractor, SkillMatcher
+from app.services.llm_provider import SyntheticProvider
+from app.utils.latency import LatencyModel
+
+CV_TEXT = """Jane Doe
+jane.doe@example.com | +84 912 345 678 | linkedin.com/in/jane-doe
+Skills: Python, FastAPI, PostgreSQL, Docker, Kubernetes, AWS
+Backend engineer with 6 years of experience
+Education: Bachelor of Computer Science, Hanoi University of Science and Technology
+"""
+
+
+def test_skill_matcher_respects_word_boundaries_and_order():
+    matcher = SkillMatcher(["Go", "Python", "SQL", "PostgreSQL"])
+    assert matcher.find("PostgreSQL and Python, going to Go") == ["PostgreSQL", "Python", "Go"]
+
+
+def test_extracts_contact_experience_and_education():
+    result = CVFieldExtractor().extract(CV_TEXT)
+    assert result.fields["name"] == "Jane Doe"
+    assert result.fields["email"] == "jane.doe@example.com"
+    assert result.fields["linkedin"] == "https://linkedin.com/in/jane-doe"
+    assert result.fields["phone"] == "+84 912 345 678"
+    assert result.fields["experience_years"] == 6
+    assert result.fields["education"].startswith("Bachelor of Computer Science")
+    assert result.confidence["email"] >= 0.9
+
+
+def test_date_ranges_are_not_phone_numbers():
+    result = CVFieldExtractor().extract("John Smith\nACME Corp 2015 - 2020\n")
+    assert "phone" not in result.fields
+
+
+def test_dictionary_skills_are_never_confident():
+    result = CVFieldExtractor().extract(CV_TEXT)
+    assert len(result.fields["skills"]) >= 6
+    assert result.confidence["skills"] < 0.8
+
+
+def test_skills_are_always_requested_from_the_llm():
+    parser = AIParserService(provider=SyntheticProvider(LatencyModel("fixed", 0.0)), extractor=CVFieldExtractor())
+    local_fields, missing_fields, request = parser.build_parse_request(CV_TEXT)
+    assert "skills" not in local_fields
+    assert "skills" in missing_fields
+    assert request is not None
+    assert local_fields["email"] == "jane.doe@example.com"
+
+
+def test_degraded_parse_uses_dictionary_skills():
+    parser = AIParserService(provider=SyntheticProvider(LatencyModel("fixed", 0.0)), extractor=CVFieldExtractor())
+    assert "FastAPI" in parser.parse_locally(CV_TEXT)["skills"]
@@ -0,0 +1,59 @@
+"""Tests for read session routing between the replica and the primary."""
+import pytest
+
+from app import database
+
+
+class FakeSession:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.closed = False
+
+    async def execute(self, statement):
+        if self.fail:
+            raise ConnectionRefusedError("replica down")
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    opened = []
+
+    def factory(name, fail=False):
+        def make():
+            session = FakeSession(name, fail)
+            opened.append(session)
+            return session
+        return make
+
+    async def healthy():
+        return database.replica_monitor.healthy
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory("primary"))
+    monkeypatch.setattr(database.replica_monitor, "is_healthy", healthy)
+    monkeypatch.setattr(database.replica_monitor, "healthy", True)
+    return factory, opened
+
+
+@pytest.mark.asyncio
+async def test_read_session_uses_healthy_replica(monkeypatch, sessions):
+    factory, _ = sessions
+    monkeypatch.setattr(database, "ReadSessionLocal", factory("replica"))
+    async with database.read_session() as session:
+        assert session.name == "replica"
+
+
+@pytest.mark.asyncio
+async def test_read_session_falls_back_to_primary_when_replica_connection_fails(monkeypatch, sessions):
+    factory, opened = sessions
+    monkeypatch.setattr(database, "ReadSessionLocal", factory("replica", fail=True))
+    async with database.read_session() as session:
+        assert session.name == "primary"
+    assert opened[0].name == "replica" and opened[0].closed
+    assert database.replica_monitor.healthy is False
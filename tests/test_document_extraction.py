@@ -0,0 +1,56 @@
+"""Tests for the extraction engine registry."""
+import pytest
+
+from app.services.document_extraction import (
+    DOCX_MIME_TYPE,
+    PDF_MIME_TYPE,
+    ExtractionEngine,
+    create_registry,
+    detect_mime_type,
+)
+from scripts.benchmark_extraction import build_docx, build_pdf, percentile
+
+PAGES = [["Jane Doe", "Skills: Python, SQL"], ["Second page line"], ["Third page line"]]
+
+
+def test_engine_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        ExtractionEngine()
+
+
+@pytest.mark.parametrize("engine", ["pypdf2", "pdfplumber"])
+def test_pdf_engines_extract_every_page(engine):
+    text = create_registry().extract_text(build_pdf(PAGES), PDF_MIME_TYPE, engine_name=engine)
+    assert "Jane Doe" in text
+    assert "Third page line" in text
+
+
+def test_max_chars_stops_reading_further_pages():
+    registry = create_registry()
+    pages = list(registry.iter_text(build_pdf(PAGES), PDF_MIME_TYPE, max_chars=5, engine_name="pypdf2"))
+    assert len(pages) == 1
+    assert len(registry.extract_text(build_pdf(PAGES), PDF_MIME_TYPE, max_chars=5)) == 5
+
+
+def test_docx_engine_reads_header_body_and_table():
+    text = create_registry().extract_text(build_docx(PAGES), DOCX_MIME_TYPE)
+    assert text.count("Jane Doe") == 2
+    assert "Second page line" in text
+
+
+def test_detect_mime_type():
+    assert detect_mime_type("cv.PDF") == PDF_MIME_TYPE
+    assert detect_mime_type("upload", DOCX_MIME_TYPE) == DOCX_MIME_TYPE
+    with pytest.raises(ValueError):
+        detect_mime_type("cv.txt")
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        create_registry().get(PDF_MIME_TYPE, "docx")
+
+
+def test_benchmark_p95_is_nearest_rank():
+    assert percentile([1.0, 2.0, 3.0, 4.0, 100.0], 0.95) == 100.0
+    assert percentile(list(range(1, 101)), 0.95) == 95
+    assert percentile([7.0], 0.95) == 7.0
@@ -0,0 +1,36 @@
+"""Tests for sparse fieldset parsing and serialization."""
+import json
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from app.schemas.job import JobResponse
+from app.utils.fieldsets import FieldsetError, parse_fields, sparse_response
+
+
+def test_missing_or_blank_fields_select_everything():
+    assert parse_fields(None, JobResponse) is None
+    assert parse_fields("", JobResponse) is None
+    assert parse_fields(" , ", JobResponse) is None
+
+
+def test_fields_follow_declaration_order_after_always():
+    names = parse_fields(" status , title,title", JobResponse)
+    assert names[0] == "id"
+    assert names[1:] == [name for name in JobResponse.model_fields if name in ("title", "status")]
+
+
+def test_id_is_not_repeated():
+    assert parse_fields("id,status", JobResponse).count("id") == 1
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(FieldsetError, match="Unknown fields: password, salary"):
+        parse_fields("title,salary,password", JobResponse)
+
+
+def test_sparse_response_serializes_rows_by_name():
+    job_id = UUID("12345678-1234-5678-1234-567812345678")
+    response = sparse_response([(job_id, datetime(2024, 1, 2, 3, 4, 5))], ["id", "created_at"])
+    assert json.loads(response.body) == [{"id": str(job_id), "created_at": "2024-01-02T03:04:05"}]
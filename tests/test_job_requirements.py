@@ -0,0 +1,84 @@
+"""Tests for compiling job descriptions into scoring requirements."""
+from types import SimpleNamespace
+
+from app.services import job_requirements
+from app.services.job_requirements import (
+    REQUIREMENTS_VERSION,
+    JobRequirementsCompiler,
+    education_rank,
+    skill_coverage,
+)
+
+JD_TEXT = """We build APIs for recruiters.
+Requirements:
+- 3-5 years of experience with Python and Docker
+- Experience with REST API design
+- Bachelor's or Master's degree in Computer Science
+Nice to have: Kubernetes"""
+
+
+def compile_job(title="Backend Engineer", jd_text=JD_TEXT, skills=("python", " Docker ", "REST API", "Python")):
+    return JobRequirementsCompiler().compile(title, jd_text, list(skills))
+
+
+def test_skills_are_canonical_and_unique():
+    requirements = compile_job()
+    assert requirements["skills"] == ["Python", "Docker", "REST API"]
+    assert requirements["skill_keys"] == ["python", "docker", "rest api"]
+
+
+def test_keywords_skip_required_skills():
+    requirements = compile_job()
+    assert requirements["keywords"] == ["Kubernetes"]
+    assert requirements["keyword_keys"] == ["kubernetes"]
+
+
+def test_experience_range_and_minimum():
+    assert compile_job()["experience_years"] == {"min": 3.0, "max": 5.0}
+    # The largest "N+ years" is the bar; implausible numbers are ignored
+    minimum = compile_job(jd_text="2+ years Python, 4+ years SQL, founded 50 years ago")
+    assert minimum["experience_years"] == {"min": 4.0, "max": None}
+    assert compile_job(jd_text="Python developer")["experience_years"] == {"min": None, "max": None}
+
+
+def test_seniority_from_title_then_description_then_years():
+    assert compile_job(title="Senior Backend Engineer")["seniority"] == "senior"
+    assert compile_job(title="Backend Intern", jd_text="Lead our API work")["seniority"] == "intern"
+    assert compile_job(jd_text="Lead our API work")["seniority"] == "lead"
+    assert compile_job(jd_text="6+ years of Python")["seniority"] == "senior"
+    assert compile_job(jd_text="1 year of Python")["seniority"] == "junior"
+    assert compile_job(jd_text="Python developer")["seniority"] is None
+
+
+def test_education_is_the_lowest_degree_accepted():
+    assert compile_job()["education_rank"] == 1
+    assert compile_job(jd_text="PhD in machine learning")["education_rank"] == 3
+    assert education_rank("Master of Science, Bachelor of Engineering") == 2
+    assert education_rank(None) is None
+
+
+def test_summary_keeps_requirement_lines_within_budget(monkeypatch):
+    monkeypatch.setattr(job_requirements.settings, "job_summary_max_chars", 100)
+    summary = compile_job()["summary"]
+    assert len(summary) <= 100
+    assert "3-5 years of experience with Python and Docker" in summary
+    assert "We build APIs" not in summary
+    assert not summary.startswith("-")
+
+
+def test_skill_coverage():
+    requirements = compile_job()
+    assert skill_coverage(["python", "DOCKER", "Go"], requirements) == 2 / 3
+    assert skill_coverage(["Python"], {"skill_keys": []}) is None
+
+
+def test_for_job_recompiles_only_outdated_requirements():
+    compiler = JobRequirementsCompiler()
+    stored = {"version": REQUIREMENTS_VERSION, "skills": ["Stored"]}
+    job = SimpleNamespace(title="Backend Engineer", jd_text=JD_TEXT, required_skills=["Python"], requirements=stored)
+    assert compiler.for_job(job) is stored
+
+    job.requirements = {**stored, "version": REQUIREMENTS_VERSION - 1}
+    assert compiler.for_job(job)["skills"] == ["Python"]
+    job.requirements = None
+    assert compiler.for_job(job)["version"] == REQUIREMENTS_VERSION
@@ -0,0 +1,52 @@
+"""Tests for accumulating per-job statistics deltas."""
+import uuid
+
+from app.models.job_stats import SCORE_BUCKET_COUNT
+from app.services.job_stats import JobStatsDelta, overall_score, score_bucket
+
+
+def test_overall_score_ignores_missing_and_non_numeric_values():
+    assert overall_score(None) is None
+    assert overall_score({}) is None
+    assert overall_score({"overall_score": "high"}) is None
+    assert overall_score({"overall_score": 72}) == 72.0
+
+
+def test_score_bucket_clamps_to_histogram():
+    assert score_bucket(0) == 0
+    assert score_bucket(-5) == 0
+    assert score_bucket(100) == SCORE_BUCKET_COUNT - 1
+
+
+def test_created_then_rescored_application():
+    job_id = uuid.uuid4()
+    delta = JobStatsDelta()
+    delta.created(job_id, "parsed", None)
+    delta.changed(job_id, "parsed", "scored", None, {"overall_score": 80})
+
+    (params,) = delta.params()
+    assert params["total_count"] == 1
+    # "parsed" went +1 then -1 and is left out
+    assert params["status_counts"] == {"scored": 1}
+    assert params["score_count"] == 1
+    assert params["score_sum"] == 80
+    assert params["score_sum_sq"] == 6400
+    assert sum(params["score_histogram"]) == 1
+    assert params["score_histogram"][score_bucket(80)] == 1
+
+
+def test_unchanged_application_records_nothing():
+    delta = JobStatsDelta()
+    delta.changed(uuid.uuid4(), "scored", "scored", {"overall_score": 50}, {"overall_score": 50})
+    assert not delta
+
+
+def test_removed_application_is_subtracted():
+    job_id = uuid.uuid4()
+    delta = JobStatsDelta()
+    delta.removed(job_id, "scored", {"overall_score": 40})
+
+    (params,) = delta.params()
+    assert params["total_count"] == -1
+    assert params["status_counts"] == {"scored": -1}
+    assert params["score_histogram"][score_bucket(40)] == -1
@@ -0,0 +1,92 @@
+"""Tests for the LLM provider abstraction and its record/replay and synthetic stand-ins."""
+import asyncio
+import json
+
+import pytest
+
+from app.services.llm_provider import (
+    CassetteMissError,
+    LLMProvider,
+    LLMRateLimitError,
+    RecordingProvider,
+    ReplayProvider,
+    SyntheticProvider,
+    request_key,
+)
+from app.utils.latency import LatencyModel
+
+MESSAGES = [{"role": "user", "content": "Parse this CV"}]
+
+
+def synthetic(**kwargs) -> SyntheticProvider:
+    return SyntheticProvider(LatencyModel("fixed", 0.0), seed=7, **kwargs)
+
+
+def test_provider_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        LLMProvider()
+
+
+def test_request_key_is_stable_and_request_specific():
+    key = request_key("parse_cv", "gpt-4.1-mini", MESSAGES)
+    assert key == request_key("parse_cv", "gpt-4.1-mini", [dict(MESSAGES[0])])
+    assert key != request_key("score_candidate", "gpt-4.1-mini", MESSAGES)
+    assert key != request_key("parse_cv", "gpt-4.1", MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_synthetic_responses_are_deterministic_per_request():
+    first = await synthetic().complete("score_candidate", MESSAGES, "gpt-4.1-mini", 0.3, 500)
+    second = await synthetic().complete("score_candidate", MESSAGES, "gpt-4.1-mini", 0.3, 500)
+    scores = json.loads(first)
+    assert first == second
+    assert {"skill_fit", "experience_fit", "education_fit", "keyword_match"} <= scores.keys()
+
+
+@pytest.mark.asyncio
+async def test_synthetic_rate_limit_bursts():
+    provider = synthetic(rate_limit_burst_rate=1.0, rate_limit_burst_length=2)
+    with pytest.raises(LLMRateLimitError):
+        await provider.complete("parse_cv", MESSAGES, "gpt-4.1-mini", 0.0, 100)
+
+
+@pytest.mark.asyncio
+async def test_recorded_cassette_replays_exact_and_operation_matches(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    recorded = await RecordingProvider(synthetic(), str(cassette)).complete(
+        "parse_cv", MESSAGES, "gpt-4.1-mini", 0.0, 100
+    )
+
+    strict = ReplayProvider(str(cassette), strict=True)
+    assert await strict.complete("parse_cv", MESSAGES, "gpt-4.1-mini", 0.0, 100) == recorded
+    other = [{"role": "user", "content": "Another CV"}]
+    with pytest.raises(CassetteMissError):
+        await strict.complete("parse_cv", other, "gpt-4.1-mini", 0.0, 100)
+
+    lenient = ReplayProvider(str(cassette))
+    assert await lenient.complete("parse_cv", other, "gpt-4.1-mini", 0.0, 100) == recorded
+    with pytest.raises(CassetteMissError):
+        await lenient.complete("score_candidate", other, "gpt-4.1-mini", 0.0, 100)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_recordings_append_whole_lines(tmp_path, monkeypatch):
+    from app.services import llm_provider
+
+    cassette = tmp_path / "cassette.jsonl"
+    writes = []
+    to_thread = llm_provider.asyncio.to_thread
+
+    async def tracked_to_thread(func, *args):
+        writes.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(llm_provider.asyncio, "to_thread", tracked_to_thread)
+    recorder = RecordingProvider(synthetic(), str(cassette))
+    requests = [[{"role": "user", "content": f"CV {i}"}] for i in range(20)]
+    await asyncio.gather(*(recorder.complete("parse_cv", messages, "gpt-4.1-mini", 0.0, 100) for messages in requests))
+
+    entries = [json.loads(line) for line in cassette.read_text(encoding="utf-8").splitlines()]
+    assert len(entries) == 20
+    assert {entry["key"] for entry in entries} == {request_key("parse_cv", "gpt-4.1-mini", m) for m in requests}
+    assert writes == ["_append"] * 20
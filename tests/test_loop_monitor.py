@@ -0,0 +1,65 @@
+"""Tests for event-loop stall detection and attribution."""
+import asyncio
+import time
+import traceback
+
+import pytest
+
+from app.utils import loop_monitor
+from app.utils.loop_monitor import APP_DIR, LoopStallMonitor
+
+
+def stack(*frames) -> traceback.StackSummary:
+    return traceback.StackSummary.from_list([traceback.FrameSummary(path, line, name) for path, line, name in frames])
+
+
+def test_stall_is_attributed_to_the_innermost_app_frame():
+    monitor = LoopStallMonitor(interval=0.05, threshold=0.1)
+    monitor._record(stack(
+        (f"{APP_DIR}/main.py", 10, "handler"),
+        (f"{APP_DIR}/services/ai_parser.py", 42, "parse_cv"),
+        ("/venv/lib/python3.11/site-packages/PyPDF2/_reader.py", 300, "read"),
+    ), 0.25)
+
+    [offender] = monitor.top_offenders()
+    assert offender["location"] == "app/services/ai_parser.py:42 in parse_cv"
+    assert offender["blocking_call"] == "PyPDF2/_reader.py:300 in read"
+    assert offender["count"] == 1 and offender["max_seconds"] == 0.25
+    assert monitor.stalls == 1
+
+
+def test_locations_aggregate_and_least_stalled_is_evicted(monkeypatch):
+    monkeypatch.setattr(loop_monitor, "MAX_LOCATIONS", 2)
+    monitor = LoopStallMonitor(interval=0.05, threshold=0.1)
+    for name, duration in (("a", 0.5), ("b", 0.2), ("a", 0.3), ("c", 0.4)):
+        monitor._record(stack((f"{APP_DIR}/{name}.py", 1, name)), duration)
+
+    offenders = monitor.top_offenders()
+    assert [offender["location"] for offender in offenders] == ["app/a.py:1 in a", "app/c.py:1 in c"]
+    assert offenders[0]["count"] == 2 and offenders[0]["total_seconds"] == 0.8
+    assert monitor.stalled_seconds == pytest.approx(1.4)
+
+
+def test_snapshot_reports_lag_percentiles():
+    monitor = LoopStallMonitor(interval=0.05, threshold=0.1)
+    now = time.monotonic()
+    monitor._lags.extend((now, lag / 1000) for lag in range(100))
+
+    snapshot = monitor.snapshot()
+    assert snapshot["lag_ms"] == {"p50": 50.0, "p99": 99.0, "max": 99.0}
+    assert not snapshot["running"]
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_on_the_loop_is_detected():
+    monitor = LoopStallMonitor(interval=0.02, threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert monitor.stalls >= 1
+    assert "test_loop_monitor.py" in monitor.top_offenders(1)[0]["location"]
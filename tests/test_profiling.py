@@ -0,0 +1,91 @@
+"""Tests for the per-request profiling middleware."""
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils import profiling
+from app.utils.profiling import ProfilingMiddleware, profiling_configured
+
+TOKEN = "secret-token"
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling.settings, "profiling_token", TOKEN)
+    monkeypatch.setattr(profiling.settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(profiling.settings, "profiling_output_dir", str(tmp_path))
+    monkeypatch.setattr(profiling.settings, "profiling_format", "speedscope")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/work")
+    def work():
+        return {"total": sum(range(10000))}
+
+    return TestClient(app)
+
+
+def profiles(tmp_path: Path):
+    return sorted(path.name for path in tmp_path.iterdir())
+
+
+def test_installed_only_with_a_token_or_sample_rate(monkeypatch):
+    monkeypatch.setattr(profiling.settings, "profiling_token", None)
+    monkeypatch.setattr(profiling.settings, "profiling_sample_rate", 0.0)
+    assert not profiling_configured()
+    monkeypatch.setattr(profiling.settings, "profiling_sample_rate", 0.01)
+    assert profiling_configured()
+
+
+def test_requests_without_the_token_pass_through(client, tmp_path):
+    for headers in ({}, {"X-Profile": "wrong"}):
+        response = client.get("/work", headers=headers)
+        assert response.json() == {"total": 49995000}
+        assert "x-profile-path" not in response.headers
+    assert profiles(tmp_path) == []
+
+
+def test_authorized_request_writes_a_profile_file(client, tmp_path):
+    response = client.get("/work", headers={"X-Profile": TOKEN, "X-Request-ID": "slow-job-1"})
+
+    assert response.json() == {"total": 49995000}
+    assert response.headers["x-request-id"] == "slow-job-1"
+    path = Path(response.headers["x-profile-path"])
+    assert path.parent == tmp_path
+    assert path.name.startswith("slow-job-1-") and path.name.endswith(".speedscope.json")
+    assert "shared" in json.loads(path.read_text())
+
+
+def test_profiles_of_requests_sharing_an_id_are_kept_apart(client, tmp_path):
+    for _ in range(2):
+        client.get("/work", headers={"X-Profile": TOKEN, "X-Request-ID": "same"})
+    assert len(profiles(tmp_path)) == 2
+
+
+def test_client_request_id_cannot_leave_the_output_dir(client, tmp_path):
+    response = client.get("/work", headers={"X-Profile": TOKEN, "X-Request-ID": "../../etc/passwd"})
+    path = Path(response.headers["x-profile-path"])
+    assert path.parent == tmp_path
+    assert path.name.startswith("....etcpasswd-")
+
+
+def test_inline_profile_replaces_the_response(client, tmp_path):
+    response = client.get("/work", headers={"X-Profile": TOKEN, "X-Profile-Inline": "1", "X-Profile-Format": "html"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "x-request-id" in response.headers
+    assert "<html" in response.text.lower()
+    assert profiles(tmp_path) == []
+
+
+def test_sampled_requests_are_profiled_but_never_inline(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.settings, "profiling_sample_rate", 1.0)
+    response = client.get("/work", headers={"X-Profile-Inline": "1", "X-Profile-Format": "bogus"})
+
+    assert response.json() == {"total": 49995000}
+    assert response.headers["x-profile-path"].endswith(".speedscope.json")
+    assert len(profiles(tmp_path)) == 1
@@ -0,0 +1,153 @@
+"""Tests for batch-mode re-parsing: state, submission, local completion and ingestion."""
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import reparse
+from app.services.ai_parser import PARSER_VERSION
+from app.services.batch_llm import LocalBatchSubmitter
+from app.services.reparse import CandidateReparseService
+
+LOCAL_FIELDS = {"skills": ["Python"], "experience_years": 4.0, "education": "Bachelor"}
+
+
+class StubParser:
+    """Parses CVs containing "local" without the LLM; asks the LLM for education otherwise."""
+
+    def build_parse_request(self, cv_text, fields):
+        if "local" in cv_text:
+            return dict(LOCAL_FIELDS), [], None
+        request = {"model": "m", "messages": [{"role": "user", "content": cv_text}], "temperature": 0, "max_tokens": 50}
+        return {"skills": ["SQL"], "experience_years": 2.0}, ["education"], request
+
+    def read_parse_response(self, response_text, local_fields, missing_fields):
+        data = json.loads(response_text)
+        if not isinstance(data, dict):
+            raise ValueError("not a JSON object")
+        return {**local_fields, **{name: data.get(name) for name in missing_fields}}
+
+
+class StubProvider:
+    async def complete(self, operation, messages, model, temperature, max_tokens):
+        cv_text = messages[0]["content"]
+        if "timeout" in cv_text:
+            raise TimeoutError("no answer")
+        return "[]" if "garbage" in cv_text else json.dumps({"education": "Master"})
+
+
+class FakeCandidates:
+    """Outdated candidates (by id) and the session applying UPDATE_PARSED to them."""
+
+    def __init__(self, texts):
+        self.texts = {uuid.UUID(int=i + 1): text for i, text in enumerate(texts)}
+        self.outdated = set(self.texts)
+        self.updated = {}
+        self.commits = 0
+
+    async def select_outdated(self, db, after, limit):
+        ids = sorted(i for i in self.outdated if after is None or i > after)[:limit]
+        return [SimpleNamespace(id=i, resume_url=f"resumes/{i}.pdf") for i in ids]
+
+    async def cv_text(self, resume_url):
+        return self.texts[uuid.UUID(resume_url[len("resumes/"):-len(".pdf")])], True
+
+    async def execute(self, statement, params):
+        assert statement is reparse.UPDATE_PARSED
+        for row in params:
+            assert row["version"] == PARSER_VERSION
+            self.outdated.discard(row["candidate_id"])
+            self.updated[row["candidate_id"]] = row
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path):
+    def make(*texts):
+        candidates = FakeCandidates(texts)
+        service = CandidateReparseService(parser=StubParser())
+        monkeypatch.setattr(reparse.settings, "reparse_batch_dir", str(tmp_path))
+        monkeypatch.setattr(service, "_outdated", candidates.select_outdated)
+        monkeypatch.setattr(reparse.cv_text_store, "get", candidates.cv_text)
+        return service, candidates, LocalBatchSubmitter(str(tmp_path))
+    return make
+
+
+def test_state_starts_over_when_the_parser_version_changes(setup, tmp_path):
+    service, _, _ = setup()
+    fresh = service.load_state()
+    assert fresh == {"parser_version": PARSER_VERSION, "cursor": None, "exhausted": False, "next_batch": 0, "pending": []}
+
+    service._save_state({**fresh, "next_batch": 3, "pending": ["reparse-000002"]})
+    assert service.load_state()["pending"] == ["reparse-000002"]
+
+    (tmp_path / "state.json").write_text(json.dumps({**fresh, "parser_version": "old", "next_batch": 3}))
+    assert service.load_state() == fresh
+
+
+@pytest.mark.asyncio
+async def test_submit_complete_and_ingest(setup):
+    service, candidates, submitter = setup("local cv", "llm cv", "llm cv", "garbage cv", "timeout cv")
+    ids = sorted(candidates.texts)
+
+    submitted = await service.submit_batches(candidates, submitter, batch_size=2)
+    assert (submitted.processed, submitted.updated, submitted.submitted) == (5, 1, 4)
+    assert candidates.updated[ids[0]]["new_education"] == "Bachelor"
+    state = service.load_state()
+    assert state["exhausted"] and state["next_batch"] == 3 and state["cursor"] == str(ids[-1])
+    assert state["pending"] == ["reparse-000000", "reparse-000001", "reparse-000002"]
+
+    # Nothing to ingest until results exist
+    assert (await service.ingest_batches(candidates, submitter)).processed == 0
+
+    for batch_id in state["pending"]:
+        await submitter.complete_locally(batch_id, StubProvider(), "parse_cv")
+    ingested = await service.ingest_batches(candidates, submitter)
+    assert (ingested.processed, ingested.updated, ingested.failed) == (4, 2, 2)
+    assert candidates.updated[ids[1]]["new_education"] == "Master"
+    assert candidates.updated[ids[1]]["new_skills"] == ["SQL"]
+    assert candidates.outdated == {ids[3], ids[4]}
+    assert service.load_state()["pending"] == []
+
+
+@pytest.mark.asyncio
+async def test_exhausted_walk_waits_for_pending_then_restarts(setup):
+    service, candidates, submitter = setup("llm cv", "timeout cv")
+    await service.submit_batches(candidates, submitter)
+
+    # Pending batches block a new walk
+    again = await service.submit_batches(candidates, submitter)
+    assert again.processed == 0
+
+    await submitter.complete_locally("reparse-000000", StubProvider(), "parse_cv")
+    await service.ingest_batches(candidates, submitter)
+
+    # The candidate whose request failed is picked up by the next walk
+    retry = await service.submit_batches(candidates, submitter)
+    assert (retry.processed, retry.submitted) == (1, 1)
+    assert service.load_state()["pending"] == ["reparse-000001"]
+
+
+@pytest.mark.asyncio
+async def test_limit_stops_mid_walk_and_resumes(setup):
+    service, candidates, submitter = setup("llm cv", "llm cv", "llm cv")
+    first = await service.submit_batches(candidates, submitter, batch_size=1, limit=2)
+    assert first.processed == 2 and not service.load_state()["exhausted"]
+
+    rest = await service.submit_batches(candidates, submitter, batch_size=1)
+    assert rest.processed == 1
+    assert len(service.load_state()["pending"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_online_reparse_updates_per_batch(setup):
+    service, candidates, _ = setup("local cv", "llm cv", "timeout cv")
+    service.parser.provider = StubProvider()
+
+    summary = await service.reparse(candidates, batch_size=2)
+    assert (summary.processed, summary.updated, summary.failed, summary.cached_text) == (3, 2, 1, 3)
+    assert candidates.commits == 2
+    assert candidates.outdated == {sorted(candidates.texts)[2]}
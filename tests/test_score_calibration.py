@@ -0,0 +1,123 @@
+"""Tests for vectorized score calibration."""
+import numpy as np
+import pytest
+
+from app.services import score_calibration
+from app.services.score_calibration import (
+    CRITERIA,
+    ScoreCalibrationService,
+    calibrate_matrix,
+    normalized_weights,
+    weighted_overall,
+)
+
+WEIGHTS = {"skill_fit": 0.4, "experience_fit": 0.3, "education_fit": 0.2, "keyword_match": 0.1}
+
+
+def test_ranks_and_percentiles_follow_composite():
+    matrix = np.array([
+        [50.0, 50.0, 50.0, 50.0],
+        [90.0, 80.0, 70.0, 60.0],
+        [10.0, 20.0, 30.0, 40.0],
+    ])
+    result = calibrate_matrix(matrix, WEIGHTS)
+    assert result["ranks"].tolist() == [2, 1, 3]
+    assert result["percentiles"].tolist() == [50.0, 100.0, 0.0]
+    assert result["calibrated_scores"][1] > result["calibrated_scores"][0] > result["calibrated_scores"][2]
+
+
+def test_missing_criteria_count_as_average():
+    matrix = np.array([
+        [80.0, np.nan, 60.0, 60.0],
+        [40.0, 50.0, 60.0, 60.0],
+        [60.0, 70.0, 60.0, 60.0],
+    ])
+    result = calibrate_matrix(matrix, WEIGHTS)
+    assert result["z_scores"][0, CRITERIA.index("experience_fit")] == 0.0
+    assert not np.isnan(result["calibrated_scores"]).any()
+
+
+def test_constant_column_and_single_application():
+    result = calibrate_matrix(np.array([[70.0, 70.0, 70.0, 70.0]]), WEIGHTS)
+    assert result["calibrated_scores"].tolist() == [0.0]
+    assert result["ranks"].tolist() == [1]
+    assert result["percentiles"].tolist() == [100.0]
+
+
+def test_zero_weights_are_rejected():
+    zero = {criterion: 0.0 for criterion in CRITERIA}
+    with pytest.raises(ValueError):
+        calibrate_matrix(np.array([[1.0, 2.0, 3.0, 4.0], [4.0, 3.0, 2.0, 1.0]]), zero)
+    with pytest.raises(ValueError):
+        weighted_overall({criterion: 50.0 for criterion in CRITERIA}, zero)
+
+
+def test_normalized_weights_sum_to_one():
+    assert normalized_weights({"skill_fit": 2.0, "keyword_match": 2.0}).tolist() == [0.5, 0.0, 0.0, 0.5]
+
+
+class RefreshRecorder:
+    """Stands in for refresh_job: answers per job from a script of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = []
+
+    async def __call__(self, job_id):
+        self.calls.append(job_id)
+        outcome = self.outcomes[job_id].pop(0) if self.outcomes.get(job_id) else True
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(score_calibration.settings, "calibration_rerank_delay_seconds", 0.01)
+    monkeypatch.setattr(score_calibration.settings, "calibration_rerank_max_attempts", 2)
+    return ScoreCalibrationService()
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_debounced_per_job(service, monkeypatch):
+    recorder = RefreshRecorder({})
+    monkeypatch.setattr(service, "refresh_job", recorder)
+    service.schedule_refresh(["job-a"])
+    service.schedule_refresh(["job-a", "job-b"])
+    service.schedule_refresh(["job-a"])
+    await service._flusher
+    assert recorder.calls == ["job-a", "job-b"]
+
+
+@pytest.mark.asyncio
+async def test_locked_jobs_wait_and_failures_are_retried_then_dropped(service, monkeypatch):
+    recorder = RefreshRecorder({
+        "busy": [False, False, True],
+        "broken": [RuntimeError("deadlock detected"), RuntimeError("deadlock detected")],
+    })
+    monkeypatch.setattr(service, "refresh_job", recorder)
+    service.schedule_refresh(["busy", "broken"])
+    await service._flusher
+    assert recorder.calls.count("busy") == 3
+    assert recorder.calls.count("broken") == 2
+    assert service._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_stop_refreshes_pending_jobs(service, monkeypatch):
+    monkeypatch.setattr(score_calibration.settings, "calibration_rerank_delay_seconds", 60)
+    recorder = RefreshRecorder({})
+    monkeypatch.setattr(service, "refresh_job", recorder)
+    service.schedule_refresh(["job-a"])
+    await service.stop()
+    assert recorder.calls == ["job-a"]
+
+
+def test_full_calibration_only_when_parameters_are_stale(monkeypatch):
+    monkeypatch.setattr(score_calibration.settings, "calibration_refresh_ratio", 0.1)
+    calibration = {"count": 100, "weights": dict(score_calibration.settings.score_weights), "means": {}}
+    stale = ScoreCalibrationService.needs_full_calibration
+    assert not stale(calibration, 110)
+    assert stale(calibration, 111)
+    assert stale(None, 1)
+    assert stale({**calibration, "weights": WEIGHTS}, 100)
@@ -0,0 +1,96 @@
+"""Tests for the production launcher's worker count, gunicorn options and fork hook."""
+from types import SimpleNamespace
+
+import pytest
+
+from app import server
+
+
+@pytest.fixture
+def cpus(monkeypatch, tmp_path):
+    """Pretend the process may use ``affinity`` CPUs under a cgroup ``cpu.max`` line (None: no cgroup file)."""
+    def configure(affinity, cpu_max=None):
+        monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(affinity)), raising=False)
+        path = tmp_path / "cpu.max"
+        if cpu_max is not None:
+            path.write_text(cpu_max)
+        monkeypatch.setattr(server, "CGROUP_CPU_MAX", str(path))
+    return configure
+
+
+@pytest.mark.parametrize("affinity, cpu_max, expected", [
+    (8, None, 8),
+    (8, "max 100000\n", 8),
+    (8, "200000 100000\n", 2),
+    (8, "150000 100000\n", 2),
+    (8, "50000 100000\n", 1),
+    (2, "800000 100000\n", 2),
+    (4, "garbage\n", 4),
+])
+def test_available_cpus_honours_affinity_and_cgroup_quota(cpus, affinity, cpu_max, expected):
+    cpus(affinity, cpu_max)
+    assert server.available_cpus() == expected
+
+
+def test_available_cpus_without_affinity_support(monkeypatch, tmp_path):
+    monkeypatch.delattr(server.os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: None)
+    monkeypatch.setattr(server, "CGROUP_CPU_MAX", str(tmp_path / "missing"))
+    assert server.available_cpus() == 1
+
+
+def test_workers_default_to_available_cpus_unless_overridden(cpus, monkeypatch):
+    cpus(8, "300000 100000\n")
+    monkeypatch.setattr(server.settings, "server_workers", 0)
+    assert server.server_options()["workers"] == 3
+    monkeypatch.setattr(server.settings, "server_workers", 5)
+    assert server.server_options()["workers"] == 5
+
+
+def test_server_options_follow_settings(monkeypatch):
+    for name, value in {
+        "app_host": "127.0.0.1", "app_port": 9000, "server_drain_timeout_seconds": 20,
+        "server_worker_timeout_seconds": 90, "server_keepalive_seconds": 3, "server_max_requests": 1000
+    }.items():
+        monkeypatch.setattr(server.settings, name, value)
+    options = server.server_options()
+    assert options["bind"] == "127.0.0.1:9000"
+    assert options["worker_class"] == "app.server.ProductionWorker"
+    assert options["preload_app"] is True
+    assert options["graceful_timeout"] == 30
+    assert (options["timeout"], options["keepalive"]) == (90, 3)
+    assert (options["max_requests"], options["max_requests_jitter"]) == (1000, 100)
+    assert options["post_fork"] is server.post_fork
+
+
+def test_post_fork_resets_pools_clients_and_loggers(monkeypatch):
+    from app import database
+    from app.services import storage
+    from app.utils import structured_logging
+
+    calls = []
+    engine = SimpleNamespace(sync_engine=SimpleNamespace(dispose=lambda close: calls.append(("primary", close))))
+    replica = SimpleNamespace(sync_engine=SimpleNamespace(dispose=lambda close: calls.append(("replica", close))))
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", replica)
+    monkeypatch.setattr(storage.storage_service, "reset_connections", lambda: calls.append(("storage",)))
+    monkeypatch.setattr(structured_logging, "adopt_loggers", lambda names: calls.append(("loggers", tuple(names))))
+
+    server.post_fork(server=None, worker=None)
+    assert calls == [
+        ("primary", False), ("replica", False), ("storage",), ("loggers", structured_logging.SERVER_LOGGERS)
+    ]
+
+
+def test_post_fork_without_replica(monkeypatch):
+    from app import database
+    from app.services import storage
+    from app.utils import structured_logging
+
+    disposed = []
+    monkeypatch.setattr(database, "engine", SimpleNamespace(sync_engine=SimpleNamespace(dispose=lambda close: disposed.append(close))))
+    monkeypatch.setattr(database, "read_engine", None)
+    monkeypatch.setattr(storage.storage_service, "reset_connections", lambda: None)
+    monkeypatch.setattr(structured_logging, "adopt_loggers", lambda names: None)
+    server.post_fork(server=None, worker=None)
+    assert disposed == [False]
@@ -0,0 +1,85 @@
+"""Tests for status transitions and the single-application shortlist endpoint."""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import applications
+from app.database import get_db
+from app.main import app
+from app.services.status_transitions import TransitionResult, status_transition_service
+
+
+class FakeSession:
+    def __init__(self, current=None):
+        self.current = current
+        self.committed = False
+
+    async def execute(self, statement):
+        return SimpleNamespace(first=lambda: self.current)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def shortlist_client(monkeypatch, session, moved):
+    calls = []
+
+    async def fake_db():
+        yield session
+
+    async def transition(db, status, **selection):
+        calls.append((status, selection))
+        return TransitionResult(status=status, applications=moved)
+
+    monkeypatch.setattr(applications.status_transition_service, "transition", transition)
+    monkeypatch.setitem(app.dependency_overrides, get_db, fake_db)
+    return TestClient(app), calls
+
+
+def test_shortlist_goes_through_the_transition_service(monkeypatch):
+    application_id = uuid.uuid4()
+    now = datetime.utcnow()
+    row = {
+        "id": application_id, "job_id": uuid.uuid4(), "candidate_id": uuid.uuid4(), "status": "shortlisted",
+        "old_status": "scored", "scores": {"overall_score": 81.0}, "created_at": now, "updated_at": now
+    }
+    session = FakeSession()
+    client, calls = shortlist_client(monkeypatch, session, [row])
+
+    response = client.post(f"/api/v1/applications/{application_id}/shortlist")
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "shortlisted"
+    assert calls == [("shortlisted", {"application_ids": [application_id]})]
+    assert session.committed
+
+
+@pytest.mark.parametrize("current, code", [
+    (None, 404),
+    (SimpleNamespace(status="rejected", archived=False), 409),
+    (SimpleNamespace(status="scored", archived=True), 409),
+])
+def test_shortlist_refuses_missing_or_ineligible_applications(monkeypatch, current, code):
+    session = FakeSession(current)
+    client, _ = shortlist_client(monkeypatch, session, [])
+
+    response = client.post(f"/api/v1/applications/{uuid.uuid4()}/shortlist")
+    assert response.status_code == code
+    assert not session.committed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, selection", [
+    ("hired", {"application_ids": [uuid.uuid4()]}),
+    ("shortlisted", {}),
+    ("shortlisted", {"application_ids": [uuid.uuid4()], "job_id": uuid.uuid4()}),
+    ("shortlisted", {"application_ids": [uuid.uuid4()], "top_k": 10}),
+])
+async def test_invalid_transitions_are_rejected_before_querying(status, selection):
+    with pytest.raises(ValueError):
+        await status_transition_service.transition(None, status, **selection)
@@ -0,0 +1,30 @@
+"""Tests for presigned CV download URLs."""
+from urllib.parse import parse_qs, urlparse
+
+from minio import Minio
+
+from app.services.storage import StorageService
+from app.services.synthetic_storage import get_synthetic_object_store
+
+
+def make_storage():
+    signer = Minio("localhost:9000", access_key="key", secret_key="secret", secure=False, region="us-east-1")
+    return StorageService(client=get_synthetic_object_store(), signing_client=signer)
+
+
+def test_hot_cv_is_presigned_as_stored():
+    query = parse_qs(urlparse(make_storage().presigned_download_url("resumes/abc.pdf")).query)
+    assert "response-content-encoding" not in query
+    assert "X-Amz-Signature" in query
+
+
+def test_archived_cv_is_served_as_the_original_file():
+    url = make_storage().presigned_download_url("http://minio:9000/resumes/cold/resumes/abc.docx.gz")
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    assert parsed.path.endswith("/cold/resumes/abc.docx.gz")
+    assert query["response-content-encoding"] == ["gzip"]
+    assert query["response-content-type"] == [
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ]
+    assert query["response-content-disposition"] == ['inline; filename="abc.docx"']
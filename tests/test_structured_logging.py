@@ -0,0 +1,92 @@
+"""Tests for queued structured logging: truncation, sampling, drops, JSON lines and request ids."""
+import json
+import logging
+import queue
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils import structured_logging
+from app.utils.structured_logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdMiddleware,
+    request_id_var,
+    truncate_payload,
+)
+
+
+def record(message, level=logging.INFO, **extra) -> logging.LogRecord:
+    log_record = logging.LogRecord("app.test", level, __file__, 1, message, None, None)
+    log_record.__dict__.update(extra)
+    return log_record
+
+
+def test_truncate_payload_notes_what_was_cut():
+    assert truncate_payload("short", 10) == "short"
+    assert truncate_payload("x" * 25, 10) == "xxxxxxxxxx... [15 chars truncated]"
+
+
+def test_json_formatter_includes_ids_and_extra_fields():
+    entry = json.loads(JsonFormatter().format(record("Scored", request_id="abc", job_id=7)))
+    assert entry["message"] == "Scored"
+    assert entry["level"] == "INFO" and entry["logger"] == "app.test"
+    assert entry["request_id"] == "abc" and entry["job_id"] == 7
+    assert "trace_id" not in entry
+
+
+def test_handler_truncates_and_tags_records():
+    handler = NonBlockingQueueHandler(queue.Queue(), max_chars=20, sample_rate=1.0)
+    token = request_id_var.set("req-1")
+    try:
+        handler.emit(record("y" * 50, level=logging.WARNING))
+    finally:
+        request_id_var.reset(token)
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == truncate_payload("y" * 50, 20)
+    assert queued.request_id == "req-1"
+
+
+def test_large_debug_messages_are_sampled(monkeypatch):
+    monkeypatch.setattr(structured_logging.random, "random", lambda: 0.9)
+    handler = NonBlockingQueueHandler(queue.Queue(), max_chars=20, sample_rate=0.5)
+    handler.emit(record("z" * 50))
+    handler.emit(record("z" * 50, level=logging.ERROR))
+    handler.emit(record("small"))
+    assert handler.sampled_out == 1
+    assert handler.queue.qsize() == 2
+
+
+def test_full_queue_drops_and_reports_once_there_is_room():
+    handler = NonBlockingQueueHandler(queue.Queue(2), max_chars=100, sample_rate=1.0)
+    for message in ("first", "second", "dropped", "dropped"):
+        handler.emit(record(message))
+    assert handler.dropped == 2
+
+    handler.queue.get_nowait()
+    handler.queue.get_nowait()
+    handler.emit(record("after"))
+    assert handler.queue.get_nowait().getMessage() == "after"
+    notice = handler.queue.get_nowait()
+    assert notice.levelno == logging.WARNING
+    assert notice.getMessage() == "Log queue full, dropped 2 record(s)"
+
+    handler.emit(record("later"))
+    assert handler.queue.qsize() == 1
+
+
+def test_request_id_middleware_sanitizes_or_generates_ids():
+    app = FastAPI()
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get("/id")
+    def current_id():
+        return {"request_id": request_id_var.get()}
+
+    client = TestClient(app)
+    response = client.get("/id", headers={"X-Request-ID": "abc-123\n<script>"})
+    assert response.json()["request_id"] == "abc-123script"
+    assert response.headers["x-request-id"] == "abc-123script"
+    generated = client.get("/id")
+    assert len(generated.headers["x-request-id"]) == 32
+    assert generated.json()["request_id"] == generated.headers["x-request-id"]
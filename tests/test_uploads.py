@@ -0,0 +1,100 @@
+"""Tests for direct-upload tokens and the orphaned upload sweep."""
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.services.archival import ArchivalService
+from app.services.storage import StorageService
+from app.services.synthetic_storage import SyntheticObjectStore, get_synthetic_object_store
+from app.utils.latency import LatencyModel
+from app.utils.upload_tokens import issue_upload_token, verify_upload_token
+
+OBJECT_NAME = f"resumes/{uuid.uuid4()}.pdf"
+JOB_ID = uuid.uuid4()
+
+
+def test_token_is_bound_to_object_job_and_expiry():
+    token = issue_upload_token(OBJECT_NAME, JOB_ID, int(time.time()) + 60)
+    assert verify_upload_token(token, OBJECT_NAME, JOB_ID)
+    assert not verify_upload_token(token, f"resumes/{uuid.uuid4()}.pdf", JOB_ID)
+    assert not verify_upload_token(token, OBJECT_NAME, uuid.uuid4())
+    assert not verify_upload_token(token, OBJECT_NAME, JOB_ID, now=time.time() + 120)
+
+
+def test_tampered_tokens_are_rejected():
+    expires = int(time.time()) + 60
+    signature = issue_upload_token(OBJECT_NAME, JOB_ID, expires).split(".", 1)[1]
+    assert not verify_upload_token(f"{expires + 3600}.{signature}", OBJECT_NAME, JOB_ID)
+    assert not verify_upload_token("not-a-token", OBJECT_NAME, JOB_ID)
+    assert not verify_upload_token("", OBJECT_NAME, JOB_ID)
+
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return iter(self.values)
+
+
+class FakeSession:
+    def __init__(self, referenced):
+        self.referenced = referenced
+
+    async def execute(self, statement):
+        return FakeResult(self.referenced)
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_old_unreferenced_uploads(monkeypatch):
+    store = get_synthetic_object_store()
+    storage = StorageService(client=store)
+    names = {key: f"resumes/{uuid.uuid4()}.pdf" for key in ("orphan", "referenced", "recent")}
+    for object_name in names.values():
+        await storage.upload_file(b"%PDF", object_name, "application/pdf")
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    store._modified[(storage.bucket_name, names["orphan"])] = old
+    store._modified[(storage.bucket_name, names["referenced"])] = old
+    monkeypatch.setattr(settings, "storage_orphan_grace_seconds", 86400)
+
+    removed = await ArchivalService(storage).sweep_orphan_uploads(
+        FakeSession([storage.object_url(names["referenced"])])
+    )
+
+    assert removed == 1
+    assert await storage.stat_file(names["orphan"]) is None
+    assert await storage.stat_file(names["referenced"]) is not None
+    assert await storage.stat_file(names["recent"]) is not None
+
+
+class CountingSession(FakeSession):
+    def __init__(self):
+        super().__init__([])
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return await super().execute(statement)
+
+
+@pytest.mark.asyncio
+async def test_listing_is_read_and_swept_batch_by_batch(monkeypatch):
+    store = SyntheticObjectStore(LatencyModel("fixed", 0.0))
+    storage = StorageService(client=store)
+    old = datetime.now(timezone.utc) - timedelta(days=2)
+    for index in range(5):
+        object_name = f"resumes/{index}-{uuid.uuid4()}.pdf"
+        await storage.upload_file(b"%PDF", object_name, "application/pdf")
+        store._modified[(storage.bucket_name, object_name)] = old
+
+    batches = [len(batch) async for batch in storage.list_files("resumes/", batch_size=2)]
+    assert batches == [2, 2, 1]
+
+    monkeypatch.setattr(settings, "archive_batch_size", 2)
+    session = CountingSession()
+    assert await ArchivalService(storage).sweep_orphan_uploads(session) == 5
+    assert session.queries == 3
+    assert [batch async for batch in storage.list_files("resumes/")] == []